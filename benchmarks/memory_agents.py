@@ -0,0 +1,100 @@
+"""
+Memoria por agente medida con tracemalloc.
+
+Crea N vehículos y N peatones como los crea Intersection (posición, límites de
+giro y ruta peatonal) y reporta los bytes asignados por agente. Con --stress
+construye además una intersección sin interfaz con esa cantidad total de agentes.
+
+Uso:
+    python -m benchmarks.memory_agents --agents 100000
+"""
+
+import argparse
+import random
+import sys
+import tracemalloc
+
+from config import HEADLESS_WINDOW_SIZE
+from simulation.intersection import Intersection
+from simulation.pedestrian import Pedestrian
+from simulation.vehicle import Vehicle
+from util import TrafficUtils
+
+DIRECTIONS = ("N", "S", "E", "W")
+
+
+def create_vehicles(amount):
+    vehicles = []
+    for i in range(amount):
+        direction = DIRECTIONS[i % len(DIRECTIONS)]
+        vehicle = Vehicle(direction, direction)
+        vehicle.change_random_final_direction()
+        vehicle.calculate_size()
+        vehicle.calculate_initial_position()
+        vehicle.calculate_turning_limit()
+        vehicles.append(vehicle)
+    return vehicles
+
+
+def create_pedestrians(amount):
+    pedestrians = []
+    for _ in range(amount):
+        pedestrian = Pedestrian()
+        pedestrian.graph = TrafficUtils.pedestrian_graph()
+        pedestrian.change_random_initial_direction()
+        pedestrian.change_random_final_direction()
+        pedestrian.calculate_initial_position()
+        pedestrians.append(pedestrian)
+    return pedestrians
+
+
+def measure(factory, amount):
+    """
+    Returns:
+        float: Bytes asignados por agente (incluye la lista que los contiene)
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    agents = factory(amount)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del agents
+    return (after - before) / amount
+
+
+def measure_intersection(agents):
+    """Memoria total (MB) y pico de una intersección con agents vehículos y peatones"""
+    tracemalloc.start()
+    intersection = Intersection()
+    per_direction = agents // 2 // len(DIRECTIONS)
+    for direction in DIRECTIONS:
+        intersection.add_vehicles(per_direction, direction)
+    intersection.add_pedestrians(agents // 2)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del intersection
+    return current / 2 ** 20, peak / 2 ** 20
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=10000, help="Agentes por tipo")
+    parser.add_argument("--stress", type=int, default=0, help="Agentes de la intersección de estrés")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    TrafficUtils.configure_layout(*HEADLESS_WINDOW_SIZE)
+    TrafficUtils.pedestrian_graph()
+
+    print(f"{'agente':<12}{'bytes/agente':>14}")
+    print(f"{'vehículo':<12}{measure(create_vehicles, args.agents):>14.0f}")
+    print(f"{'peatón':<12}{measure(create_pedestrians, args.agents):>14.0f}")
+
+    if args.stress:
+        current, peak = measure_intersection(args.stress)
+        print(f"intersección con {args.stress} agentes: {current:.1f} MB (pico {peak:.1f} MB)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
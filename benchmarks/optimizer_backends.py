@@ -0,0 +1,128 @@
+"""
+Compara las estrategias de búsqueda del optimizador por evaluaciones hasta la meta.
+
+Cada estrategia se ejecuta con varias semillas sobre la misma intersección y se
+cuenta cuántas evaluaciones reales de fitness (sin contar la caché) necesita
+hasta alcanzar la meta. Con el fitness analítico la meta es una fracción del
+óptimo global, que se obtiene enumerando todos los planes válidos; con
+--simulation la meta es una fracción del mejor plan encontrado por cualquier
+estrategia.
+
+Uso:
+    python -m benchmarks.optimizer_backends --runs 10
+    python -m benchmarks.optimizer_backends --simulation 30 --runs 3
+"""
+import argparse
+import itertools
+import statistics
+import time
+
+import numpy as np
+
+from config import DEFAULT_DEMAND, HEADLESS_WINDOW_SIZE
+from simulation.intersection import Intersection
+from simulation.replication import SimulationFitness
+from simulation.search_strategies import CMAESSearch, GeneticSearch, SimulatedAnnealingSearch
+from simulation.TrafficFlowOptimizer import TrafficFlowOptimizer
+from util import TrafficUtils
+
+
+class CountingFitness:
+    """Envuelve una función de fitness y registra el valor de cada evaluación"""
+
+    def __init__(self, function):
+        self.function = function
+        self.trace = []
+
+    def __call__(self, light_times):
+        fitness = self.function(light_times)
+        self.trace.append(fitness)
+        return fitness
+
+    def evaluations_to(self, target):
+        best = -float("inf")
+        for evaluation, fitness in enumerate(self.trace, start=1):
+            best = max(best, fitness)
+            if best >= target:
+                return evaluation
+        return None
+
+
+def build_optimizer():
+    intersection = Intersection()
+    for direction, amount in DEFAULT_DEMAND.items():
+        intersection.add_vehicles(amount, direction)
+    return TrafficFlowOptimizer(intersection)
+
+
+def global_optimum(optimizer):
+    best = -float("inf")
+    low, high = optimizer.min_green_time, optimizer.max_green_time
+    for north, south, east in itertools.product(range(low, high + 1), repeat=3):
+        west = optimizer.cycle_time - north - south - east
+        if low <= west <= high:
+            best = max(best, optimizer._evaluate_fitness_comprehensive(
+                {"N": north, "S": south, "E": east, "W": west}
+            ))
+    return best
+
+
+def strategies(budget, seed):
+    return {
+        "GA": GeneticSearch(verbose=False),
+        "CMA-ES": CMAESSearch(max_evaluations=budget, seed=seed),
+        "SA": SimulatedAnnealingSearch(max_evaluations=budget, seed=seed),
+    }
+
+
+def run(runs, budget, target_fraction, simulation_seconds):
+    TrafficUtils.configure_layout(*HEADLESS_WINDOW_SIZE)
+    traces = {name: [] for name in strategies(budget, 0)}
+    durations = {name: [] for name in traces}
+    for seed in range(runs):
+        for name, strategy in strategies(budget, seed).items():
+            np.random.seed(seed)
+            optimizer = build_optimizer()
+            if simulation_seconds:
+                base = SimulationFitness(DEFAULT_DEMAND, duration_seconds=simulation_seconds)
+            else:
+                base = optimizer._evaluate_fitness_comprehensive
+            counter = CountingFitness(base)
+            optimizer.fitness_function = counter
+            start = time.perf_counter()
+            strategy.search(optimizer)
+            durations[name].append(time.perf_counter() - start)
+            traces[name].append(counter)
+
+    if simulation_seconds:
+        reference = max(max(c.trace) for counters in traces.values() for c in counters)
+        TrafficUtils.configure_layout(*HEADLESS_WINDOW_SIZE)
+    else:
+        reference = global_optimum(build_optimizer())
+    target = reference * target_fraction
+
+    print(f"Meta: {target:.2f} ({target_fraction:.0%} de {reference:.2f})")
+    print(f"{'Estrategia':<10} {'Éxitos':>7} {'Eval. mediana':>14} {'Eval. totales':>14} "
+          f"{'Mejor medio':>12} {'Tiempo (s)':>11}")
+    for name, counters in traces.items():
+        reached = [c.evaluations_to(target) for c in counters]
+        reached = [r for r in reached if r is not None]
+        median = statistics.median(reached) if reached else float("nan")
+        print(
+            f"{name:<10} {len(reached):>3}/{len(counters):<3} {median:>14} "
+            f"{statistics.mean(len(c.trace) for c in counters):>14.1f} "
+            f"{statistics.mean(max(c.trace) for c in counters):>12.2f} "
+            f"{statistics.mean(durations[name]):>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="Semillas por estrategia")
+    parser.add_argument("--budget", type=int, default=600,
+                        help="Evaluaciones máximas de CMA-ES y recocido")
+    parser.add_argument("--target", type=float, default=0.99, help="Fracción del óptimo a alcanzar")
+    parser.add_argument("--simulation", type=int, default=0,
+                        help="Usa fitness por simulación de esta duración (s)")
+    args = parser.parse_args()
+    run(args.runs, args.budget, args.target, args.simulation)
@@ -0,0 +1,100 @@
+"""
+Flujo de saturación medido en la descarga de una cola.
+
+Un acceso acumula una cola durante el rojo y se registra el tick en que cada
+vehículo de la cola cruza la línea de parada al llegar el verde. Como en el
+método del HCM, el intervalo de saturación es el promedio de los intervalos a
+partir del quinto vehículo, y el tiempo perdido al inicio es lo que los cuatro
+primeros tardan de más. Compara la velocidad constante con el IDM; para el IDM
+muestra además el flujo de equilibrio del modelo, que es el que usa el
+optimizador como vehicle_processing_rate.
+
+Uso:
+    python -m benchmarks.saturation_flow --vehicles 20
+"""
+
+import argparse
+import random
+
+from config import HEADLESS_WINDOW_SIZE, TICKS_PER_SECOND
+from simulation.car_following import IntelligentDriverModel
+from simulation.encoding import GREEN_LIGHT
+from simulation.replication import build_intersection
+from util import Layout
+
+# Acceso medido: en el ciclo E, W, S, N espera en rojo todo el verde del este
+APPROACH = "W"
+SKIPPED_VEHICLES = 4
+
+
+def crossing_ticks(car_following, vehicles, red_seconds, seed, layout):
+    light_times = {"N": 15, "S": 15, "E": red_seconds, "W": 120}
+    intersection = build_intersection(
+        light_times,
+        {APPROACH: vehicles},
+        turning_ratios={APPROACH: {APPROACH: 1.0}},
+        car_following=car_following,
+        layout=layout,
+        rng=random.Random(seed),
+    )
+    light = intersection.traffic_lights[APPROACH]
+    queued = None
+    ticks = []
+    tick = 0
+    while queued is None or len(ticks) < queued:
+        tick += 1
+        intersection.tick()
+        if queued is None and light.state == GREEN_LIGHT:
+            queued = intersection.queue_counts[APPROACH]
+            start = tick
+        passed = intersection.passing_vehicles_total[APPROACH]
+        if queued is not None and passed > len(ticks):
+            ticks.append(tick - start)
+        if tick > 600 * TICKS_PER_SECOND:
+            break
+    return ticks
+
+
+def summarize(ticks):
+    seconds = [t / TICKS_PER_SECOND for t in ticks]
+    headways = [b - a for a, b in zip(seconds, seconds[1:])]
+    saturated = headways[SKIPPED_VEHICLES - 1:]
+    if not saturated:
+        return None
+    saturation_headway = sum(saturated) / len(saturated)
+    lost_time = seconds[SKIPPED_VEHICLES - 1] - SKIPPED_VEHICLES * saturation_headway
+    return {
+        "queued": len(ticks),
+        "saturation_headway": saturation_headway,
+        "saturation_flow": 3600 / saturation_headway,
+        "startup_lost_time": lost_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--vehicles", type=int, default=20)
+    parser.add_argument("--red", type=int, default=40, help="Verde del acceso anterior (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    layout = Layout(*HEADLESS_WINDOW_SIZE)
+    for name, model in (("constante", None), ("IDM", IntelligentDriverModel())):
+        summary = summarize(crossing_ticks(model, args.vehicles, args.red, args.seed, layout))
+        if summary is None:
+            print(f"{name:>10}: la cola no alcanzó {SKIPPED_VEHICLES + 2} vehículos")
+            continue
+        print(
+            f"{name:>10}: cola {summary['queued']:3d}  "
+            f"intervalo {summary['saturation_headway']:.2f} s  "
+            f"flujo {summary['saturation_flow']:.0f} veh/h "
+            f"({1 / summary['saturation_headway']:.2f} veh/s)  "
+            f"tiempo perdido {summary['startup_lost_time']:.1f} s"
+        )
+        if model is not None:
+            rate = model.saturation_flow(layout.vehicle_length)
+            print(f"{'':>10}  flujo de equilibrio del modelo {rate:.2f} veh/s")
+
+
+if __name__ == "__main__":
+    main()
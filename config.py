@@ -19,13 +19,29 @@ LIGHT_RADIUS = 10
 LIGHT_LIMIT = 50
 PEDESTRIAN_LIGHT_SIZE = 10
 VEHICLE_SPACING = 20
-DEFAULT_TURNING_SPEED = 0.05
+VEHICLE_LENGTH_RATIO = 2
 DEFAULT_VEHICLE_SPEED = 2
 DEFAULT_YELLOW_TIME = 3
 DEFAULT_GREEN_NORTH_LIGHT_TIME = 15
 DEFAULT_GREEN_SOUTH_LIGHT_TIME = 23
 DEFAULT_GREEN_EAST_LIGHT_TIME = 41
 DEFAULT_GREEN_WEST_LIGHT_TIME = 41
+TICKS_PER_SECOND = 60
+SIMULATION_DURATION = 300
+METRICS_INTERVAL = 5
+HEADLESS_WINDOW_SIZE = (1920, 980)
+DEFAULT_DEMAND = {"N": 8, "S": 4, "E": 13, "W": 20}
+OPEN_SYSTEM = False
+ARRIVAL_RATES = {"N": 300, "S": 150, "E": 500, "W": 750}
+VEHICLE_POOL_SIZE = 200
+IDM_CAR_FOLLOWING = False
+CONFLICT_GRID = False
+AUDIT_INTERVAL = 0
+ADAPTIVE_CONTROL = False
+ROLLING_OPTIMIZATION = False
+ROLLING_INTERVAL = 30
+# Punto de control de la optimización para reanudarla (None lo desactiva)
+OPTIMIZATION_CHECKPOINT = None
 TRAFFIC_LIGHTS_ORDER = {1: "E", 2: "W", 3: "S", 4: "N"}
 VEHICLES_ASSETS_PATH = "assets/vehicles"
 WHITE = (255, 255, 255)
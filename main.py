@@ -1,20 +1,47 @@
+import argparse
 import pygame
-from config import GREEN, RED, config
+from config import ADAPTIVE_CONTROL, ARRIVAL_RATES, AUDIT_INTERVAL, DEFAULT_DEMAND, GREEN, IDM_CAR_FOLLOWING, METRICS_INTERVAL, OPEN_SYSTEM, OPTIMIZATION_CHECKPOINT, RED, ROLLING_INTERVAL, ROLLING_OPTIMIZATION, SIMULATION_DURATION, TICKS_PER_SECOND, config
 from ui import MainView
 from simulation.intersection import Intersection
 from simulation.TrafficFlowOptimizer import TrafficFlowOptimizer
+from simulation.demand import DemandGenerator, PoissonArrivals
+from simulation.car_following import IntelligentDriverModel
+from simulation.auditor import InvariantAuditor
+from simulation.signal_control import AdaptiveSignalController
+from simulation.metrics import MetricsHistorySink, MetricsPipeline
+from simulation.trajectory import TrajectoryRecorder, TrajectoryReplay
 
-def main():
+def main(record_path=None):
     main_view = MainView()
     intersection = Intersection()
     main_view.intersection = intersection
     intersection.simulation_view = main_view
-    intersection.add_vehicles(8, "N")
-    intersection.add_vehicles(4, "S")
-    intersection.add_vehicles(13, "E")
-    intersection.add_vehicles(20, "W")
+    if OPEN_SYSTEM:
+        DemandGenerator(
+            intersection,
+            {d: PoissonArrivals(rate) for d, rate in ARRIVAL_RATES.items()},
+        )
+    else:
+        for direction, amount in DEFAULT_DEMAND.items():
+            intersection.add_vehicles(amount, direction)
     # intersection.add_pedestrians(15)
+    if IDM_CAR_FOLLOWING:
+        IntelligentDriverModel().attach(intersection)
+    if AUDIT_INTERVAL:
+        InvariantAuditor(AUDIT_INTERVAL).attach(intersection)
     optimizer = TrafficFlowOptimizer(intersection)
+    if ADAPTIVE_CONTROL:
+        AdaptiveSignalController(
+            optimizer.min_green_time, optimizer.max_green_time
+        ).attach(intersection)
+    if ROLLING_OPTIMIZATION:
+        optimizer.enable_rolling_optimization(ROLLING_INTERVAL)
+    recorder = TrajectoryRecorder(record_path) if record_path else None
+    metrics = MetricsPipeline(
+        intersection,
+        [MetricsHistorySink(optimizer, METRICS_INTERVAL)],
+        interval_seconds=METRICS_INTERVAL,
+    )
 
     running = True
 
@@ -23,23 +50,56 @@ def main():
 
         if main_view.is_simulation_running:
             toggle_timer += 1
-            intersection.lights_toggle_timer += 1
-            intersection.check_lights_state()
-            intersection.update()
-            if (toggle_timer / 60) == 300:
+            intersection.tick()
+            metrics.on_tick()
+            optimizer.on_tick()
+            if recorder:
+                recorder.record(intersection)
+            if toggle_timer == SIMULATION_DURATION * TICKS_PER_SECOND:
                 main_view.stop_button_event()
                 toggle_timer = 0
-            
+
         if main_view.optimize_requested:
             main_view.optimize_requested = False
-            optimal_times = optimizer.start_optimization_cycle(time_limit_seconds=300)
+            optimal_times = optimizer.start_optimization_cycle(
+                time_limit_seconds=300, checkpoint_path=OPTIMIZATION_CHECKPOINT, resume=True
+            )
             print("Tiempos óptimos:", optimal_times)
 
         if not main_view.update():
             running = False
 
+    if not metrics.close():
+        print("La exportación de métricas no terminó a tiempo")
+    if recorder:
+        recorder.close()
+    pygame.quit()
+
+
+def replay(replay_path):
+    main_view = MainView()
+    trajectory = TrajectoryReplay(replay_path, main_view.vehicles_assets)
+    main_view.intersection = trajectory
+
+    running = True
+    while running:
+
+        if main_view.is_simulation_running and not trajectory.step():
+            main_view.stop_button_event()
+
+        if not main_view.update():
+            running = False
+
     pygame.quit()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Simulación de Intersección")
+    parser.add_argument("--record", help="Graba la trayectoria de la simulación en esta ruta")
+    parser.add_argument("--replay", help="Reproduce una trayectoria grabada con --record")
+    args = parser.parse_args()
+
+    if args.replay:
+        replay(args.replay)
+    else:
+        main(args.record)
@@ -3,6 +3,14 @@ import numpy as np
 import matplotlib.pyplot as plt
 import time
 import json
+import os
+import pickle
+import zlib
+
+from config import TICKS_PER_SECOND
+from util import FileUtils
+from . import pareto
+from .search_strategies import GeneticSearch
 
 class TrafficFlowOptimizer:
 
@@ -23,6 +31,19 @@ class TrafficFlowOptimizer:
         metrics_history (dict): Registro histórico de métricas de desempeño
         optimization_active (bool): Estado del proceso de optimización
         current_optimal_times (dict): Mejor configuración encontrada
+        fitness_cache (dict): Fitness ya calculados por configuración y estado
+        elite_archive (list): Mejores individuos de la última optimización, con los
+            que arranca la siguiente en modo continuo
+        fitness_function (callable): Fitness alternativo, p. ej. por simulación
+            (por defecto _evaluate_fitness_comprehensive)
+        surrogate_screen (SurrogateScreen): Preselección con modelo sustituto (opcional)
+        search_strategy: Estrategia de búsqueda con método
+            search(optimizer, seeds=None, time_budget=None), p. ej. CMAESSearch o
+            SimulatedAnnealingSearch (por defecto GeneticSearch); también la usa la
+            reoptimización continua
+        checkpoint_path (str): Punto de control del algoritmo genético por defecto
+            en start_optimization_cycle (opcional)
+        checkpoint_interval (int): Generaciones entre puntos de control
     """
     def __init__(self, intersection):
         """
@@ -35,7 +56,8 @@ class TrafficFlowOptimizer:
             - Ciclo semafórico: 120 segundos - Valor típico en ingeniería de tráfico para intersecciones medianas
             - Verde mínimo: 15 segundos - valor minimo de tiempo verde
             - Verde máximo: 60 segundos - valor maximo de tiempo verde
-            - Tasa de procesamiento: 1.5 vehículos/segundo
+            - Tasa de procesamiento: 1.5 vehículos/segundo, o el flujo de saturación
+              del modelo de seguimiento si la intersección tiene uno
         """
         self.intersection = intersection
         self.flow_graph = nx.DiGraph()
@@ -45,7 +67,9 @@ class TrafficFlowOptimizer:
         self.max_green_time = 60  # Tiempo máximo de verde
         
         # Parámetros de flujo vehicular
-        self.vehicle_processing_rate = 1.5  # vehículos por segundo (más realista)
+        # vehículos por segundo con velocidad constante; con IDM se usa el flujo de
+        # saturación del modelo (ver vehicle_processing_rate)
+        self.__processing_rate = 1.5
         self.yellow_time = 3  # tiempo amarillo fijo
         self.red_time = 2     # tiempo rojo fijo entre cambios
         
@@ -62,7 +86,46 @@ class TrafficFlowOptimizer:
         self.optimization_start_time = 0
         self.current_optimal_times = None
         
-    def start_optimization_cycle(self, time_limit_seconds=300):
+        # Memoria entre optimizaciones (modo continuo)
+        self.fitness_cache = {}
+        self.fitness_cache_limit = 10000
+        self.elite_archive = []
+        self.elite_archive_size = 5
+        self.rolling_active = False
+        self.rolling_interval_ticks = 0
+        self.rolling_generations = 5
+        self.rolling_time_budget = 0.05
+        self.rolling_ticks = 0
+        
+        # Fitness por simulación y modelo sustituto (opcionales)
+        self.fitness_function = None
+        self.surrogate_screen = None
+        self.pareto_front = []
+        
+        # Estrategia de búsqueda (por defecto el algoritmo genético)
+        self.search_strategy = None
+        
+        # Puntos de control del algoritmo genético por defecto
+        self.checkpoint_path = None
+        self.checkpoint_interval = 5
+        
+    @property
+    def vehicle_processing_rate(self):
+        """
+        Vehículos por segundo que despacha un verde saturado. Con un modelo de
+        seguimiento en la intersección se deriva de él (el IDM despacha bastante
+        menos que el valor fijo, ver benchmarks.saturation_flow).
+        """
+        model = getattr(self.intersection, "car_following", None)
+        if model is not None:
+            return model.saturation_flow(self.intersection.layout.vehicle_length)
+        return self.__processing_rate
+
+    @vehicle_processing_rate.setter
+    def vehicle_processing_rate(self, rate):
+        self.__processing_rate = rate
+
+    def start_optimization_cycle(self, time_limit_seconds=300, checkpoint_path=None, resume=False):
         """
         Ejecuta un ciclo completo de optimización.
         
@@ -74,10 +137,15 @@ class TrafficFlowOptimizer:
         
         Args:
             time_limit_seconds (int): Duración máxima del proceso
+            checkpoint_path (str): Archivo de punto de control del algoritmo genético
+                por defecto (None usa self.checkpoint_path)
+            resume (bool): Continuar desde checkpoint_path si quedó una ejecución
+                sin terminar; si no, se empieza de cero
             
         Returns:
             dict: Tiempos óptimos por dirección {'N': int, 'S': int, 'E': int, 'W': int}
         """
+        checkpoint_path = checkpoint_path or self.checkpoint_path
         self.simulation_time_limit = time_limit_seconds
         self.optimization_active = True
         self.optimization_start_time = time.time()
@@ -94,8 +162,12 @@ class TrafficFlowOptimizer:
             print("⚠️ Configuración inicial inválida, aplicando corrección...")
             self._fix_configuration()
         
-        # Ejecutar optimización
-        self.current_optimal_times = self.optimize_light_timing_genetic(generations=50)
+        # Ejecutar optimización, partiendo de los mejores individuos anteriores
+        self.current_optimal_times = self.optimize_light_timing(
+            time_budget=time_limit_seconds,
+            checkpoint_path=checkpoint_path,
+            resume=self._resumable_checkpoint(checkpoint_path) if resume else None,
+        )
         
         # Aplicar tiempos optimizados
         self._apply_optimized_times(self.current_optimal_times)
@@ -176,7 +248,28 @@ class TrafficFlowOptimizer:
         
         return times
     
-    def optimize_light_timing_genetic(self, generations=50, population_size=30):
+    def optimize_light_timing(self, time_budget=None, checkpoint_path=None, resume=None):
+        """
+        Busca los mejores tiempos con la estrategia configurada.
+        
+        checkpoint_path y resume (ruta de un punto de control) sólo aplican al
+        algoritmo genético por defecto; una search_strategy usa su propia
+        configuración.
+        """
+        if self.search_strategy is not None:
+            if checkpoint_path:
+                print("⚠️ La estrategia configurada usa sus propios puntos de control")
+            return self.search_strategy.search(self, time_budget=time_budget)
+        strategy = GeneticSearch(
+            checkpoint_path=checkpoint_path,
+            checkpoint_interval=self.checkpoint_interval,
+            resume=resume,
+        )
+        return strategy.search(self, time_budget=time_budget)
+    
+    def optimize_light_timing_genetic(self, generations=50, population_size=30,
+                                      initial_population=None, time_budget=None, verbose=True,
+                                      checkpoint_path=None, checkpoint_interval=5, resume=None):
         """ 
         Implementación de algoritmo genético para optimización semafórica.
         
@@ -189,34 +282,95 @@ class TrafficFlowOptimizer:
         Args:
             generations (int): Número máximo de generaciones
             population_size (int): Tamaño de la población
+            initial_population (list): Individuos con los que sembrar la población;
+                el resto se genera como de costumbre
+            time_budget (float): Tiempo máximo de ejecución en segundos (opcional);
+                se revisa antes de evaluar cada generación, que queda pendiente en el
+                punto de control
+            verbose (bool): Mostrar el progreso
+            checkpoint_path (str): Archivo donde guardar el estado cada
+                checkpoint_interval generaciones (opcional)
+            checkpoint_interval (int): Generaciones entre puntos de control
+            resume (str): Punto de control desde el que continuar una ejecución
+                interrumpida
             
         Returns:
             dict: Mejor individuo encontrado
         
          """
-        print(f"🧬 Iniciando algoritmo genético: {generations} generaciones, población {population_size}")
+        if verbose:
+            print(f"🧬 Iniciando algoritmo genético: {generations} generaciones, población {population_size}")
         
         mutation_rate = 0.20
         crossover_rate = 0.85
         elite_rate = 0.15
-        
-        # Generar población inicial
-        population = self._generate_initial_population(population_size)
+        budget_start = time.perf_counter()
         
         best_fitness_history = []
         best_individual = None
         best_fitness = -float('inf')
         stagnation_counter = 0
-        
-        for generation in range(generations):
+        start_generation = 0
+        
+        if resume:
+            # Continuar desde el punto de control
+            state = self._load_checkpoint(resume)
+            population = state['population']
+            start_generation = state['generation']
+            best_individual = state['best_individual']
+            best_fitness = state['best_fitness']
+            best_fitness_history = state['best_fitness_history']
+            stagnation_counter = state['stagnation_counter']
+            self.fitness_cache.update(state['fitness_cache'])
+            self.elite_archive = state['elite_archive']
+            np.random.set_state(state['random_state'])
+            if verbose:
+                print(f"♻️ Reanudando desde la generación {start_generation} ({resume})")
+            if state['finished']:
+                return best_individual
+        else:
+            # Generar población inicial
+            population = self._seed_population(initial_population or [], population_size)
+        
+        def checkpoint(generation, finished=False):
+            if checkpoint_path:
+                self._save_checkpoint(checkpoint_path, {
+                    'generation': generation,
+                    'population': population,
+                    'best_individual': best_individual,
+                    'best_fitness': best_fitness,
+                    'best_fitness_history': best_fitness_history,
+                    'stagnation_counter': stagnation_counter,
+                    'fitness_cache': self.fitness_cache,
+                    'elite_archive': self.elite_archive,
+                    'random_state': np.random.get_state(),
+                    'finished': finished,
+                })
+        
+        finished = True
+        generation = start_generation
+        for generation in range(start_generation, generations):
+            # Presupuesto de tiempo agotado: la generación se guarda sin evaluar, así
+            # que al reanudar se evalúa una sola vez
+            if (
+                generation > start_generation
+                and time_budget is not None
+                and time.perf_counter() - budget_start > time_budget
+            ):
+                if verbose:
+                    print(f"⏱️ Presupuesto de tiempo agotado antes de la generación {generation}")
+                finished = False
+                break
+            
+            if generation > start_generation and (generation - start_generation) % checkpoint_interval == 0:
+                checkpoint(generation)
+            
             # Evaluar fitness para toda la población
-            fitness_scores = []
-            for individual in population:
-                fitness = self._evaluate_fitness_comprehensive(individual)
-                fitness_scores.append((fitness, individual))
+            fitness_scores = self._evaluate_population(population)
             
             # Ordenar por fitness (mayor es mejor)
             fitness_scores.sort(reverse=True, key=lambda x: x[0])
+            self._update_elite_archive(fitness_scores)
             current_best_fitness = fitness_scores[0][0]
             current_best_individual = fitness_scores[0][1]
             
@@ -231,14 +385,15 @@ class TrafficFlowOptimizer:
             best_fitness_history.append(current_best_fitness)
             
             # Mostrar progreso
-            if generation % 10 == 0 or generation == generations - 1:
+            if verbose and (generation % 10 == 0 or generation == generations - 1):
                 avg_fitness = np.mean([score for score, _ in fitness_scores])
                 print(f"Gen {generation:2d}: Mejor={current_best_fitness:.2f}, "
                       f"Promedio={avg_fitness:.2f}, Estancamiento={stagnation_counter}")
             
             # Condición de parada temprana
             if stagnation_counter > 15:
-                print(f"🛑 Parada temprana en generación {generation} (estancamiento)")
+                if verbose:
+                    print(f"🛑 Parada temprana en generación {generation} (estancamiento)")
                 break
             
             # Crear nueva generación
@@ -273,16 +428,196 @@ class TrafficFlowOptimizer:
             
             population = new_population
         
-        print(f"🎯 Optimización completada. Mejor fitness: {best_fitness:.2f}")
+        checkpoint(generation if not finished else generations, finished)
+        
+        if verbose:
+            print(f"🎯 Optimización completada. Mejor fitness: {best_fitness:.2f}")
+            if self.surrogate_screen is not None:
+                print(f"🤖 Modelo sustituto: {self.surrogate_screen.report()}")
         return best_individual if best_individual else fitness_scores[0][1]
     
+    CHECKPOINT_VERSION = 1
+    
+    def _save_checkpoint(self, path, state):
+        """Guarda el estado del algoritmo genético comprimido y de forma atómica"""
+        state = dict(state, version=self.CHECKPOINT_VERSION, cycle_time=self.cycle_time)
+        FileUtils.write_atomic(path, zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL)))
+    
+    def _load_checkpoint(self, path):
+        """Lee un punto de control escrito por _save_checkpoint"""
+        with open(path, 'rb') as checkpoint_file:
+            state = pickle.loads(zlib.decompress(checkpoint_file.read()))
+        if state.get('version') != self.CHECKPOINT_VERSION:
+            raise ValueError(f"Versión de punto de control no soportada: {state.get('version')}")
+        if state['cycle_time'] != self.cycle_time:
+            raise ValueError(
+                f"El punto de control es de un ciclo de {state['cycle_time']}s, no de {self.cycle_time}s"
+            )
+        return state
+    
+    def _resumable_checkpoint(self, path):
+        """path si guarda una ejecución sin terminar y compatible; si no, None"""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            state = self._load_checkpoint(path)
+        except (ValueError, zlib.error, pickle.UnpicklingError, EOFError) as error:
+            print(f"⚠️ Se ignora el punto de control {path}: {error}")
+            return None
+        return None if state['finished'] else path
+    
+    def attach_surrogate(self, surrogate_screen):
+        """Activa la preselección de individuos con un modelo sustituto"""
+        self.surrogate_screen = surrogate_screen
+    
+    def _evaluate_population(self, population):
+        """Evalúa la población y devuelve pares (fitness, individuo)"""
+        screen = self.surrogate_screen
+        if screen is None or not screen.is_ready():
+            return [(self._evaluate_fitness_cached(individual), individual) for individual in population]
+        
+        # Los individuos ya evaluados o inválidos no necesitan el modelo
+        fitness = [None] * len(population)
+        pending = []
+        for index, individual in enumerate(population):
+            cached = self.fitness_cache.get(self._fitness_cache_key(individual))
+            if cached is not None:
+                fitness[index] = cached
+            elif not self._validate_individual(individual):
+                fitness[index] = self._evaluate_fitness_cached(individual)
+            else:
+                pending.append(index)
+        
+        if pending:
+            demand = self._get_current_vehicle_counts()
+            features = np.array([screen.surrogate.features(population[i], demand) for i in pending])
+            selected, predicted = screen.select(features)
+            selected = set(selected)
+            estimated = {}
+            for position, index in enumerate(pending):
+                if position in selected:
+                    fitness[index] = self._evaluate_fitness_cached(
+                        population[index], predicted=predicted[position]
+                    )
+                else:
+                    fitness[index] = float(predicted[position])
+                    estimated[index] = position
+            
+            # El mejor de la generación siempre tiene fitness real
+            best_index = max(range(len(population)), key=lambda i: fitness[i])
+            while best_index in estimated:
+                position = estimated.pop(best_index)
+                fitness[best_index] = self._evaluate_fitness_cached(
+                    population[best_index], predicted=predicted[position]
+                )
+                best_index = max(range(len(population)), key=lambda i: fitness[i])
+            screen.saved_evaluations += len(estimated)
+        return list(zip(fitness, population))
+    
+    def _fitness_cache_key(self, light_times):
+        """Clave del fitness: configuración y estado de la intersección que lo determinan"""
+        vehicle_counts = self._get_current_vehicle_counts()
+        measured_delays = self._get_measured_delays()
+        directions = ['N', 'S', 'E', 'W']
+        return (
+            self.cycle_time,
+            tuple(light_times.get(d) for d in directions),
+            tuple(vehicle_counts[d] for d in directions),
+            tuple(round(measured_delays[d]) for d in directions),
+        )
+    
+    def _evaluate_fitness(self, light_times):
+        """Fitness real del individuo con la función configurada"""
+        if self.fitness_function is None:
+            return self._evaluate_fitness_comprehensive(light_times)
+        if not self._validate_individual(light_times):
+            return -1000  # Penalización severa para individuos inválidos
+        return self.fitness_function(light_times)
+    
+    def _evaluate_fitness_cached(self, light_times, predicted=None):
+        """Fitness con memoria: las configuraciones repetidas no se reevalúan"""
+        key = self._fitness_cache_key(light_times)
+        fitness = self.fitness_cache.get(key)
+        if fitness is None:
+            fitness = self._evaluate_fitness(light_times)
+            if self.surrogate_screen is not None and self._validate_individual(light_times):
+                self.surrogate_screen.true_evaluations += 1
+                self.surrogate_screen.record(
+                    self.surrogate_screen.surrogate.features(
+                        light_times, self._get_current_vehicle_counts()
+                    ),
+                    fitness,
+                    predicted,
+                )
+            if len(self.fitness_cache) >= self.fitness_cache_limit:
+                # Descartar la entrada más antigua
+                self.fitness_cache.pop(next(iter(self.fitness_cache)))
+            self.fitness_cache[key] = fitness
+        return fitness
+    
+    def _seed_population(self, seeds, size):
+        """Población inicial con los individuos semilla válidos y el resto generado"""
+        population = [individual.copy() for individual in seeds if self._validate_individual(individual)]
+        population = population[:size]
+        if len(population) < size:
+            population.extend(self._generate_initial_population(size - len(population)))
+        return population
+    
+    def _update_elite_archive(self, fitness_scores):
+        """Guarda los mejores individuos distintos de la generación"""
+        archive = []
+        for _, individual in fitness_scores:
+            if individual not in archive:
+                archive.append(individual.copy())
+            if len(archive) == self.elite_archive_size:
+                break
+        self.elite_archive = archive
+    
+    def enable_rolling_optimization(self, interval_seconds=30, generations=5, time_budget=0.05):
+        """
+        Activa la reoptimización continua durante la simulación.
+        
+        Cada interval_seconds simulados se ejecuta search_strategy partiendo del plan
+        vigente, de los mejores individuos anteriores y de la caché de fitness, sin
+        superar time_budget segundos reales por llamada. generations sólo aplica al
+        algoritmo genético por defecto, cuando no hay search_strategy.
+        """
+        self.rolling_active = True
+        self.rolling_interval_ticks = int(interval_seconds * TICKS_PER_SECOND)
+        self.rolling_generations = generations
+        self.rolling_time_budget = time_budget
+        self.rolling_ticks = 0
+    
+    def on_tick(self):
+        """Avanza el reloj del modo continuo; se llama una vez por tick de simulación"""
+        if not self.rolling_active:
+            return None
+        self.rolling_ticks += 1
+        if self.rolling_ticks % self.rolling_interval_ticks != 0:
+            return None
+        return self.rolling_optimization_step()
+    
+    def rolling_optimization_step(self):
+        """Ejecuta una reoptimización corta con arranque en caliente y aplica el resultado"""
+        seeds = list(self.elite_archive)
+        if self.current_optimal_times:
+            seeds.insert(0, self.current_optimal_times)
+        strategy = self.search_strategy or GeneticSearch(
+            generations=self.rolling_generations, verbose=False
+        )
+        best = strategy.search(self, seeds=seeds, time_budget=self.rolling_time_budget)
+        if self._validate_individual(best) and best != self._get_current_light_times():
+            self.current_optimal_times = best
+            self._apply_optimized_times(best)
+        return best
+    
     def _evaluate_fitness_comprehensive(self, light_times):
         """
         Función de evaluación multicriterio para configuraciones semafóricas.
         
         Factores considerados:
         1. Throughput (vehículos procesados)
-        2. Tiempo de espera estimado
+        2. Tiempo de espera estimado (ponderado por la demora medida en la simulación)
         3. Balance del sistema
         4. Tiempo desperdiciado
         
@@ -321,8 +656,9 @@ class TrafficFlowOptimizer:
                 efficiency = vehicles_processed / vehicles_waiting
                 throughput_score += efficiency * vehicles_waiting
         
-        # Factor 2: Tiempo de espera estimado
+        # Factor 2: Tiempo de espera estimado, ponderado por la demora medida
         waiting_time_penalty = 0
+        measured_delays = self._get_measured_delays()
         for direction in ['N', 'S', 'E', 'W']:
             vehicles_waiting = vehicle_counts[direction]
             green_time = light_times[direction]
@@ -334,8 +670,10 @@ class TrafficFlowOptimizer:
                 if time_needed > green_time:
                     # Algunos vehículos no podrán pasar en este ciclo
                     remaining_vehicles = vehicles_waiting - (green_time * self.vehicle_processing_rate)
-                    # Penalización por tiempo de espera adicional
-                    waiting_time_penalty += remaining_vehicles * (self.cycle_time / 60)  # normalizar
+                    # Penalización por tiempo de espera adicional; los accesos con
+                    # más demora real medida pesan más
+                    delay_weight = 1 + measured_delays[direction] / self.cycle_time
+                    waiting_time_penalty += remaining_vehicles * (self.cycle_time / 60) * delay_weight  # normalizar
         
         # Factor 3: Balance del sistema
         balance_score = 0
@@ -535,6 +873,137 @@ class TrafficFlowOptimizer:
         
         return individual
     
+    def optimize_light_timing_pareto(self, generations=30, population_size=40,
+                                     objective_function=None, export_path=None, verbose=True):
+        """
+        Optimización multiobjetivo estilo NSGA-II.
+        
+        En lugar de combinar los criterios en un único fitness ponderado, conserva
+        el frente de Pareto entre vehículos procesados (se maximiza), demora media
+        y espera de peatones en los cruces (se minimizan). Usa los mismos
+        operadores de cruce y mutación que el algoritmo genético.
+        
+        Args:
+            generations (int): Número de generaciones
+            population_size (int): Tamaño de la población
+            objective_function (callable): Devuelve (throughput, demora, espera
+                peatonal) de un individuo; por defecto _evaluate_objectives, o
+                SimulationObjectives para medirlos por simulación
+            export_path (str): Archivo .csv o .json donde exportar el frente
+            verbose (bool): Mostrar el progreso
+            
+        Returns:
+            list: Frente de Pareto, un dict por plan con light_times y los objetivos
+        """
+        objective_function = objective_function or self._evaluate_objectives
+        objective_cache = {}
+        
+        def evaluate(population):
+            rows = []
+            for individual in population:
+                key = tuple(individual[d] for d in ['N', 'S', 'E', 'W'])
+                if key not in objective_cache:
+                    objective_cache[key] = tuple(float(v) for v in objective_function(individual))
+                rows.append(objective_cache[key])
+            return np.array(rows, dtype=float).reshape(len(rows), len(pareto.OBJECTIVES))
+        
+        if verbose:
+            print(f"🧭 Iniciando NSGA-II: {generations} generaciones, población {population_size}")
+        
+        population = self._seed_population(self.elite_archive, population_size)
+        objectives = evaluate(population)
+        
+        for generation in range(generations):
+            costs = pareto.to_minimization(objectives)
+            ranks = pareto.non_dominated_sort(costs)
+            crowding = pareto.crowding_distance(costs, ranks)
+            
+            # Descendencia por torneo de aglomeración
+            offspring = []
+            while len(offspring) < population_size:
+                parent1 = population[self._crowded_tournament(ranks, crowding)]
+                parent2 = population[self._crowded_tournament(ranks, crowding)]
+                if np.random.random() < 0.85:
+                    child = self._smart_crossover(parent1, parent2)
+                else:
+                    child = parent1.copy()
+                if np.random.random() < 0.20:
+                    child = self._adaptive_mutation(child)
+                if not self._validate_individual(child):
+                    child = self._create_valid_individual()
+                offspring.append(child)
+            
+            # Selección del entorno sobre padres e hijos sin duplicados
+            combined = []
+            seen = set()
+            for individual in population + offspring:
+                key = tuple(individual[d] for d in ['N', 'S', 'E', 'W'])
+                if key not in seen:
+                    seen.add(key)
+                    combined.append(individual)
+            combined_objectives = evaluate(combined)
+            costs = pareto.to_minimization(combined_objectives)
+            ranks = pareto.non_dominated_sort(costs)
+            crowding = pareto.crowding_distance(costs, ranks)
+            order = np.lexsort((-crowding, ranks))[:population_size]
+            population = [combined[i] for i in order]
+            objectives = combined_objectives[order]
+            
+            if verbose and (generation % 10 == 0 or generation == generations - 1):
+                print(f"Gen {generation:2d}: Frente de Pareto={int((ranks[order] == 0).sum())} planes")
+        
+        ranks = pareto.non_dominated_sort(pareto.to_minimization(objectives))
+        front = [
+            {
+                'light_times': population[i].copy(),
+                **{name: float(objectives[i][j]) for j, (name, _) in enumerate(pareto.OBJECTIVES)},
+            }
+            for i in np.flatnonzero(ranks == 0)
+        ]
+        front.sort(key=lambda point: point['throughput'], reverse=True)
+        self.pareto_front = front
+        if export_path:
+            pareto.export_front(front, export_path)
+        if verbose:
+            print(f"🎯 Frente de Pareto con {len(front)} planes")
+        return front
+    
+    def _crowded_tournament(self, ranks, crowding):
+        """Torneo binario: gana el menor rango y, a igualdad, la mayor aglomeración"""
+        first, second = np.random.choice(len(ranks), 2, replace=False)
+        if ranks[first] != ranks[second]:
+            return first if ranks[first] < ranks[second] else second
+        return first if crowding[first] >= crowding[second] else second
+    
+    def _evaluate_objectives(self, light_times):
+        """
+        Objetivos estimados de un plan sin simular.
+        
+        - Vehículos procesados en el ciclo (como el factor 1 del fitness)
+        - Demora media: demora uniforme de Webster por acceso, ponderada por demanda
+        - Espera peatonal media: cada cruce espera mientras su acceso vehicular no
+          está en rojo, con llegadas uniformes
+        """
+        vehicle_counts = self._get_current_vehicle_counts()
+        cycle = sum(light_times.values()) + 2 * self.yellow_time * 4
+        throughput = 0
+        delay_sum = 0
+        for direction in ['N', 'S', 'E', 'W']:
+            vehicles = vehicle_counts[direction]
+            green_time = light_times[direction]
+            capacity = green_time * self.vehicle_processing_rate
+            throughput += min(vehicles, capacity)
+            green_ratio = green_time / cycle
+            saturation = min(0.99, vehicles / capacity) if capacity > 0 else 0.99
+            delay_sum += vehicles * 0.5 * cycle * (1 - green_ratio) ** 2 / (1 - saturation * green_ratio)
+        total_vehicles = sum(vehicle_counts.values())
+        mean_delay = delay_sum / total_vehicles if total_vehicles else 0.0
+        pedestrian_wait = np.mean([
+            (green_time + 2 * self.yellow_time) ** 2 / (2 * cycle)
+            for green_time in light_times.values()
+        ])
+        return throughput, mean_delay, float(pedestrian_wait)
+    
     def _calculate_expected_improvement(self):
         """Calcula la mejora esperada con la nueva configuración"""
         if not self.current_optimal_times:
@@ -581,6 +1050,10 @@ class TrafficFlowOptimizer:
             times[direction] = self.intersection.traffic_lights[direction].green_time
         return times
     
+    def _get_measured_delays(self):
+        """Obtiene la demora media medida (segundos) por dirección"""
+        return self.intersection.delay_tracker.mean_delays()
+    
     def _apply_optimized_times(self, optimal_times):
         """Aplica los tiempos optimizados a la intersección"""
         for direction, time in optimal_times.items():
@@ -591,11 +1064,15 @@ class TrafficFlowOptimizer:
         vehicle_counts = self._get_current_vehicle_counts()
         light_times = self._get_current_light_times()
         
+        delay_summary = self.intersection.delay_tracker.summary()
+        
         return {
             'vehicles_waiting': vehicle_counts,
             'current_light_times': light_times,
             'total_vehicles': sum(vehicle_counts.values()),
-            'total_green_time': sum(light_times.values())
+            'total_green_time': sum(light_times.values()),
+            'measured_delay': {d: round(delay_summary[d]['mean_delay'], 1) for d in ['N', 'S', 'E', 'W']},
+            'level_of_service': delay_summary['overall']['level_of_service']
         }
     
     def debug_optimization_state(self):
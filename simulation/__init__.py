@@ -1,4 +1,4 @@
 from .vehicle import Vehicle
 from .traffic_light import TrafficLight
 from .intersection import Intersection
-from .exceptions import CollisionErrorException
\ No newline at end of file
+from .exceptions import CollisionErrorException, StopLineViolationException
\ No newline at end of file
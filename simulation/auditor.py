@@ -0,0 +1,147 @@
+import math
+
+from config import AUDIT_INTERVAL
+from .encoding import DIRECTION_VECTORS, DIRECTIONS, RED_LIGHT
+from .exceptions import CollisionErrorException, StopLineViolationException
+
+
+class InvariantAuditor:
+    """
+    Revisión periódica de invariantes de la simulación para modo depuración y
+    pruebas largas.
+
+    Cada interval ticks verifica que:
+    - ningún par de vehículos tenga sus rectángulos superpuestos, y
+    - ningún vehículo haya cruzado la línea de parada de un semáforo en rojo.
+
+    Los pares candidatos salen de un índice espacial por celdas (hash de celdas
+    de cell_size píxeles), así que cada revisión es lineal en el número de
+    vehículos. Entre revisiones sólo se anota qué semáforos dejaron el rojo, de
+    modo que el costo por tick está acotado y el auditor puede quedar activo en
+    pruebas largas ajustando interval.
+
+    Mientras un vehículo gira se audita Vehicle.footprint, un cuadrado centrado
+    que cubre su ancho y medio largo, el mismo que barre ConflictGrid en los
+    giros.
+
+    Ante una falla lanza CollisionErrorException o StopLineViolationException con
+    el detalle de los vehículos y un IntersectionSnapshot del estado.
+
+    Atributos:
+        interval (int): Ticks entre revisiones
+        cell_size (float): Lado de las celdas del índice espacial; None usa el
+            largo de los vehículos
+        audits (int): Revisiones hechas
+    """
+
+    def __init__(self, interval=AUDIT_INTERVAL, cell_size=None):
+        if interval < 1:
+            raise ValueError("interval debe ser al menos 1")
+        self.interval = interval
+        self.cell_size = cell_size
+        self.audits = 0
+        self.__ticks = 0
+        # Vehículos que pasaron por cada semáforo en rojo en la última revisión, más
+        # los que ya tenían el frente pasado la línea sin haberse contado
+        self.__red_baseline = {}
+        self.__left_red = set()
+
+    def attach(self, intersection):
+        intersection.auditor = self
+        self.__ticks = 0
+        self.__red_baseline = {}
+        self.__left_red = set()
+
+    def on_tick(self, intersection):
+        self.__ticks += 1
+        for direction, light in intersection.traffic_lights.items():
+            if light.state != RED_LIGHT:
+                self.__left_red.add(direction)
+        if self.__ticks % self.interval == 0:
+            self.check(intersection)
+
+    def check(self, intersection):
+        """Revisa los invariantes y lanza una excepción si alguno no se cumple"""
+        self.__check_overlaps(intersection)
+        self.__check_stop_lines(intersection)
+        self.audits += 1
+
+    def __check_overlaps(self, intersection):
+        vehicles = intersection.vehicles_list()
+        cell_size = self.cell_size or intersection.layout.vehicle_length
+        footprints = [v.footprint() for v in vehicles]
+        cells = {}
+        for index, (x, y, width, height) in enumerate(footprints):
+            for column in range(math.floor(x / cell_size), math.floor((x + width) / cell_size) + 1):
+                for row in range(math.floor(y / cell_size), math.floor((y + height) / cell_size) + 1):
+                    cells.setdefault((column, row), []).append(index)
+
+        checked = set()
+        for indices in cells.values():
+            for i, first in enumerate(indices):
+                x1, y1, w1, h1 = footprints[first]
+                for second in indices[i + 1:]:
+                    if (first, second) in checked:
+                        continue
+                    checked.add((first, second))
+                    x2, y2, w2, h2 = footprints[second]
+                    if x1 < x2 + w2 and x2 < x1 + w1 and y1 < y2 + h2 and y2 < y1 + h1:
+                        raise CollisionErrorException(
+                            self.__describe(intersection, vehicles[first], vehicles[second]),
+                            intersection.snapshot(),
+                        )
+
+    def __front_past_line(self, vehicle, light):
+        # Cuánto pasó el frente del vehículo la línea de parada de su acceso
+        dx, dy = DIRECTION_VECTORS[vehicle.initial_direction]
+        front = (vehicle.x + vehicle.width * (dx > 0)) * dx + (
+            vehicle.y + vehicle.height * (dy > 0)
+        ) * dy
+        return front - (light.position[0] * dx + light.position[1] * dy)
+
+    def __check_stop_lines(self, intersection):
+        # El total por acceso no se reinicia con cada ciclo, a diferencia del de
+        # cada semáforo
+        passed = intersection.passing_vehicles_total
+        baseline = {}
+        for direction in DIRECTIONS:
+            light = intersection.traffic_lights[direction]
+            if light.state != RED_LIGHT:
+                continue
+            # Los que cruzaron en amarillo se cuentan en el tick siguiente
+            in_flight = [
+                v
+                for v in intersection.vehicles[direction]
+                if not v.has_counted and self.__front_past_line(v, light) > 0
+            ]
+            previous = self.__red_baseline.get(direction)
+            if (
+                previous is not None
+                and direction not in self.__left_red
+                and passed[direction] > previous
+            ):
+                # Los últimos en cruzar son los contados más cerca de la línea
+                crossed = sorted(
+                    (v for v in intersection.vehicles[direction] if v.has_counted),
+                    key=lambda v: self.__front_past_line(v, light),
+                )[: passed[direction] - previous]
+                raise StopLineViolationException(
+                    f"acceso {direction} con {passed[direction] - previous} "
+                    f"vehículos de más; " + self.__describe(intersection, *crossed),
+                    intersection.snapshot(),
+                )
+            baseline[direction] = passed[direction] + len(in_flight)
+        self.__red_baseline = baseline
+        self.__left_red = set()
+
+    def __describe(self, intersection, *vehicles):
+        lights = ", ".join(
+            f"{d}={intersection.traffic_lights[d].state}" for d in DIRECTIONS
+        )
+        details = [
+            f"{v.initial_direction}->{v.final_direction} ({v.x:.1f}, {v.y:.1f}, "
+            f"{v.width}x{v.height}) velocidad={v.speed:.2f} girando={v.is_turning} "
+            f"giró={v.has_turned} contado={v.has_counted}"
+            for v in vehicles
+        ]
+        return f"tick {self.__ticks} semáforos [{lights}] " + "; ".join(details)
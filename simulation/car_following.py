@@ -0,0 +1,215 @@
+import numpy as np
+
+from config import DEFAULT_VEHICLE_SPEED, TICKS_PER_SECOND, VEHICLE_SPACING
+from .encoding import DIRECTION_CODES, DIRECTION_VECTORS, DIRECTIONS, LIGHT_STOPS_VEHICLES, YELLOW_LIGHT
+
+# Componentes de DIRECTION_VECTORS y LIGHT_STOPS_VEHICLES indexables por código
+_VECTOR_X = np.array([DIRECTION_VECTORS[d][0] for d in DIRECTIONS])
+_VECTOR_Y = np.array([DIRECTION_VECTORS[d][1] for d in DIRECTIONS])
+_STOPS_VEHICLES = np.array(LIGHT_STOPS_VEHICLES)
+
+
+class IntelligentDriverModel:
+    """
+    Dinámica longitudinal con el Intelligent Driver Model (IDM).
+
+    Cada vehículo acelera hacia la velocidad deseada y frena según la brecha con
+    su líder y la diferencia de velocidades:
+
+        a = a_max * (1 - (v / v0)^delta - (s* / s)^2)
+        s* = s0 + v * T + v * dv / (2 * sqrt(a_max * b))
+
+    Los líderes se buscan por corriente: los vehículos de un acceso que aún no
+    giran forman una, y los que ya giraron forman otra por acceso y destino. Todo
+    el cálculo (orden, brechas y aceleraciones) son operaciones de NumPy sobre los
+    pares líder-seguidor, sin recorrer pares de vehículos en Python.
+
+    La línea de parada con el semáforo en rojo es un obstáculo detenido; en
+    amarillo sólo frenan los vehículos que alcanzan a detenerse con la
+    desaceleración cómoda. Un vehículo detenido arranca reaction_time segundos
+    después de tener espacio para hacerlo, lo que produce el tiempo perdido al
+    inicio del verde.
+
+    Las distancias están en píxeles y los tiempos en segundos.
+
+    Atributos:
+        desired_speed (float): Velocidad deseada v0 (px/s)
+        max_acceleration (float): Aceleración máxima a_max (px/s²)
+        comfortable_deceleration (float): Desaceleración cómoda b (px/s²)
+        time_headway (float): Intervalo de seguimiento deseado T (s)
+        minimum_gap (float): Brecha mínima con el vehículo detenido de adelante s0 (px)
+        reaction_time (float): Demora en arrancar desde el reposo (s)
+        exponent (float): Exponente de aceleración delta
+    """
+
+    # Por debajo de esta velocidad (px/s) un vehículo que frena se considera detenido
+    STOP_SPEED = 1.0
+    # Fracción de a_max necesaria para arrancar desde el reposo; evita que la cola
+    # avance a pasos cortos cada vez que se abre un poco de espacio
+    START_ACCELERATION_RATIO = 0.5
+
+    def __init__(self, desired_speed=DEFAULT_VEHICLE_SPEED * TICKS_PER_SECOND, max_acceleration=30.0,
+                 comfortable_deceleration=40.0, time_headway=1.0, minimum_gap=VEHICLE_SPACING,
+                 reaction_time=0.6, exponent=4):
+        self.desired_speed = desired_speed
+        self.max_acceleration = max_acceleration
+        self.comfortable_deceleration = comfortable_deceleration
+        self.time_headway = time_headway
+        self.minimum_gap = minimum_gap
+        self.reaction_time = reaction_time
+        self.exponent = exponent
+        self.__saturation_flows = {}
+
+    def attach(self, intersection):
+        intersection.car_following = self
+
+    def saturation_flow(self, vehicle_length):
+        """
+        Flujo máximo en régimen estacionario (vehículos/segundo) con vehículos de
+        largo vehicle_length (px).
+
+        En equilibrio un vehículo a velocidad v mantiene la brecha
+        s_e(v) = (s0 + v * T) / sqrt(1 - (v / v0)^delta), así que el flujo es
+        v / (s_e(v) + largo); se toma su máximo sobre v.
+        """
+        key = (
+            self.desired_speed,
+            self.time_headway,
+            self.minimum_gap,
+            self.exponent,
+            vehicle_length,
+        )
+        cached = self.__saturation_flows.get(key)
+        if cached is None:
+            speeds = np.linspace(0.0, self.desired_speed, 2001)[1:-1]
+            gaps = (self.minimum_gap + speeds * self.time_headway) / np.sqrt(
+                1 - (speeds / self.desired_speed) ** self.exponent
+            )
+            cached = float(np.max(speeds / (gaps + vehicle_length)))
+            self.__saturation_flows[key] = cached
+        return cached
+
+    def update(self, intersection):
+        """Fija speed e is_stopped de todos los vehículos para el tick actual"""
+        vehicles = intersection.vehicles_list()
+        if not vehicles:
+            return
+
+        # Unidades de la simulación: píxeles y ticks
+        v0 = self.desired_speed / TICKS_PER_SECOND
+        a_max = self.max_acceleration / TICKS_PER_SECOND**2
+        b = self.comfortable_deceleration / TICKS_PER_SECOND**2
+        headway = self.time_headway * TICKS_PER_SECOND
+        reaction_ticks = self.reaction_time * TICKS_PER_SECOND
+        stop_speed = self.STOP_SPEED / TICKS_PER_SECOND
+
+        state = np.array(
+            [
+                (
+                    v.x,
+                    v.y,
+                    v.width,
+                    v.height,
+                    v.speed,
+                    DIRECTION_CODES[v.initial_direction],
+                    DIRECTION_CODES[v.final_direction] + 1 if v.has_turned else 0,
+                    not v.has_turned and not v.has_counted,
+                    v.is_turning,
+                    DIRECTION_CODES[v.final_direction],
+                )
+                for v in vehicles
+            ],
+            dtype=float,
+        )
+        x, y, width, height, speed = state[:, :5].T
+        approach = state[:, 5].astype(np.intp)
+        exit_code = state[:, 6].astype(np.intp)
+        before_line = state[:, 7].astype(bool)
+
+        # Cada vehículo avanza sobre el eje de su acceso o, si ya giró, de su destino
+        axis = np.where(exit_code > 0, exit_code - 1, approach)
+        dx = _VECTOR_X[axis]
+        dy = _VECTOR_Y[axis]
+        front = (x + width * (dx > 0)) * dx + (y + height * (dy > 0)) * dy
+        rear = (x + width * (dx < 0)) * dx + (y + height * (dy < 0)) * dy
+        stream = approach * (len(DIRECTIONS) + 1) + exit_code
+
+        # Un vehículo que gira sigue en la corriente de su acceso y además busca
+        # líder en la de su destino, para no terminar el giro encima de otro
+        turning = np.flatnonzero(state[:, 8])
+        final = state[turning, 9].astype(np.intp)
+        tx = _VECTOR_X[final]
+        ty = _VECTOR_Y[final]
+        x_t, y_t, width_t, height_t = x[turning], y[turning], width[turning], height[turning]
+        front = np.concatenate(
+            (front, (x_t + width_t * (tx > 0)) * tx + (y_t + height_t * (ty > 0)) * ty)
+        )
+        rear = np.concatenate(
+            (rear, (x_t + width_t * (tx < 0)) * tx + (y_t + height_t * (ty < 0)) * ty)
+        )
+        stream = np.concatenate((stream, approach[turning] * (len(DIRECTIONS) + 1) + final + 1))
+        owner = np.concatenate((np.arange(len(vehicles)), turning))
+
+        # Pares líder-seguidor: el siguiente vehículo de la misma corriente
+        order = np.lexsort((front, stream))
+        same_stream = stream[order[1:]] == stream[order[:-1]]
+        row_gap = np.full(len(owner), np.inf)
+        followers = order[:-1][same_stream]
+        leaders = order[1:][same_stream]
+        row_gap[followers] = rear[leaders] - front[followers]
+        row_leader = np.arange(len(owner))
+        row_leader[followers] = leaders
+        # Cada vehículo se queda con la brecha más corta de sus filas
+        gap = row_gap[: len(vehicles)].copy()
+        leader = owner[row_leader[: len(vehicles)]]
+        extra_gap = row_gap[len(vehicles):]
+        closer = extra_gap < gap[turning]
+        gap[turning[closer]] = extra_gap[closer]
+        leader[turning[closer]] = owner[row_leader[len(vehicles):][closer]]
+        leader_speed = speed[leader]
+        front = front[: len(vehicles)]
+
+        # La línea de parada es un líder detenido mientras el semáforo detiene vehículos
+        light_states = np.array([intersection.traffic_lights[d].state for d in DIRECTIONS])
+        stop_lines = np.array(
+            [
+                np.dot(intersection.traffic_lights[d].position, DIRECTION_VECTORS[d])
+                for d in DIRECTIONS
+            ]
+        )
+        line_gap = stop_lines[approach] - front
+        stops = _STOPS_VEHICLES[light_states][approach] & before_line & (line_gap >= 0)
+        cannot_stop = speed**2 / (2 * b) > line_gap
+        stops &= ~((light_states[approach] == YELLOW_LIGHT) & cannot_stop)
+        stops &= line_gap < gap
+        gap = np.where(stops, line_gap, gap)
+        leader_speed = np.where(stops, 0.0, leader_speed)
+
+        desired_gap = self.minimum_gap + np.maximum(
+            0.0, speed * headway + speed * (speed - leader_speed) / (2 * np.sqrt(a_max * b))
+        )
+        interaction = (desired_gap / np.maximum(gap, 1e-6)) ** 2
+        acceleration = a_max * (1 - (speed / v0) ** self.exponent - interaction)
+
+        # Tiempo de reacción al arrancar desde el reposo; la cuenta de cada vehículo
+        # vive en el vehículo para que los snapshots la conserven
+        waiting = np.fromiter((v.start_delay for v in vehicles), dtype=float, count=len(vehicles))
+        at_rest = speed == 0
+        starting = at_rest & (acceleration > self.START_ACCELERATION_RATIO * a_max)
+        waiting = np.where(starting, waiting + 1, 0)
+        acceleration = np.where(
+            at_rest & (~starting | (waiting <= reaction_ticks)),
+            np.minimum(acceleration, 0.0),
+            acceleration,
+        )
+
+        new_speed = np.maximum(0.0, speed + acceleration)
+        new_speed[(acceleration < 0) & (new_speed < stop_speed)] = 0.0
+        # Nunca avanzar más que la brecha disponible en un tick
+        new_speed = np.minimum(new_speed, np.maximum(0.0, gap))
+
+        for vehicle, value, delay in zip(vehicles, new_speed.tolist(), waiting.tolist()):
+            vehicle.speed = value
+            vehicle.is_stopped = value == 0
+            vehicle.start_delay = int(delay)
+
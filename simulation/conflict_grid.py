@@ -0,0 +1,193 @@
+import math
+
+import numpy as np
+
+from config import VEHICLE_SPACING
+from .encoding import DIRECTION_CODES, DIRECTION_VECTORS, DIRECTIONS, RED_LIGHT
+from .turning_path import TURN_ANGLE_LIMITS, TurningPath
+
+# Bits de cada celda: un bit por acceso de los vehículos que la ocupan, uno para
+# peatones y uno que marca vehículos en movimiento
+PEDESTRIAN_BIT = 1 << len(DIRECTIONS)
+MOVING_BIT = PEDESTRIAN_BIT << 1
+APPROACH_BITS = {direction: 1 << code for direction, code in DIRECTION_CODES.items()}
+ALL_APPROACHES = sum(APPROACH_BITS.values())
+
+# Lado de cada celda (px)
+CELL_SIZE = 10
+
+
+class ConflictGrid:
+    """
+    Rejilla de reservas sobre el cruce central y los pasos peatonales.
+
+    En cada tick la rejilla se vacía y cada vehículo y peatón marca con su bit las
+    celdas que cubre su cuerpo. Un vehículo que entra al cruce reserva además el
+    corredor de su movimiento (celdas que barre su trayectoria, precalculadas por
+    movimiento) hasta salir de la rejilla. Antes de moverse, cada agente revisa
+    las celdas del tramo que tiene adelante: un conflicto es una prueba de bits
+    sobre esas celdas, sin comparar pares de agentes, así que el costo crece con
+    el número de agentes y no con el de pares.
+
+    Prioridades (sin bloqueos mutuos):
+    - Un vehículo entra al cruce sólo si su corredor no está reservado por
+      vehículos de otros accesos; adentro despeja el cruce sin ceder a vehículos.
+    - Los vehículos ceden a los peatones que tienen adelante.
+    - Los peatones ceden a vehículos en movimiento; un vehículo detenido no los
+      bloquea.
+
+    Los vehículos de un mismo acceso no se revisan aquí: los ordena su carril.
+
+    Atributos:
+        origin (tuple): Esquina superior izquierda de la rejilla
+        cells (np.ndarray): Bits de ocupación de cada celda (filas, columnas)
+        corridors (dict): Índices planos de las celdas de cada movimiento (inicial, final)
+        vehicle_yields (int): Veces que un vehículo se detuvo por un conflicto
+        pedestrian_yields (int): Veces que un peatón se detuvo por un conflicto
+    """
+
+    def __init__(self, layout, cell_size=CELL_SIZE, clearance=VEHICLE_SPACING):
+        # Los pasos peatonales rodean el cruce a menos de un cuarto de vía
+        margin = layout.road_quarter
+        self.cell_size = cell_size
+        self.clearance = clearance
+        self.origin = (layout.left - margin, layout.top - margin)
+        self.cells = np.zeros(
+            (
+                math.ceil((layout.bottom - layout.top + 2 * margin) / cell_size),
+                math.ceil((layout.right - layout.left + 2 * margin) / cell_size),
+            ),
+            dtype=np.uint8,
+        )
+        # Avance de la línea de parada de cada acceso sobre el eje del acceso
+        self.stop_lines = {
+            d: np.dot(layout.stop_lines[d], DIRECTION_VECTORS[d]) for d in DIRECTIONS
+        }
+        self.corridors = {
+            (initial, final): self.__corridor(layout, initial, final)
+            for initial in DIRECTIONS
+            for final in DIRECTIONS
+            if (initial, final) in TURN_ANGLE_LIMITS or initial == final
+        }
+        self.vehicle_yields = 0
+        self.pedestrian_yields = 0
+
+    def __corridor(self, layout, initial, final):
+        # Celdas que barre el cuerpo del vehículo desde la línea de parada hasta
+        # salir de la rejilla por el carril de salida
+        swept = np.zeros_like(self.cells)
+        self.cells = swept
+        width = layout.vehicle_width
+        reach = max(swept.shape) * self.cell_size
+        start = layout.stop_lines[initial]
+        path = TurningPath.get(layout, (initial, final))
+        if path is not None:
+            self.__claim_segment(start, path.start, width)
+            # En el giro el vehículo cambia de orientación: se barre un cuadrado
+            # que cubre su ancho y medio largo alrededor del centro
+            side = width + (layout.vehicle_length - width) / 2
+            for x, y in zip(path.xs, path.ys):
+                self.claim(x - side / 2, y - side / 2, side, side, 1)
+            start = path.end
+        dx, dy = DIRECTION_VECTORS[final]
+        self.__claim_segment(start, (start[0] + dx * reach, start[1] + dy * reach), width)
+        self.cells = np.zeros_like(swept)
+        return np.flatnonzero(swept)
+
+    def __claim_segment(self, start, end, width):
+        # Franja de ancho width centrada en un tramo horizontal o vertical
+        (x0, y0), (x1, y1) = start, end
+        half = width / 2
+        self.claim(
+            min(x0, x1) - half, min(y0, y1) - half, abs(x1 - x0) + width, abs(y1 - y0) + width, 1
+        )
+
+    def __window(self, x, y, width, height):
+        rows, columns = self.cells.shape
+        left = max(0, int((x - self.origin[0]) // self.cell_size))
+        right = min(columns, math.ceil((x + width - self.origin[0]) / self.cell_size))
+        top = max(0, int((y - self.origin[1]) // self.cell_size))
+        bottom = min(rows, math.ceil((y + height - self.origin[1]) / self.cell_size))
+        if left >= right or top >= bottom:
+            return None
+        return self.cells[top:bottom, left:right]
+
+    def claim(self, x, y, width, height, bits):
+        cells = self.__window(x, y, width, height)
+        if cells is not None:
+            cells |= bits
+
+    def is_free(self, x, y, width, height, mask):
+        cells = self.__window(x, y, width, height)
+        return cells is None or not (cells & mask).any()
+
+    def __ahead(self, agent, direction, distance):
+        # Tramo de largo distance frente al agente, con su mismo ancho
+        dx, dy = DIRECTION_VECTORS[direction]
+        if dx > 0:
+            return agent.x + agent.width, agent.y, distance, agent.height
+        if dx < 0:
+            return agent.x - distance, agent.y, distance, agent.height
+        if dy > 0:
+            return agent.x, agent.y + agent.height, agent.width, distance
+        return agent.x, agent.y - distance, agent.width, distance
+
+    def __line_gap(self, vehicle):
+        # Distancia del frente del vehículo a la línea de parada de su acceso
+        dx, dy = DIRECTION_VECTORS[vehicle.initial_direction]
+        front = (vehicle.x + vehicle.width * (dx > 0)) * dx + (
+            vehicle.y + vehicle.height * (dy > 0)
+        ) * dy
+        return self.stop_lines[vehicle.initial_direction] - front
+
+    def update(self, intersection):
+        """Reserva las celdas de todos los agentes y detiene a los que deben ceder"""
+        cells = self.cells
+        cells.fill(0)
+        vehicles = intersection.vehicles_list()
+        for v in vehicles:
+            self.claim(v.x, v.y, v.width, v.height, APPROACH_BITS[v.initial_direction])
+            if v.has_counted and self.__window(v.x, v.y, v.width, v.height) is not None:
+                cells.flat[self.corridors[(v.initial_direction, v.final_direction)]] |= APPROACH_BITS[
+                    v.initial_direction
+                ]
+        for p in intersection.pedestrians:
+            self.claim(p.x, p.y, p.width, p.height, PEDESTRIAN_BIT)
+
+        for v in vehicles:
+            # Ya detenido por el semáforo o por el vehículo de adelante
+            if v.is_stopped:
+                continue
+            if v.has_counted:
+                direction = v.final_direction if v.has_turned or v.is_turning else v.initial_direction
+                mask = PEDESTRIAN_BIT
+            else:
+                direction = v.initial_direction
+                mask = PEDESTRIAN_BIT | (ALL_APPROACHES & ~APPROACH_BITS[direction])
+            distance = v.speed + self.clearance
+            blocked = not self.is_free(*self.__ahead(v, direction, distance), mask)
+            if (
+                not blocked
+                and not v.has_counted
+                and intersection.traffic_lights[direction].state != RED_LIGHT
+                and self.__line_gap(v) <= distance
+            ):
+                # Por entrar al cruce: necesita su corredor libre y lo reserva
+                corridor = self.corridors[(direction, v.final_direction)]
+                blocked = bool((cells.flat[corridor] & mask).any())
+                if not blocked:
+                    cells.flat[corridor] |= APPROACH_BITS[direction]
+            if blocked:
+                v.is_stopped = True
+                v.speed = 0
+                self.vehicle_yields += 1
+            else:
+                # Sólo bloquea peatones el vehículo que sigue en movimiento tras el
+                # semáforo y tras ceder
+                self.claim(v.x, v.y, v.width, v.height, MOVING_BIT)
+
+        for p in intersection.pedestrians:
+            distance = p.speed + self.clearance
+            if not self.is_free(*self.__ahead(p, p.direction_movement, distance), MOVING_BIT):
+                p.is_stopped = True
+                self.pedestrian_yields += 1
@@ -0,0 +1,177 @@
+from array import array
+
+import numpy as np
+
+from config import TICKS_PER_SECOND
+from .encoding import DIRECTION_CODES, DIRECTIONS
+
+
+class DelayTracker:
+    """
+    Mide la demora real de cada vehículo a partir de Vehicle.is_stopped.
+
+    Los acumuladores por vehículo (ticks detenido, ticks en el sistema y número de
+    paradas) viven en arreglos compactos indexados por un espacio asignado al
+    vehículo, no como atributos del objeto. Al terminar un viaje la demora se suma
+    de forma incremental al histograma de su acceso.
+
+    La demora media incluye el tiempo detenido de los viajes en curso; si no, un
+    acceso que nunca descarga tendría demora cero y nivel de servicio A.
+
+    Atributos:
+        histogram_bin_seconds (int): Ancho de cada intervalo del histograma
+        histograms (np.ndarray): Conteo de viajes por acceso e intervalo de demora;
+            el último intervalo acumula las demoras mayores
+    """
+
+    HISTOGRAM_BINS = 25
+    # Umbrales de demora (s) del nivel de servicio en intersecciones semaforizadas
+    LEVEL_OF_SERVICE = ((10, "A"), (20, "B"), (35, "C"), (55, "D"), (80, "E"))
+
+    def __init__(self, histogram_bin_seconds=5):
+        self.histogram_bin_seconds = histogram_bin_seconds
+        self.reset()
+
+    def reset(self):
+        self.__slots = {}
+        self.__free_slots = []
+        self.__stopped_ticks = array("i")
+        self.__system_ticks = array("i")
+        self.__stops = array("i")
+        self.__was_stopped = array("b")
+        self.__direction = array("b")
+        self.__in_trip = array("b")
+        self.histograms = np.zeros((len(DIRECTIONS), self.HISTOGRAM_BINS), dtype=np.int64)
+        self.delay_sum = np.zeros(len(DIRECTIONS))
+        self.system_time_sum = np.zeros(len(DIRECTIONS))
+        self.stops_sum = np.zeros(len(DIRECTIONS), dtype=np.int64)
+        self.trips = np.zeros(len(DIRECTIONS), dtype=np.int64)
+
+    def start_trip(self, vehicle):
+        key = id(vehicle)
+        slot = self.__slots.get(key)
+        if slot is None:
+            if self.__free_slots:
+                slot = self.__free_slots.pop()
+            else:
+                slot = len(self.__stopped_ticks)
+                for store in (
+                    self.__stopped_ticks,
+                    self.__system_ticks,
+                    self.__stops,
+                    self.__was_stopped,
+                    self.__direction,
+                    self.__in_trip,
+                ):
+                    store.append(0)
+            self.__slots[key] = slot
+        self.__stopped_ticks[slot] = 0
+        self.__system_ticks[slot] = 0
+        self.__stops[slot] = 0
+        self.__was_stopped[slot] = 0
+        self.__direction[slot] = DIRECTION_CODES[vehicle.initial_direction]
+        self.__in_trip[slot] = 1
+
+    def observe(self, vehicle):
+        slot = self.__slots.get(id(vehicle))
+        if slot is None:
+            return
+        self.__system_ticks[slot] += 1
+        if vehicle.is_stopped:
+            self.__stopped_ticks[slot] += 1
+            if not self.__was_stopped[slot]:
+                self.__stops[slot] += 1
+                self.__was_stopped[slot] = 1
+        else:
+            self.__was_stopped[slot] = 0
+
+    def finish_trip(self, vehicle):
+        slot = self.__slots.get(id(vehicle))
+        if slot is None or not self.__in_trip[slot]:
+            return
+        self.__in_trip[slot] = 0
+        code = self.__direction[slot]
+        delay = self.__stopped_ticks[slot] / TICKS_PER_SECOND
+        bin_index = min(int(delay // self.histogram_bin_seconds), self.HISTOGRAM_BINS - 1)
+        self.histograms[code, bin_index] += 1
+        self.delay_sum[code] += delay
+        self.system_time_sum[code] += self.__system_ticks[slot] / TICKS_PER_SECOND
+        self.stops_sum[code] += self.__stops[slot]
+        self.trips[code] += 1
+
+    def release(self, vehicle):
+        slot = self.__slots.pop(id(vehicle), None)
+        if slot is not None:
+            self.__free_slots.append(slot)
+
+    def unfinished(self):
+        """Viajes en curso y sus segundos detenidos hasta ahora, por acceso"""
+        trips = np.zeros(len(DIRECTIONS), dtype=np.int64)
+        delay = np.zeros(len(DIRECTIONS))
+        for slot in self.__slots.values():
+            if self.__in_trip[slot]:
+                code = self.__direction[slot]
+                trips[code] += 1
+                delay[code] += self.__stopped_ticks[slot] / TICKS_PER_SECOND
+        return trips, delay
+
+    def mean_delays(self):
+        """Demora media por acceso de los viajes terminados y en curso"""
+        unfinished_trips, unfinished_delay = self.unfinished()
+        trips = self.trips + unfinished_trips
+        delay = self.delay_sum + unfinished_delay
+        return {
+            d: float(delay[i] / trips[i]) if trips[i] else 0.0
+            for i, d in enumerate(DIRECTIONS)
+        }
+
+    def level_of_service(self, delay):
+        for threshold, level in self.LEVEL_OF_SERVICE:
+            if delay <= threshold:
+                return level
+        return "F"
+
+    def summary(self):
+        """
+        Resume las demoras medidas.
+
+        La demora media y el nivel de servicio cuentan también los viajes en curso,
+        que además se informan aparte; el tiempo en el sistema, las paradas y el
+        histograma son sólo de los viajes terminados.
+
+        Returns:
+            dict: Por dirección, viajes, demora media, viajes en curso y su demora
+                media, tiempo medio en el sistema, paradas medias, nivel de servicio
+                e histograma
+        """
+        mean_delays = self.mean_delays()
+        unfinished_trips, unfinished_delay = self.unfinished()
+        summary = {}
+        for i, d in enumerate(DIRECTIONS):
+            trips = int(self.trips[i])
+            summary[d] = {
+                "trips": trips,
+                "mean_delay": mean_delays[d],
+                "unfinished_trips": int(unfinished_trips[i]),
+                "unfinished_delay": (
+                    float(unfinished_delay[i] / unfinished_trips[i]) if unfinished_trips[i] else 0.0
+                ),
+                "mean_system_time": float(self.system_time_sum[i] / trips) if trips else 0.0,
+                "mean_stops": float(self.stops_sum[i] / trips) if trips else 0.0,
+                "level_of_service": self.level_of_service(mean_delays[d]),
+                "histogram": self.histograms[i].tolist(),
+            }
+        total_trips = int(self.trips.sum())
+        measured_trips = total_trips + int(unfinished_trips.sum())
+        overall_delay = (
+            float((self.delay_sum.sum() + unfinished_delay.sum()) / measured_trips)
+            if measured_trips
+            else 0.0
+        )
+        summary["overall"] = {
+            "trips": total_trips,
+            "unfinished_trips": int(unfinished_trips.sum()),
+            "mean_delay": overall_delay,
+            "level_of_service": self.level_of_service(overall_delay),
+        }
+        return summary
@@ -0,0 +1,198 @@
+import bisect
+import math
+import random
+
+from config import TICKS_PER_SECOND, VEHICLE_POOL_SIZE
+from .encoding import DIRECTIONS
+from .vehicle import Vehicle
+
+
+class PoissonArrivals:
+    """Llegadas de Poisson con tasa constante (vehículos/hora)"""
+
+    def __init__(self, rate_per_hour, rng=random):
+        self.rate_per_hour = rate_per_hour
+        self.rng = rng
+
+    def restart(self):
+        pass
+
+    def next_arrival(self, time_seconds):
+        if self.rate_per_hour <= 0:
+            return math.inf
+        return time_seconds + self.rng.expovariate(self.rate_per_hour / 3600)
+
+
+class TimeVaryingArrivals:
+    """
+    Llegadas de Poisson no homogéneas generadas por adelgazamiento (thinning).
+
+    Args:
+        profile (list): Pares (segundo de inicio, vehículos/hora) ordenados; la
+            última tasa se mantiene hasta el final de la simulación
+    """
+
+    def __init__(self, profile, rng=random):
+        self.starts = [start for start, _ in profile]
+        self.rates = [rate for _, rate in profile]
+        self.max_rate = max(self.rates)
+        self.rng = rng
+
+    def rate_at(self, time_seconds):
+        index = bisect.bisect_right(self.starts, time_seconds) - 1
+        return self.rates[index] if index >= 0 else 0
+
+    def restart(self):
+        pass
+
+    def next_arrival(self, time_seconds):
+        if self.max_rate <= 0:
+            return math.inf
+        while True:
+            time_seconds += self.rng.expovariate(self.max_rate / 3600)
+            if self.rng.random() * self.max_rate <= self.rate_at(time_seconds):
+                return time_seconds
+
+
+class TraceArrivals:
+    """Llegadas leídas de una traza de tiempos (segundos) ordenados"""
+
+    def __init__(self, times):
+        self.times = sorted(times)
+        self.__index = 0
+
+    def restart(self):
+        self.__index = 0
+
+    def next_arrival(self, time_seconds):
+        if self.__index >= len(self.times):
+            return math.inf
+        arrival = self.times[self.__index]
+        self.__index += 1
+        return arrival
+
+
+class VehiclePool:
+    """
+    Conjunto preasignado de vehículos reutilizados mediante una lista libre.
+
+    Atributos:
+        capacity (int): Número de vehículos preasignados
+        vehicles_assets (dict): Recursos por dirección (None sin interfaz)
+    """
+
+    def __init__(self, capacity=VEHICLE_POOL_SIZE, vehicles_assets=None, layout=None):
+        self.capacity = capacity
+        self.vehicles_assets = vehicles_assets
+        self.__vehicles = [Vehicle("N", "N", layout) for _ in range(capacity)]
+        self.__members = {id(v) for v in self.__vehicles}
+        self.__free = list(self.__vehicles)
+
+    def __len__(self):
+        return len(self.__free)
+
+    def owns(self, vehicle):
+        return id(vehicle) in self.__members
+
+    def take(self):
+        """Saca un vehículo libre sin inicializarlo (None si no quedan)"""
+        return self.__free.pop() if self.__free else None
+
+    def acquire(self, direction, rng=random, turning_ratios=None):
+        vehicle = self.take()
+        if vehicle is None:
+            return None
+        vehicle.initial_direction = direction
+        vehicle.final_direction = direction
+        vehicle.change_random_final_direction(rng, turning_ratios)
+        vehicle.asset = (
+            rng.choice(self.vehicles_assets[direction]) if self.vehicles_assets else None
+        )
+        vehicle.changed_asset = False
+        vehicle.has_turned = False
+        vehicle.initial_offset = 0
+        vehicle.calculate_size()
+        vehicle.reset_to_initial_state()
+        vehicle.is_stopped = False
+        return vehicle
+
+    def release(self, vehicle):
+        self.__free.append(vehicle)
+
+
+class DemandGenerator:
+    """
+    Generador de demanda abierta: los vehículos llegan a cada acceso según un
+    proceso de llegadas y salen del sistema al abandonar la simulación.
+
+    Los vehículos salen de un VehiclePool, por lo que en régimen estable no se
+    crean objetos nuevos. Las llegadas que no caben en la entrada del acceso
+    esperan en una cola vertical (backlog) hasta que haya espacio.
+
+    Atributos:
+        intersection (Intersection): Intersección alimentada
+        arrivals (dict): Proceso de llegadas por dirección
+        pool (VehiclePool): Vehículos reutilizables
+        backlog (dict): Llegadas pendientes de entrar por dirección
+        exit_callback (callable): Se llama con cada vehículo que sale (opcional)
+    """
+
+    def __init__(self, intersection, arrivals, pool=None, rng=random):
+        self.intersection = intersection
+        self.arrivals = dict(arrivals)
+        self.rng = rng
+        self.pool = pool or VehiclePool(
+            vehicles_assets=(
+                intersection.simulation_view.vehicles_assets
+                if intersection.simulation_view is not None
+                else None
+            ),
+            layout=intersection.layout,
+        )
+        self.backlog = {d: 0 for d in DIRECTIONS}
+        self.exit_callback = None
+        self.ticks = 0
+        self.__next_arrival = {}
+        self.restart()
+        intersection.demand_generator = self
+
+    def restart(self):
+        for direction in DIRECTIONS:
+            for vehicle in list(self.intersection.vehicles[direction]):
+                if self.pool.owns(vehicle):
+                    self.intersection.remove_vehicle(vehicle)
+                    self.pool.release(vehicle)
+        self.ticks = 0
+        self.backlog = {d: 0 for d in DIRECTIONS}
+        for process in self.arrivals.values():
+            process.restart()
+        self.__next_arrival = {
+            d: process.next_arrival(0) for d, process in self.arrivals.items()
+        }
+
+    def tick(self):
+        self.ticks += 1
+        time_seconds = self.ticks / TICKS_PER_SECOND
+        for direction, process in self.arrivals.items():
+            while self.__next_arrival[direction] <= time_seconds:
+                self.backlog[direction] += 1
+                self.__next_arrival[direction] = process.next_arrival(
+                    self.__next_arrival[direction]
+                )
+        for direction in DIRECTIONS:
+            if self.backlog[direction] and self.intersection.entry_is_clear(direction):
+                vehicle = self.pool.acquire(
+                    direction, self.rng, self.intersection.turning_ratios
+                )
+                if vehicle is None:
+                    continue
+                self.intersection.add_vehicle(vehicle)
+                self.backlog[direction] -= 1
+
+    def enqueue(self, direction, amount=1):
+        self.backlog[direction] += amount
+
+    def release(self, vehicle):
+        if self.exit_callback is not None:
+            self.exit_callback(vehicle)
+        self.pool.release(vehicle)
@@ -0,0 +1,20 @@
+from config import GREEN, RED, YELLOW
+
+DIRECTIONS = ("N", "S", "E", "W")
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+# Vector unitario de avance de cada dirección (y crece hacia abajo)
+DIRECTION_VECTORS = {"N": (0, -1), "S": (0, 1), "E": (1, 0), "W": (-1, 0)}
+
+# Estados de los semáforos como enteros; el color sólo se resuelve al dibujar
+RED_LIGHT = 0
+YELLOW_LIGHT = 1
+GREEN_LIGHT = 2
+LIGHT_STATES = (RED_LIGHT, YELLOW_LIGHT, GREEN_LIGHT)
+LIGHT_STATE_NAMES = ("RED", "YELLOW", "GREEN")
+LIGHT_COLORS = (RED, YELLOW, GREEN)
+# Indica por estado si los vehículos deben detenerse antes de la línea de parada
+LIGHT_STOPS_VEHICLES = (True, True, False)
+
+# Accesos y esquinas del grafo peatonal (TrafficUtils.pedestrian_graph)
+PEDESTRIAN_POINTS = ("NE", "SE", "NW", "SW", "EN", "WN", "ES", "WS", "TL", "TR", "BL", "BR")
+PEDESTRIAN_POINT_CODES = {point: code for code, point in enumerate(PEDESTRIAN_POINTS)}
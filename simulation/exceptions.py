@@ -1,3 +1,15 @@
 class CollisionErrorException(Exception):
-    def __init__(self):
-        super().__init__("Dos vehiculos se han chocado")
\ No newline at end of file
+    def __init__(self, details=None, snapshot=None):
+        message = "Dos vehiculos se han chocado"
+        super().__init__(f"{message}: {details}" if details else message)
+        self.snapshot = snapshot
+
+class StopLineViolationException(Exception):
+    def __init__(self, details, snapshot=None):
+        super().__init__(f"Un vehiculo cruzo la linea de parada en rojo: {details}")
+        self.snapshot = snapshot
+
+class ScenarioValidationError(Exception):
+    def __init__(self, path, message):
+        super().__init__(f"{path}: {message}")
+        self.path = path
@@ -0,0 +1,262 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+
+from config import DEFAULT_YELLOW_TIME, TICKS_PER_SECOND, TRAFFIC_LIGHTS_ORDER
+from .TrafficFlowOptimizer import TrafficFlowOptimizer
+from .encoding import DIRECTIONS
+from .signal_control import FixedTimeController
+
+
+def _evaluate_plan(arguments):
+    """Simula sin interfaz un plan coordinado (tiempos y desfases) del corredor"""
+    factory, factory_args, light_times, offsets, duration_seconds = arguments
+    network = factory(*factory_args)
+    for node, offset in zip(network.nodes, offsets):
+        FixedTimeController(light_times, offset).attach(node)
+    summary = network.run(duration_seconds)
+    delays = [
+        (delay["E"] + delay["W"]) / 2 for delay in summary["mean_delay"]
+    ]
+    return {
+        "total_passing_vehicles": sum(summary["total_passing_vehicles"]),
+        "mean_delay": float(np.mean(delays)) if delays else 0.0,
+    }
+
+
+class GreenWaveOptimizer(TrafficFlowOptimizer):
+    """
+    Optimizador de onda verde para un corredor este-oeste de intersecciones.
+
+    Además del reparto del verde del optimizador base, busca la duración del ciclo
+    y el desfase de cada intersección que maximizan el ancho de banda de
+    progresión en ambos sentidos. El ancho de banda de un plan se calcula con
+    máscaras de verde por segundo desplazadas según una matriz de tiempos de
+    recorrido entre líneas de parada, que se calcula una sola vez. Los mejores
+    planes se validan con simulaciones sin interfaz en paralelo.
+
+    Del corredor sólo se leen la topología y los tiempos de recorrido, así que la
+    fábrica se llama con local_nodes=() y no se construye ninguna intersección en
+    el proceso que crea el optimizador.
+
+    Args:
+        network_factory (callable): Función de nivel de módulo que construye la red;
+            recibe además local_nodes (ver IntersectionNetwork)
+        factory_args (tuple): Argumentos de la fábrica
+        demand (dict): Demanda relativa por dirección para repartir el verde; por
+            defecto el verde se reparte en partes iguales
+
+    Atributos:
+        travel_time_matrix (np.ndarray): Segundos de recorrido entre nodos (inf si
+            no hay camino)
+        eastbound (list): Nodos del corredor en sentido este
+        westbound (list): Nodos del corredor en sentido oeste
+        lost_time (int): Segundos de amarillo por ciclo
+    """
+
+    def __init__(self, network_factory, factory_args=(), demand=None):
+        self.network_factory = network_factory
+        self.factory_args = tuple(factory_args)
+        network = network_factory(*self.factory_args, local_nodes=())
+        super().__init__(None)
+        self.node_count = len(network.nodes)
+        self.demand = demand or {d: 0 for d in DIRECTIONS}
+        # Cada fase tiene amarillo previo y posterior
+        self.lost_time = 2 * DEFAULT_YELLOW_TIME * len(TRAFFIC_LIGHTS_ORDER)
+
+        for segment in network.segments:
+            self.flow_graph.add_edge(
+                segment.from_node,
+                segment.to_node,
+                direction=segment.exit_direction,
+                weight=segment.travel_ticks / TICKS_PER_SECOND,
+            )
+        self.travel_time_matrix = self.__build_travel_time_matrix()
+        self.eastbound = self.__corridor_order("E")
+        self.westbound = self.__corridor_order("W")
+
+    def __build_travel_time_matrix(self):
+        matrix = np.full((self.node_count, self.node_count), np.inf)
+        np.fill_diagonal(matrix, 0)
+        for origin, lengths in nx.all_pairs_dijkstra_path_length(self.flow_graph):
+            for target, length in lengths.items():
+                matrix[origin, target] = length
+        return matrix
+
+    def __corridor_order(self, direction):
+        edges = [
+            (u, v) for u, v, d in self.flow_graph.edges(data="direction") if d == direction
+        ]
+        if not edges:
+            return []
+        following = dict(edges)
+        targets = {v for _, v in edges}
+        node = next(u for u, _ in edges if u not in targets)
+        order = [node]
+        while node in following:
+            node = following[node]
+            order.append(node)
+        return order
+
+    def green_windows(self, light_times):
+        """
+        Inicio y duración del verde de cada dirección dentro del ciclo.
+
+        Returns:
+            dict: {'E': (inicio, duración), ...} en segundos desde el inicio del verde E
+        """
+        windows = {}
+        start = 0
+        for index in sorted(TRAFFIC_LIGHTS_ORDER):
+            direction = TRAFFIC_LIGHTS_ORDER[index]
+            windows[direction] = (start, light_times[direction])
+            start += light_times[direction] + 2 * DEFAULT_YELLOW_TIME
+        return windows
+
+    def __green_mask(self, light_times, direction):
+        cycle = sum(light_times.values()) + self.lost_time
+        start, duration = self.green_windows(light_times)[direction]
+        mask = np.zeros(cycle, dtype=bool)
+        mask[start:start + duration] = True
+        return mask
+
+    def bandwidth(self, light_times, offsets):
+        """
+        Ancho de banda (segundos) de progresión en sentido este y oeste.
+
+        Un instante t de salida del primer nodo pertenece a la banda si el vehículo
+        encuentra verde en cada nodo i al llegar en t + T[primero, i].
+        """
+        return self.__bandwidths(light_times, np.asarray(offsets)[np.newaxis, :])[0]
+
+    def __bandwidths(self, light_times, offsets):
+        # offsets: (candidatos, nodos); devuelve (candidatos, 2)
+        cycle = sum(light_times.values()) + self.lost_time
+        phase = np.arange(cycle)
+        result = np.zeros((len(offsets), 2))
+        for column, (direction, order) in enumerate(
+            (("E", self.eastbound), ("W", self.westbound))
+        ):
+            if len(order) < 2:
+                continue
+            mask = self.__green_mask(light_times, direction)
+            band = np.ones((len(offsets), cycle), dtype=bool)
+            for node in order:
+                travel = int(round(self.travel_time_matrix[order[0], node]))
+                # Posición en el ciclo del nodo al llegar, para cada salida t
+                positions = (phase[np.newaxis, :] + travel - offsets[:, [node]]) % cycle
+                band &= mask[positions]
+            result[:, column] = band.sum(axis=1)
+        return result
+
+    def optimize_offsets(self, light_times, sweeps=4):
+        """
+        Busca por coordenadas los desfases que maximizan el ancho de banda total.
+
+        Se parte de la progresión ideal de cada sentido (el desfase de cada nodo es
+        el tiempo de recorrido desde el primero) y, en cada paso, se evalúan a la vez
+        todos los desfases posibles de un nodo.
+
+        Returns:
+            tuple: (desfases, ancho de banda este, ancho de banda oeste)
+        """
+        cycle = sum(light_times.values()) + self.lost_time
+        starts = [np.zeros(self.node_count, dtype=np.int64)]
+        for order in (self.eastbound, self.westbound):
+            if len(order) > 1:
+                start = np.zeros(self.node_count, dtype=np.int64)
+                for node in order:
+                    start[node] = int(round(self.travel_time_matrix[order[0], node])) % cycle
+                starts.append(start)
+
+        best_offsets, best_total = None, -1
+        for offsets in starts:
+            for _ in range(sweeps):
+                changed = False
+                for node in range(self.node_count):
+                    candidates = np.repeat(offsets[np.newaxis, :], cycle, axis=0)
+                    candidates[:, node] = np.arange(cycle)
+                    totals = self.__bandwidths(light_times, candidates).sum(axis=1)
+                    best = int(np.argmax(totals))
+                    if totals[best] > totals[offsets[node]]:
+                        offsets[node] = best
+                        changed = True
+                if not changed:
+                    break
+            total = self.bandwidth(light_times, offsets).sum()
+            if total > best_total:
+                best_offsets, best_total = offsets, total
+
+        # Sólo importan los desfases relativos: el primer nodo queda en cero
+        best_offsets = (best_offsets - best_offsets[0]) % cycle
+        east, west = self.bandwidth(light_times, best_offsets)
+        return best_offsets.tolist(), float(east), float(west)
+
+    def optimize_green_wave(self, cycle_times=range(80, 181, 10), top_plans=3,
+                            duration_seconds=300, max_workers=None):
+        """
+        Busca ciclo, reparto y desfases del corredor.
+
+        Para cada ciclo candidato se reparte el verde según la demanda, se
+        optimizan los desfases por ancho de banda y los top_plans mejores planes se
+        simulan en paralelo; gana el de mayor flujo y, a igualdad, menor demora.
+
+        Args:
+            cycle_times (iterable): Sumas de verde (segundos) a probar
+            top_plans (int): Planes que se validan por simulación
+            duration_seconds (int): Duración de cada simulación de validación
+
+        Returns:
+            dict: Mejor plan con light_times, offsets, cycle_time, bandwidth y
+                resultados de simulación
+        """
+        original_cycle = self.cycle_time
+        plans = []
+        try:
+            for cycle_time in cycle_times:
+                if not 4 * self.min_green_time <= cycle_time <= 4 * self.max_green_time:
+                    continue
+                self.cycle_time = cycle_time
+                light_times = self._calculate_proportional_times(self.demand)
+                if not self._validate_individual(light_times):
+                    continue
+                offsets, east, west = self.optimize_offsets(light_times)
+                plans.append({
+                    "cycle_time": cycle_time,
+                    "light_times": light_times,
+                    "offsets": offsets,
+                    "bandwidth": {"E": east, "W": west},
+                    "efficiency": (east + west) / (2 * (cycle_time + self.lost_time)),
+                })
+        finally:
+            self.cycle_time = original_cycle
+
+        if not plans:
+            return None
+        plans.sort(key=lambda plan: plan["efficiency"], reverse=True)
+        candidates = plans[:top_plans]
+        print(f"🌊 Validando {len(candidates)} planes de onda verde en paralelo...")
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            results = executor.map(
+                _evaluate_plan,
+                [
+                    (self.network_factory, self.factory_args, plan["light_times"],
+                     plan["offsets"], duration_seconds)
+                    for plan in candidates
+                ],
+            )
+            for plan, result in zip(candidates, results):
+                plan["simulation"] = result
+
+        best = max(
+            candidates,
+            key=lambda plan: (
+                plan["simulation"]["total_passing_vehicles"],
+                -plan["simulation"]["mean_delay"],
+            ),
+        )
+        self.current_optimal_times = best["light_times"]
+        print(f"✅ Mejor onda verde: ciclo {best['cycle_time']}s, desfases {best['offsets']}")
+        return best
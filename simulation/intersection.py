@@ -1,5 +1,3 @@
-import itertools
-import math
 import random
 from config import *
 
@@ -7,19 +5,29 @@ import networkx as nx
 
 from simulation.pedestrian import Pedestrian
 from simulation.pedestrian_light import PedestrianLight
+from util.layout import Layout
 from util.traffic_utils import TrafficUtils
 from .vehicle import Vehicle
 from .traffic_light import TrafficLight
 from .exceptions import CollisionErrorException
+from .delay import DelayTracker
+from .snapshot import IntersectionSnapshot
+from .lanes import Lane
+from .conflict_grid import ConflictGrid
+from .encoding import DIRECTION_VECTORS, GREEN_LIGHT, LIGHT_STOPS_VEHICLES, RED_LIGHT, YELLOW_LIGHT
 
 
 class Intersection:
-    def __init__(self):
+    def __init__(self, layout=None, rng=None):
+        # Geometría y generador aleatorio propios; por defecto los globales, que
+        # comparte la interfaz
+        self.layout = layout or TrafficUtils.current_layout()
+        self.rng = rng or random
         self.traffic_lights = {
-            "N": TrafficLight("N"),
-            "S": TrafficLight("S"),
-            "E": TrafficLight("E"),
-            "W": TrafficLight("W"),
+            "N": TrafficLight("N", layout=self.layout),
+            "S": TrafficLight("S", layout=self.layout),
+            "E": TrafficLight("E", layout=self.layout),
+            "W": TrafficLight("W", layout=self.layout),
         }
         self.__configure_lights_time()
         self.__configure_first_light()
@@ -29,16 +37,49 @@ class Intersection:
             "E": [],
             "W": [],
         }
+        # Vehículos de cada acceso ordenados por distancia recorrida
+        self.lanes = {d: Lane(d) for d in self.vehicles}
         self.pedestrians = []
         self.pedestrians_light = {
-            "N": [PedestrianLight("ES"), PedestrianLight("WS")],
-            "S": [PedestrianLight("EN"), PedestrianLight("WN")],
-            "E": [PedestrianLight("SW", RED), PedestrianLight("NW", RED)],
-            "W": [PedestrianLight("NE"), PedestrianLight("SE")],
+            "N": [
+                PedestrianLight("ES", layout=self.layout),
+                PedestrianLight("WS", layout=self.layout),
+            ],
+            "S": [
+                PedestrianLight("EN", layout=self.layout),
+                PedestrianLight("WN", layout=self.layout),
+            ],
+            "E": [
+                PedestrianLight("SW", RED_LIGHT, self.layout),
+                PedestrianLight("NW", RED_LIGHT, self.layout),
+            ],
+            "W": [
+                PedestrianLight("NE", layout=self.layout),
+                PedestrianLight("SE", layout=self.layout),
+            ],
         }
         self.total_passing_vehicles = 0
+        self.passing_vehicles_total = {"N": 0, "S": 0, "E": 0, "W": 0}
         self.lights_toggle_timer = 0
         self.simulation_view = None
+        self.delay_tracker = DelayTracker()
+        self.demand_generator = None
+        self.signal_controller = None
+        # Modelo de seguimiento vehicular (IntelligentDriverModel); None usa velocidad
+        # constante con detención inmediata
+        self.car_following = None
+        # Reservas de celdas en el cruce y los pasos peatonales para los conflictos
+        # entre accesos y con peatones; None los desactiva
+        self.conflict_grid = ConflictGrid(self.layout) if CONFLICT_GRID else None
+        # Auditor de invariantes (InvariantAuditor) para depuración; None no audita
+        self.auditor = None
+        # Proporciones de giro por acceso {'N': {'N': 0.6, 'E': 0.2, 'W': 0.2}, ...};
+        # None reparte los destinos uniformemente
+        self.turning_ratios = None
+        # Contadores incrementales por acceso: vehículos detenidos antes de la línea
+        # de parada (cola) y vehículos que aún no la cruzan (ocupación)
+        self.queue_counts = {"N": 0, "S": 0, "E": 0, "W": 0}
+        self.occupancy_counts = {"N": 0, "S": 0, "E": 0, "W": 0}
 
     def __configure_lights_time(self):
         for l in self.traffic_lights.values():
@@ -53,36 +94,73 @@ class Intersection:
 
     def __configure_first_light(self):
         lights_order = TRAFFIC_LIGHTS_ORDER
-        self.traffic_lights[lights_order[1]].state = GREEN
+        self.traffic_lights[lights_order[1]].state = GREEN_LIGHT
 
     def add_vehicle(self, direction):
         self.vehicles[direction].append(Vehicle(direction))
 
     def add_vehicle(self, vehicle):
         self.vehicles[vehicle.initial_direction].append(vehicle)
+        self.lanes[vehicle.initial_direction].add(vehicle)
+        vehicle.layout = self.layout
         vehicle.calculate_turning_limit()
+        self.delay_tracker.start_trip(vehicle)
+        if not vehicle.has_counted:
+            self.occupancy_counts[vehicle.initial_direction] += 1
+
+    def remove_vehicle(self, vehicle):
+        self.vehicles[vehicle.initial_direction].remove(vehicle)
+        self.lanes[vehicle.initial_direction].remove(vehicle)
+        self.delay_tracker.release(vehicle)
+        if vehicle.is_queued:
+            self.queue_counts[vehicle.initial_direction] -= 1
+            vehicle.is_queued = False
+        if not vehicle.has_counted:
+            self.occupancy_counts[vehicle.initial_direction] -= 1
+
+    def entry_is_clear(self, direction):
+        # El último del carril es el de menor avance, no el último agregado; con
+        # car_following el carril no se reordena en cada tick
+        lane = self.lanes[direction]
+        lane.refresh()
+        last = lane.last()
+        if last is None or last.has_turned:
+            return True
+        if direction == "N":
+            return self.layout.window_height - (last.y + last.height) >= VEHICLE_SPACING
+        elif direction == "S":
+            return last.y >= VEHICLE_SPACING
+        elif direction == "E":
+            return last.x >= VEHICLE_SPACING
+        elif direction == "W":
+            return self.layout.simulation_width - (last.x + last.width) >= VEHICLE_SPACING
 
     def add_vehicles(self, amount, direction):
         for _ in range(amount):
-            vehicle = Vehicle(direction, direction)
-            vehicle.change_random_final_direction()
+            vehicle = Vehicle(direction, direction, self.layout)
+            vehicle.change_random_final_direction(self.rng, self.turning_ratios)
             self.__change_vehicle_random_asset(vehicle)
             vehicle.calculate_size()
             vehicle.calculate_initial_position()
             vehicle.calculate_turning_limit()
             self.vehicles[direction].append(vehicle)
+            self.lanes[direction].add(vehicle)
+            self.delay_tracker.start_trip(vehicle)
+            self.occupancy_counts[direction] += 1
 
         self.__locate_vehicles_by_direction(direction)
 
     def __change_vehicle_random_asset(self, vehicle):
-        vehicle.asset = random.choice(
+        if self.simulation_view is None:
+            return
+        vehicle.asset = self.rng.choice(
             self.simulation_view.vehicles_assets[vehicle.initial_direction]
         )
 
     def __locate_vehicles_by_direction(self, direction):
         offset = 0
         for vehicle in self.vehicles[direction]:
-            random_spacing = random.randint(0, 30)
+            random_spacing = self.rng.randint(0, 30)
             total_spacing = VEHICLE_SPACING + random_spacing
             if vehicle.initial_direction == "N":
                 total_spacing += vehicle.height
@@ -107,15 +185,15 @@ class Intersection:
 
     def add_pedestrians(self, amount):
         for _ in range(amount):
-            pedestrian = Pedestrian()
+            pedestrian = Pedestrian(self.layout)
             pedestrian.graph = TrafficUtils.pedestrian_graph()
-            pedestrian.change_random_initial_direction()
-            pedestrian.change_random_final_direction()
+            pedestrian.change_random_initial_direction(self.rng)
+            pedestrian.change_random_final_direction(self.rng)
             pedestrian.calculate_initial_position()
             self.pedestrians.append(pedestrian)
 
     def add_pedestrian(self, initial_direction, final_direction):
-        pedestrian = Pedestrian()
+        pedestrian = Pedestrian(self.layout)
         pedestrian.graph = TrafficUtils.pedestrian_graph()
         pedestrian.initial_direction = initial_direction
         pedestrian.final_direction = final_direction
@@ -123,18 +201,44 @@ class Intersection:
         pedestrian.calculate_initial_position()
         self.pedestrians.append(pedestrian)
 
+    def tick(self):
+        self.lights_toggle_timer += 1
+        if self.signal_controller is not None:
+            self.signal_controller.on_tick(self)
+        self.check_lights_state()
+        if self.demand_generator is not None:
+            self.demand_generator.tick()
+        self.update()
+        if self.auditor is not None:
+            self.auditor.on_tick(self)
+
     def update(self):
         vehicle_list = [v for sublist in self.vehicles.values() for v in sublist]
 
-        for v1, v2 in itertools.combinations(vehicle_list, 2):
-            self.__control_vehicles_crash(v1, v2)
+        if self.car_following is not None:
+            self.car_following.update(self)
+        else:
+            # Sólo los vehículos de un mismo acceso pueden detenerse entre sí, y sólo
+            # si están cerca sobre el eje del acceso: cada carril entrega esos pares
+            # en tiempo lineal en lugar de revisar todas las combinaciones
+            for lane in self.lanes.values():
+                for v1, v2 in lane.close_pairs():
+                    self.__control_vehicles_crash(v1, v2)
+            for v in vehicle_list:
+                self.__control_light_car_stop_action(v)
+                v.speed = 0 if v.is_stopped else DEFAULT_VEHICLE_SPEED
+        # La rejilla parte de las detenciones de este tick por semáforo y seguimiento
+        if self.conflict_grid is not None:
+            self.conflict_grid.update(self)
 
         for v in vehicle_list:
-            self.__control_light_car_stop_action(v)
-            v.speed = 0 if v.is_stopped else DEFAULT_VEHICLE_SPEED
+            self.delay_tracker.observe(v)
             self.__count_lights_passing_vehicles(v)
+            self.__update_queue_state(v)
             self.__control_vehicle_out_of_bounds(v)
             v.update()
+            if self.simulation_view is None:
+                self.__settle_vehicle_after_turn(v)
             v.is_stopped = False
 
         for p in self.pedestrians:
@@ -144,9 +248,25 @@ class Intersection:
             p.update()
             p.is_stopped = False
 
+    def __update_queue_state(self, vehicle):
+        is_queued = vehicle.speed == 0 and not vehicle.has_counted
+        if is_queued != vehicle.is_queued:
+            vehicle.is_queued = is_queued
+            self.queue_counts[vehicle.initial_direction] += 1 if is_queued else -1
+
+    def __settle_vehicle_after_turn(self, vehicle):
+        if vehicle.has_turned and not vehicle.changed_asset:
+            vehicle.calculate_size()
+            vehicle.adjust_position_after_turn()
+            vehicle.changed_asset = True
+
     def __control_light_car_stop_action(self, vehicle):
+        # Con conflict_grid, un vehículo que ya cruzó la línea de parada debe
+        # despejar el cruce en lugar de bloquear los corredores de los demás
+        if vehicle.has_counted and self.conflict_grid is not None:
+            return
         light = self.traffic_lights[vehicle.initial_direction]
-        if light.state in (YELLOW, RED) and self.__verify_vehicle_nearby_light(
+        if LIGHT_STOPS_VEHICLES[light.state] and self.__verify_vehicle_nearby_light(
             vehicle, light
         ):
             vehicle.is_stopped = True
@@ -170,27 +290,27 @@ class Intersection:
             ) and (vehicle.x > light.position[0])
 
     def __control_vehicles_crash(self, vehicle1, vehicle2):
-        if (vehicle1.is_turning or vehicle2.is_turning) and (
-            vehicle1.initial_direction != vehicle2.initial_direction
-        ):
-            if self.__vehicle_will_collide_while_turning(vehicle1, vehicle2):
-                return
-        else:
-            if self.__vehicle_will_collide_same_direction(vehicle1, vehicle2):
-                if self.__is_behind(vehicle1, vehicle2):
-                    vehicle1.is_stopped = True
-                else:
-                    vehicle2.is_stopped = True
-
-    def __vehicle_will_collide_while_turning(self, vehicle1, vehicle2):
-        dx = vehicle1.x - vehicle2.x
-        dy = vehicle1.y - vehicle2.y
-        distance = math.hypot(dx, dy)
-        return distance < config["VEHICLE_WIDTH"]
+        # Los conflictos entre accesos los resuelve conflict_grid
+        if self.__vehicle_will_collide_same_direction(vehicle1, vehicle2):
+            if self.__is_behind(vehicle1, vehicle2):
+                vehicle1.is_stopped = True
+            else:
+                vehicle2.is_stopped = True
 
     def __vehicle_will_collide_same_direction(self, vehicle1, vehicle2):
         if vehicle1.initial_direction != vehicle2.initial_direction:
             return False
+        if self.__share_turn(vehicle1, vehicle2):
+            distance = abs(vehicle1.path_position() - vehicle2.path_position())
+            return distance - self.layout.vehicle_length <= VEHICLE_SPACING
+        if (vehicle1.has_turned or vehicle1.is_turning) and (
+            vehicle2.has_turned or vehicle2.is_turning
+        ):
+            return self.__vehicle_will_collide_after_turn(vehicle1, vehicle2)
+        if vehicle1.is_turning or vehicle2.is_turning:
+            return self.__footprints_will_collide(
+                vehicle1, vehicle2, vehicle1.initial_direction
+            )
 
         same_lane = False
         distance = 0
@@ -211,77 +331,112 @@ class Intersection:
 
         return same_lane and abs(distance) <= VEHICLE_SPACING
 
+    def __share_turn(self, vehicle1, vehicle2):
+        # Sobre la misma trayectoria de giro el orden y la distancia se miden por el
+        # avance sobre ella, no por los rectángulos sin rotar
+        return (
+            (vehicle1.is_turning or vehicle2.is_turning)
+            and not (vehicle1.has_turned or vehicle2.has_turned)
+            and vehicle1.final_direction == vehicle2.final_direction
+        )
+
+    def __vehicle_will_collide_after_turn(self, vehicle1, vehicle2):
+        # Dos vehículos que giran o ya giraron sólo chocan si van al mismo destino;
+        # la distancia se mide sobre el eje de ese destino
+        if vehicle1.final_direction != vehicle2.final_direction:
+            return False
+        return self.__footprints_will_collide(vehicle1, vehicle2, vehicle1.final_direction)
+
+    def __footprints_will_collide(self, vehicle1, vehicle2, direction):
+        # Huellas que se solapan de lado y quedan a menos de VEHICLE_SPACING sobre
+        # el eje de direction; la de un vehículo que gira es más ancha que su
+        # rectángulo
+        x1, y1, width1, height1 = vehicle1.footprint()
+        x2, y2, width2, height2 = vehicle2.footprint()
+        if direction in ("N", "S"):
+            same_lane = x1 < x2 + width2 and x2 < x1 + width1
+            distance = max(y2 - (y1 + height1), y1 - (y2 + height2))
+        else:
+            same_lane = y1 < y2 + height2 and y2 < y1 + height1
+            distance = max(x2 - (x1 + width1), x1 - (x2 + width2))
+        return same_lane and distance <= VEHICLE_SPACING
+
     def __is_behind(self, rear, front):
+        if self.__share_turn(rear, front):
+            return rear.path_position() < front.path_position()
         if rear.has_turned or front.has_turned:
             return self.__is_behind_with_different_direction(rear, front)
         else:
             return self.__is_behind_with_same_direction(rear, front)
 
     def __is_behind_with_different_direction(self, rear, front):
-        if rear.final_direction == "N":
-            return rear.y > front.y
-        elif rear.final_direction == "S":
-            return rear.y < front.y
-        elif rear.final_direction == "E":
-            return rear.x < front.x
-        elif rear.final_direction == "W":
-            return rear.x > front.x
-
-        return False
+        return self.__is_behind_along(rear, front, rear.final_direction)
 
     def __is_behind_with_same_direction(self, rear, front):
-        if rear.initial_direction == "N":
-            return rear.y > front.y
-        elif rear.initial_direction == "S":
-            return rear.y < front.y
-        elif rear.initial_direction == "E":
-            return rear.x < front.x
-        elif rear.initial_direction == "W":
-            return rear.x > front.x
+        return self.__is_behind_along(rear, front, rear.initial_direction)
 
-        return False
+    def __is_behind_along(self, rear, front, direction):
+        dx, dy = DIRECTION_VECTORS[direction]
+        return (front.x - rear.x) * dx + (front.y - rear.y) * dy > 0
 
     def __control_vehicle_out_of_bounds(self, vehicle):
         if vehicle.has_moved and (
             (vehicle.final_direction == "N" and vehicle.y < -vehicle.height)
-            or (vehicle.final_direction == "S" and vehicle.y > config["WINDOW_HEIGHT"])
+            or (vehicle.final_direction == "S" and vehicle.y > self.layout.window_height)
             or (
                 vehicle.final_direction == "E"
-                and vehicle.x > config["SIMULATION_WIDTH"]
+                and vehicle.x > self.layout.simulation_width
             )
             or (vehicle.final_direction == "W" and vehicle.x < -vehicle.width)
         ):
+            self.delay_tracker.finish_trip(vehicle)
+            if self.demand_generator is not None and self.demand_generator.pool.owns(
+                vehicle
+            ):
+                self.remove_vehicle(vehicle)
+                self.demand_generator.release(vehicle)
+                return
             vehicle.reset_to_initial_state(True)
+            self.__queue_behind_lane_tail(vehicle)
+            self.delay_tracker.start_trip(vehicle)
+            self.occupancy_counts[vehicle.initial_direction] += 1
+
+    def __queue_behind_lane_tail(self, vehicle):
+        # El vehículo que recircula entra detrás del último de su carril en lugar
+        # de aparecer encima de la cola que sigue fuera de la ventana
+        lane = self.lanes[vehicle.initial_direction]
+        tails = [lane.progress(v) for v in lane.vehicles if v is not vehicle]
+        if not tails:
+            return
+        overlap = lane.progress(vehicle) + lane.extent(vehicle) + VEHICLE_SPACING - min(tails)
+        if overlap > 0:
+            vehicle.x -= lane.dx * overlap
+            vehicle.y -= lane.dy * overlap
 
     def __count_lights_passing_vehicles(self, vehicle):
         for light in self.traffic_lights.values():
             if light.direction == vehicle.initial_direction and not vehicle.has_counted:
-                if light.direction == "N" and vehicle.y < light.position[1]:
-                    self.total_passing_vehicles += 1
-                    light.passing_vehicles += 1
-                    vehicle.has_counted = True
-                elif (
-                    light.direction == "S"
-                    and vehicle.y + vehicle.height > light.position[1]
-                ):
-                    self.total_passing_vehicles += 1
-                    light.passing_vehicles += 1
-                    vehicle.has_counted = True
-                elif (
-                    light.direction == "E"
-                    and vehicle.x + vehicle.width > light.position[0]
+                if (
+                    (light.direction == "N" and vehicle.y < light.position[1])
+                    or (
+                        light.direction == "S"
+                        and vehicle.y + vehicle.height > light.position[1]
+                    )
+                    or (
+                        light.direction == "E"
+                        and vehicle.x + vehicle.width > light.position[0]
+                    )
+                    or (light.direction == "W" and vehicle.x < light.position[0])
                 ):
                     self.total_passing_vehicles += 1
+                    self.passing_vehicles_total[light.direction] += 1
                     light.passing_vehicles += 1
                     vehicle.has_counted = True
-                elif light.direction == "W" and vehicle.x < light.position[0]:
-                    self.total_passing_vehicles += 1
-                    light.passing_vehicles += 1
-                    vehicle.has_counted = True
+                    self.occupancy_counts[light.direction] -= 1
 
     def __control_pedestrian_out_limit(self, pedestrian):
-        center_limits = TrafficUtils.calculate_center_limits()
-        road_half = config["ROAD_WIDTH"] // 2
+        center_limits = self.layout.center_limits
+        road_half = self.layout.road_half
         if pedestrian.has_moved and (
             (
                 pedestrian.final_direction in ("NE", "NW")
@@ -300,22 +455,22 @@ class Intersection:
                 and pedestrian.x >= center_limits["right"] + road_half
             )
         ):
-            pedestrian.reset_to_initial_state(True)
+            pedestrian.reset_to_initial_state(True, self.rng)
 
     def __control_light_pedestrian_stop_action(self, pedestrian):
-        central_limits = TrafficUtils.calculate_center_limits()
+        central_limits = self.layout.center_limits
         if (
             pedestrian.direction_movement == "N"
             and pedestrian.y >= central_limits["bottom"]
         ):
             if (
                 pedestrian.actual_direction == "BL"
-                and self.traffic_lights["E"].state == GREEN
+                and self.traffic_lights["E"].state == GREEN_LIGHT
             ):
                 pedestrian.is_stopped = True
             elif (
                 pedestrian.actual_direction == "BR"
-                and self.traffic_lights["W"].state == GREEN
+                and self.traffic_lights["W"].state == GREEN_LIGHT
             ):
                 pedestrian.is_stopped = True
         elif (
@@ -324,12 +479,12 @@ class Intersection:
         ):
             if (
                 pedestrian.actual_direction == "TL"
-                and self.traffic_lights["E"].state == GREEN
+                and self.traffic_lights["E"].state == GREEN_LIGHT
             ):
                 pedestrian.is_stopped = True
             elif (
                 pedestrian.actual_direction == "TR"
-                and self.traffic_lights["W"].state == GREEN
+                and self.traffic_lights["W"].state == GREEN_LIGHT
             ):
                 pedestrian.is_stopped = True
         elif (
@@ -338,12 +493,12 @@ class Intersection:
         ):
             if (
                 pedestrian.actual_direction == "TL"
-                and self.traffic_lights["S"].state == GREEN
+                and self.traffic_lights["S"].state == GREEN_LIGHT
             ):
                 pedestrian.is_stopped = True
             elif (
                 pedestrian.actual_direction == "BL"
-                and self.traffic_lights["N"].state == GREEN
+                and self.traffic_lights["N"].state == GREEN_LIGHT
             ):
                 pedestrian.is_stopped = True
         elif (
@@ -352,12 +507,12 @@ class Intersection:
         ):
             if (
                 pedestrian.actual_direction == "TR"
-                and self.traffic_lights["S"].state == GREEN
+                and self.traffic_lights["S"].state == GREEN_LIGHT
             ):
                 pedestrian.is_stopped = True
             elif (
                 pedestrian.actual_direction == "BR"
-                and self.traffic_lights["N"].state == GREEN
+                and self.traffic_lights["N"].state == GREEN_LIGHT
             ):
                 pedestrian.is_stopped = True
 
@@ -380,30 +535,30 @@ class Intersection:
         if self.lights_toggle_timer <= 0:
             return False
 
-        if light.state == YELLOW:
-            if (self.lights_toggle_timer / 60) % yellow_time == 0:
-                if light.last_state == RED:
-                    light.state = GREEN
-                    self.__change_pedestrian_light_state(light.direction, RED)
+        if light.state == YELLOW_LIGHT:
+            if (self.lights_toggle_timer / TICKS_PER_SECOND) % yellow_time == 0:
+                if light.last_state == RED_LIGHT:
+                    light.state = GREEN_LIGHT
+                    self.__change_pedestrian_light_state(light.direction, RED_LIGHT)
                 else:
-                    light.state = RED
-                    self.__change_pedestrian_light_state(light.direction, GREEN)
+                    light.state = RED_LIGHT
+                    self.__change_pedestrian_light_state(light.direction, GREEN_LIGHT)
                 self.lights_toggle_timer = 0
             return True
 
-        if light.state == RED and not light.was_green:
+        if light.state == RED_LIGHT and not light.was_green:
             light.last_state = light.state
-            light.state = YELLOW
+            light.state = YELLOW_LIGHT
             return True
 
-        if light.state == GREEN and (self.lights_toggle_timer / 60) % light.green_time == 0:
+        if light.state == GREEN_LIGHT and (self.lights_toggle_timer / TICKS_PER_SECOND) % light.green_time == 0:
             light.last_state = light.state
-            light.state = YELLOW
+            light.state = YELLOW_LIGHT
             light.was_green = True
             self.lights_toggle_timer = 0
             return True
 
-        return False if light.state != GREEN else True
+        return False if light.state != GREEN_LIGHT else True
 
     def __restart_lights_condition(self):
         for light in self.traffic_lights.values():
@@ -417,15 +572,25 @@ class Intersection:
     def change_light_times(self, light_direction, green_time):
         light = self.traffic_lights[light_direction]
         light.green_time = green_time
+        if self.simulation_view is None:
+            return
         self.simulation_view.form.lights_time_panel.elements[light_direction][
             "entries"
         ][0].set_text(str(green_time))
 
     def restart_to_initial_state(self):
         self.total_passing_vehicles = 0
+        self.passing_vehicles_total = {"N": 0, "S": 0, "E": 0, "W": 0}
+        self.delay_tracker.reset()
+        if self.demand_generator is not None:
+            self.demand_generator.restart()
         for key in self.vehicles.keys():
             for vehicle in self.vehicles[key]:
                 vehicle.reset_to_initial_state()
+                vehicle.is_queued = False
+                self.delay_tracker.start_trip(vehicle)
+            self.queue_counts[key] = 0
+            self.occupancy_counts[key] = len(self.vehicles[key])
 
         for key in self.traffic_lights.keys():
             traffic_light = self.traffic_lights[key]
@@ -437,7 +602,7 @@ class Intersection:
 
         for light in self.traffic_lights.values():
             light.was_green = False
-            light.state = RED
+            light.state = RED_LIGHT
         self.__configure_first_light()
 
     def traffic_lights_list(self):
@@ -462,3 +627,28 @@ class Intersection:
             passing_vehicles_dict[light.direction] = light.passing_vehicles
 
         return passing_vehicles_dict
+
+    def queue_lengths(self):
+        return dict(self.queue_counts)
+
+    def leader(self, vehicle):
+        """Vehículo inmediatamente adelante en el mismo acceso (None si va primero)"""
+        return self.lanes[vehicle.initial_direction].leader(vehicle)
+
+    def snapshot(self):
+        """
+        Captura vehículos, peatones, semáforos y temporizadores en un
+        IntersectionSnapshot compacto y serializable, sin recursos gráficos.
+        """
+        return IntersectionSnapshot(self)
+
+    def restore(self, snapshot):
+        """Devuelve la intersección al estado capturado en snapshot"""
+        snapshot.apply(self)
+
+    @staticmethod
+    def from_snapshot(snapshot):
+        """Crea una intersección sin interfaz a partir de un snapshot"""
+        intersection = Intersection(Layout(*snapshot.layout))
+        intersection.restore(snapshot)
+        return intersection
@@ -0,0 +1,106 @@
+from config import VEHICLE_SPACING
+from .encoding import DIRECTION_VECTORS
+
+
+class Lane:
+    """
+    Vehículos de un acceso ordenados por distancia recorrida sobre el eje del acceso.
+
+    El orden se conserva entre ticks y se corrige una vez por tick con un
+    ordenamiento estable, que es lineal porque los vehículos casi nunca cambian de
+    orden (sólo al recircular o entrar uno nuevo). Entre correcciones cada vehículo
+    conoce a su líder y a su seguidor en O(1).
+
+    Atributos:
+        direction (str): Acceso del carril
+        vehicles (list): Vehículos de atrás hacia adelante
+    """
+
+    def __init__(self, direction):
+        self.direction = direction
+        self.dx, self.dy = DIRECTION_VECTORS[direction]
+        self.vehicles = []
+        self.__positions = {}
+        self.__sequence = {}
+        self.__next_sequence = 0
+        self.__dirty = False
+
+    def __len__(self):
+        return len(self.vehicles)
+
+    def progress(self, vehicle):
+        return vehicle.x * self.dx + vehicle.y * self.dy
+
+    def extent(self, vehicle):
+        """Largo del vehículo sobre el eje del acceso"""
+        return vehicle.height if self.dy else vehicle.width
+
+    def add(self, vehicle):
+        self.__sequence[id(vehicle)] = self.__next_sequence
+        self.__next_sequence += 1
+        self.vehicles.append(vehicle)
+        # El orden se corrige al consultarlo, así agregar muchos vehículos es lineal
+        self.__dirty = True
+
+    def remove(self, vehicle):
+        if self.__dirty:
+            self.refresh()
+        index = self.__positions.pop(id(vehicle))
+        del self.__sequence[id(vehicle)]
+        del self.vehicles[index]
+        for i in range(index, len(self.vehicles)):
+            self.__positions[id(self.vehicles[i])] = i
+
+    def refresh(self):
+        vehicles = self.vehicles
+        keys = [self.progress(v) for v in vehicles]
+        order = sorted(range(len(vehicles)), key=keys.__getitem__)
+        self.vehicles = [vehicles[i] for i in order]
+        self.__positions = {id(v): i for i, v in enumerate(self.vehicles)}
+        self.__dirty = False
+        return [keys[i] for i in order]
+
+    def leader(self, vehicle):
+        if self.__dirty:
+            self.refresh()
+        index = self.__positions[id(vehicle)] + 1
+        return self.vehicles[index] if index < len(self.vehicles) else None
+
+    def follower(self, vehicle):
+        if self.__dirty:
+            self.refresh()
+        index = self.__positions[id(vehicle)] - 1
+        return self.vehicles[index] if index >= 0 else None
+
+    def last(self):
+        if self.__dirty:
+            self.refresh()
+        return self.vehicles[0] if self.vehicles else None
+
+    def close_pairs(self):
+        """
+        Pares de vehículos lo bastante cerca sobre el eje del acceso para chocar,
+        cada uno en el orden en que entraron al acceso.
+
+        Un par sólo puede estar a VEHICLE_SPACING o menos si la diferencia de
+        avance no supera VEHICLE_SPACING más el largo del vehículo de adelante, así
+        que basta recorrer hacia adelante desde cada vehículo hasta salir de ese
+        alcance.
+        """
+        keys = self.refresh()
+        if len(keys) < 2:
+            return []
+        reach = VEHICLE_SPACING + max(self.extent(v) for v in self.vehicles)
+        sequence = self.__sequence
+        pairs = []
+        for i, rear in enumerate(self.vehicles):
+            limit = keys[i] + reach
+            for j in range(i + 1, len(keys)):
+                if keys[j] > limit:
+                    break
+                ahead = self.vehicles[j]
+                if sequence[id(rear)] < sequence[id(ahead)]:
+                    pairs.append((rear, ahead))
+                else:
+                    pairs.append((ahead, rear))
+        return pairs
@@ -0,0 +1,173 @@
+import collections
+import csv
+import json
+import queue
+import threading
+
+from config import TICKS_PER_SECOND
+from .encoding import DIRECTIONS, LIGHT_STATE_NAMES
+
+
+class MetricsPipeline:
+    """
+    Muestrea métricas de la intersección cada interval_seconds simulados y las
+    envía a uno o varios destinos (sinks) desde un hilo en segundo plano.
+
+    La simulación sólo deposita las muestras en una cola acotada; si la cola está
+    llena la muestra se descarta y se cuenta en dropped_samples, así la exportación
+    nunca detiene el ciclo de simulación. Un error al escribir en un destino se
+    anota en sink_errors y no detiene el hilo ni a los demás destinos.
+
+    Atributos:
+        intersection (Intersection): Intersección muestreada
+        sinks (list): Destinos con el método write_batch(samples)
+        interval_seconds (float): Segundos simulados entre muestras
+        batch_size (int): Máximo de muestras por escritura
+        dropped_samples (int): Muestras descartadas por cola llena
+        sink_errors (list): Pares (destino, excepción) de las escrituras fallidas
+    """
+
+    def __init__(self, intersection, sinks, interval_seconds=5, queue_size=256, batch_size=32):
+        self.intersection = intersection
+        self.sinks = list(sinks)
+        self.interval_seconds = interval_seconds
+        self.interval_ticks = max(1, int(interval_seconds * TICKS_PER_SECOND))
+        self.batch_size = batch_size
+        self.dropped_samples = 0
+        self.sink_errors = []
+        self.__ticks = 0
+        self.__last_passing = {d: 0 for d in DIRECTIONS}
+        self.__queue = queue.Queue(maxsize=queue_size)
+        self.__stop = object()
+        self.__thread = threading.Thread(target=self.__export_loop, daemon=True)
+        self.__thread.start()
+
+    def on_tick(self):
+        self.__ticks += 1
+        if self.__ticks % self.interval_ticks != 0:
+            return
+        try:
+            self.__queue.put_nowait(self.sample())
+        except queue.Full:
+            self.dropped_samples += 1
+
+    def sample(self):
+        intersection = self.intersection
+        queue_lengths = intersection.queue_lengths()
+        sample = {"time_seconds": self.__ticks / TICKS_PER_SECOND}
+
+        for direction in DIRECTIONS:
+            passing = intersection.passing_vehicles_total[direction]
+            last_passing = self.__last_passing[direction]
+            # Los contadores vuelven a cero cuando se reinicia la simulación
+            sample[f"throughput_{direction}"] = (
+                passing - last_passing if passing >= last_passing else passing
+            )
+            self.__last_passing[direction] = passing
+            sample[f"queue_{direction}"] = queue_lengths[direction]
+            sample[f"stopped_{direction}"] = sum(
+                1 for v in intersection.vehicles[direction] if v.speed == 0
+            )
+            sample[f"phase_{direction}"] = LIGHT_STATE_NAMES[
+                intersection.traffic_lights[direction].state
+            ]
+
+        return sample
+
+    def __export_loop(self):
+        running = True
+        while running:
+            batch = [self.__queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is self.__stop:
+                batch.pop()
+                running = False
+            if batch:
+                for sink in self.sinks:
+                    try:
+                        sink.write_batch(batch)
+                    except Exception as error:
+                        self.sink_errors.append((sink, error))
+
+    def close(self, timeout=5):
+        """
+        Envía al hilo la señal de fin, espera a lo sumo timeout segundos en cada
+        paso y cierra los destinos, para que un destino lento no bloquee la salida.
+
+        Returns:
+            bool: True si el hilo alcanzó a exportar todas las muestras
+        """
+        if self.__thread.is_alive():
+            try:
+                self.__queue.put(self.__stop, timeout=timeout)
+            except queue.Full:
+                pass
+            self.__thread.join(timeout)
+        finished = not self.__thread.is_alive()
+        for sink in self.sinks:
+            sink.close()
+        return finished
+
+
+class CsvMetricsSink:
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.writer = None
+
+    def write_batch(self, samples):
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.file, fieldnames=list(samples[0].keys()))
+            self.writer.writeheader()
+        self.writer.writerows(samples)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesMetricsSink:
+    def __init__(self, path):
+        self.file = open(path, "w")
+
+    def write_batch(self, samples):
+        self.file.write("".join(json.dumps(s) + "\n" for s in samples))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class RingBufferMetricsSink:
+    def __init__(self, capacity=1024):
+        self.samples = collections.deque(maxlen=capacity)
+
+    def write_batch(self, samples):
+        self.samples.extend(samples)
+
+    def close(self):
+        pass
+
+
+class MetricsHistorySink:
+    """Llena TrafficFlowOptimizer.metrics_history con las muestras recibidas"""
+
+    def __init__(self, optimizer, interval_seconds):
+        self.optimizer = optimizer
+        self.interval_seconds = interval_seconds
+
+    def write_batch(self, samples):
+        history = self.optimizer.metrics_history
+        for sample in samples:
+            passed = sum(sample[f"throughput_{d}"] for d in DIRECTIONS)
+            stopped = sum(sample[f"stopped_{d}"] for d in DIRECTIONS)
+            history["vehicles_passed"].append(passed)
+            history["waiting_times"].append(stopped * self.interval_seconds)
+            history["total_flow"].append(passed * 3600 / self.interval_seconds)
+            history["timestamp"].append(sample["time_seconds"])
+
+    def close(self):
+        pass
@@ -0,0 +1,223 @@
+import collections
+import random
+
+import numpy as np
+
+from config import HEADLESS_WINDOW_SIZE, TICKS_PER_SECOND, VEHICLE_POOL_SIZE
+from util import Layout
+from .demand import DemandGenerator, PoissonArrivals, VehiclePool
+from .encoding import DIRECTION_CODES, DIRECTIONS
+from .intersection import Intersection
+from .signal_control import FixedTimeController
+
+
+class RoadSegment:
+    """
+    Tramo de vía que une la salida de un nodo con el acceso del siguiente.
+
+    Un vehículo que sale del nodo from_node en dirección exit_direction entra al
+    nodo to_node por el acceso de esa misma dirección después de travel_ticks.
+
+    Atributos:
+        in_transit (deque): Tick de llegada de cada vehículo en el tramo
+    """
+
+    def __init__(self, from_node, exit_direction, to_node, travel_seconds):
+        self.from_node = from_node
+        self.exit_direction = exit_direction
+        self.to_node = to_node
+        self.travel_ticks = max(1, int(travel_seconds * TICKS_PER_SECOND))
+        self.in_transit = collections.deque()
+
+
+class IntersectionNetwork:
+    """
+    Red de intersecciones (corredor o malla) con un ciclo de simulación compartido.
+
+    Cada nodo es una Intersection sin interfaz con su propio controlador
+    semafórico y su propio generador de demanda. Los tramos (RoadSegment) entregan
+    al nodo siguiente los vehículos que salen por un acceso conectado; los que
+    salen por un acceso sin tramo abandonan la red.
+
+    En cada tick sólo se recorren los tramos con vehículos en tránsito. Los
+    contadores por nodo se guardan en arreglos contiguos de forma (nodos, 4).
+
+    Con local_nodes sólo se construyen y simulan esos nodos; los demás quedan como
+    None en nodes y generators, pero conservan su índice y sus tramos, como
+    necesita cada proceso de ShardedNetworkRunner.
+
+    Los nodos comparten un Layout propio de tamaño HEADLESS_WINDOW_SIZE y usan su
+    generador aleatorio también para los destinos, así que la red no altera la
+    geometría de la interfaz ni el estado aleatorio global.
+
+    Atributos:
+        nodes (list): Intersecciones de la red (None si el nodo no es local)
+        segments (list): Tramos de la red
+        node_entries (np.ndarray): Vehículos entregados por tramos a cada acceso
+        node_exits (np.ndarray): Vehículos que salieron de cada nodo por dirección
+        ticks (int): Ticks simulados
+        local_nodes (list): Nodos construidos y simulados; None indica todos
+        layout (Layout): Geometría de las intersecciones
+    """
+
+    def __init__(self, seed=0, local_nodes=None):
+        self.seed = seed
+        self.layout = Layout(*HEADLESS_WINDOW_SIZE)
+        self.nodes = []
+        self.generators = []
+        self.segments = []
+        self.node_entries = np.zeros((0, len(DIRECTIONS)), dtype=np.int64)
+        self.node_exits = np.zeros((0, len(DIRECTIONS)), dtype=np.int64)
+        self.ticks = 0
+        self.local_nodes = None if local_nodes is None else sorted(local_nodes)
+        self.__local = None if local_nodes is None else set(local_nodes)
+        self.__segment_by_exit = {}
+        self.__active_segments = set()
+
+    def add_node(self, light_times, arrival_rates=None, offset_seconds=0, controller=None,
+                 pool_size=VEHICLE_POOL_SIZE):
+        """
+        Agrega una intersección a la red.
+
+        Args:
+            light_times (dict): Tiempo en verde por dirección
+            arrival_rates (dict): Llegadas externas por acceso (vehículos/hora)
+            offset_seconds (float): Desfase del controlador de tiempos fijos
+            controller: Controlador semafórico (por defecto FixedTimeController)
+            pool_size (int): Vehículos preasignados del nodo
+
+        Returns:
+            int: Índice del nodo
+        """
+        index = len(self.nodes)
+        self.node_entries = np.vstack([self.node_entries, np.zeros((1, len(DIRECTIONS)), np.int64)])
+        self.node_exits = np.vstack([self.node_exits, np.zeros((1, len(DIRECTIONS)), np.int64)])
+        if self.__local is not None and index not in self.__local:
+            self.nodes.append(None)
+            self.generators.append(None)
+            return index
+        # Cada nodo tiene su propio generador aleatorio para que los resultados
+        # no dependan del orden de ejecución de los nodos
+        rng = random.Random(self.seed * 1_000_003 + index)
+        intersection = Intersection(self.layout, rng)
+        controller = controller or FixedTimeController(light_times, offset_seconds)
+        controller.attach(intersection)
+        generator = DemandGenerator(
+            intersection,
+            {d: PoissonArrivals(rate, rng) for d, rate in (arrival_rates or {}).items()},
+            pool=VehiclePool(pool_size, layout=self.layout),
+            rng=rng,
+        )
+        generator.exit_callback = lambda vehicle, node=index: self.__on_exit(node, vehicle)
+
+        self.nodes.append(intersection)
+        self.generators.append(generator)
+        return index
+
+    def connect(self, from_node, exit_direction, to_node, travel_seconds):
+        segment = RoadSegment(from_node, exit_direction, to_node, travel_seconds)
+        self.__segment_by_exit[(from_node, exit_direction)] = len(self.segments)
+        self.segments.append(segment)
+        return segment
+
+    def tick(self):
+        self.ticks += 1
+        self.__deliver_arrivals()
+        if self.local_nodes is None:
+            for intersection in self.nodes:
+                intersection.tick()
+        else:
+            for node in self.local_nodes:
+                self.nodes[node].tick()
+
+    def run(self, duration_seconds):
+        for _ in range(int(duration_seconds * TICKS_PER_SECOND)):
+            self.tick()
+        return self.summary()
+
+    def __deliver_arrivals(self):
+        for segment_index in sorted(self.__active_segments):
+            segment = self.segments[segment_index]
+            while segment.in_transit and segment.in_transit[0] <= self.ticks:
+                segment.in_transit.popleft()
+                self.deliver(segment.to_node, segment.exit_direction)
+            if not segment.in_transit:
+                self.__active_segments.discard(segment_index)
+
+    def deliver(self, node, direction):
+        self.generators[node].enqueue(direction)
+        self.node_entries[node, DIRECTION_CODES[direction]] += 1
+
+    def __on_exit(self, node, vehicle):
+        direction = vehicle.final_direction
+        self.node_exits[node, DIRECTION_CODES[direction]] += 1
+        segment_index = self.__segment_by_exit.get((node, direction))
+        if segment_index is None:
+            return
+        self.segment_departure(segment_index, self.ticks)
+
+    def segment_departure(self, segment_index, departure_tick):
+        self.schedule_arrival(segment_index, departure_tick + self.segments[segment_index].travel_ticks)
+
+    def schedule_arrival(self, segment_index, arrival_tick):
+        self.segments[segment_index].in_transit.append(arrival_tick)
+        self.__active_segments.add(segment_index)
+
+    def drain_segment(self, segment_index):
+        """Retira y devuelve los ticks de llegada pendientes de un tramo"""
+        in_transit = self.segments[segment_index].in_transit
+        arrivals = list(in_transit)
+        in_transit.clear()
+        self.__active_segments.discard(segment_index)
+        return arrivals
+
+    def summary(self, nodes=None):
+        if nodes is None:
+            nodes = self.local_nodes if self.local_nodes is not None else range(len(self.nodes))
+        nodes = sorted(nodes)
+        node_set = set(nodes)
+        return {
+            "ticks": self.ticks,
+            "total_passing_vehicles": [self.nodes[i].total_passing_vehicles for i in nodes],
+            "passing_vehicles": [dict(self.nodes[i].passing_vehicles_total) for i in nodes],
+            "mean_delay": [self.nodes[i].delay_tracker.mean_delays() for i in nodes],
+            "entries": self.node_entries[list(nodes)].tolist(),
+            "exits": self.node_exits[list(nodes)].tolist(),
+            "in_transit": sum(
+                len(s.in_transit) for s in self.segments if s.to_node in node_set
+            ),
+        }
+
+    @staticmethod
+    def corridor(light_times, count, travel_seconds, arrival_rates=None, offsets=None, seed=0,
+                 local_nodes=None):
+        """
+        Crea un corredor este-oeste de intersecciones enlazadas en ambos sentidos.
+
+        Args:
+            light_times (dict): Tiempo en verde por dirección (igual en todos los nodos)
+            count (int): Número de intersecciones
+            travel_seconds (float): Tiempo de recorrido entre nodos consecutivos
+            arrival_rates (dict): Llegadas externas por acceso; los accesos E/W
+                internos del corredor sólo reciben vehículos de los tramos
+            offsets (list): Desfase de cada nodo en segundos
+            seed (int): Semilla de la red
+            local_nodes (list): Nodos a construir; None construye todos
+
+        Returns:
+            IntersectionNetwork: Red construida
+        """
+        network = IntersectionNetwork(seed, local_nodes)
+        arrival_rates = arrival_rates or {}
+        offsets = offsets or [0] * count
+        for i in range(count):
+            rates = {d: r for d, r in arrival_rates.items() if d in ("N", "S")}
+            if i == 0 and "E" in arrival_rates:
+                rates["E"] = arrival_rates["E"]
+            if i == count - 1 and "W" in arrival_rates:
+                rates["W"] = arrival_rates["W"]
+            network.add_node(light_times, rates, offsets[i])
+        for i in range(count - 1):
+            network.connect(i, "E", i + 1, travel_seconds)
+            network.connect(i + 1, "W", i, travel_seconds)
+        return network
@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+
+import numpy as np
+
+from util import FileUtils
+
+# Nombre y sentido de cada objetivo: 1 se maximiza, -1 se minimiza
+OBJECTIVES = (
+    ("throughput", 1),
+    ("mean_delay", -1),
+    ("pedestrian_wait", -1),
+)
+
+
+def to_minimization(objectives):
+    """Convierte los objetivos (filas de OBJECTIVES) a un problema de minimización"""
+    signs = np.array([-sign for _, sign in OBJECTIVES], dtype=float)
+    return np.asarray(objectives, dtype=float) * signs
+
+
+def dominance_matrix(costs):
+    """dominates[i, j] es True si el punto i domina al j (minimización)"""
+    costs = np.asarray(costs, dtype=float)
+    less_equal = (costs[:, np.newaxis, :] <= costs[np.newaxis, :, :]).all(axis=2)
+    less = (costs[:, np.newaxis, :] < costs[np.newaxis, :, :]).any(axis=2)
+    return less_equal & less
+
+
+def non_dominated_sort(costs):
+    """
+    Ordenamiento no dominado vectorizado (NSGA-II).
+
+    La matriz de dominancia se calcula de una vez con difusión de NumPy y los
+    frentes se extraen restando los conteos de dominación de cada frente retirado.
+
+    Args:
+        costs (np.ndarray): Objetivos a minimizar, forma (puntos, objetivos)
+
+    Returns:
+        np.ndarray: Rango (0 = frente de Pareto) de cada punto
+    """
+    dominates = dominance_matrix(costs)
+    counts = dominates.sum(axis=0)
+    ranks = np.full(len(counts), -1, dtype=np.int64)
+    rank = 0
+    remaining = np.ones(len(counts), dtype=bool)
+    while remaining.any():
+        front = remaining & (counts == 0)
+        ranks[front] = rank
+        remaining &= ~front
+        counts = counts - dominates[front].sum(axis=0)
+        rank += 1
+    return ranks
+
+
+def crowding_distance(costs, ranks):
+    """Distancia de aglomeración de cada punto dentro de su frente"""
+    costs = np.asarray(costs, dtype=float)
+    distance = np.zeros(len(costs))
+    for rank in np.unique(ranks):
+        members = np.flatnonzero(ranks == rank)
+        if len(members) <= 2:
+            distance[members] = np.inf
+            continue
+        front = costs[members]
+        order = np.argsort(front, axis=0)
+        sorted_costs = np.take_along_axis(front, order, axis=0)
+        spread = sorted_costs[-1] - sorted_costs[0]
+        spread[spread == 0] = 1
+        gaps = np.zeros_like(front)
+        gaps[1:-1] = (sorted_costs[2:] - sorted_costs[:-2]) / spread
+        gaps[0] = gaps[-1] = np.inf
+        contribution = np.zeros_like(front)
+        np.put_along_axis(contribution, order, gaps, axis=0)
+        distance[members] = contribution.sum(axis=1)
+    return distance
+
+
+def export_front(front, path):
+    """
+    Escribe el frente de Pareto en CSV o JSON (según la extensión) de forma atómica.
+
+    Args:
+        front (list): Elementos {'light_times': dict, 'throughput': float, ...}
+        path (str): Archivo de salida (.csv o .json)
+    """
+    if str(path).endswith(".json"):
+        FileUtils.write_atomic(path, json.dumps(front, indent=2).encode("utf-8"))
+        return
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["N", "S", "E", "W"] + [name for name, _ in OBJECTIVES])
+    for point in front:
+        writer.writerow(
+            [point["light_times"][d] for d in ("N", "S", "E", "W")]
+            + [round(point[name], 4) for name, _ in OBJECTIVES]
+        )
+    FileUtils.write_atomic(path, output.getvalue().encode("utf-8"))
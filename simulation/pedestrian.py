@@ -1,11 +1,29 @@
 import random
-from config import PEDESTRIAN_SPEED, config
+from config import PEDESTRIAN_SPEED
 from util import TrafficUtils
+from .encoding import DIRECTION_VECTORS
 import networkx as nx
 
 
 class Pedestrian:
-    def __init__(self):
+    __slots__ = (
+        "x",
+        "y",
+        "initial_direction",
+        "final_direction",
+        "actual_direction",
+        "direction_movement",
+        "change_points",
+        "graph",
+        "speed",
+        "width",
+        "height",
+        "has_moved",
+        "is_stopped",
+        "layout",
+    )
+
+    def __init__(self, layout=None):
         self.x = 0
         self.y = 0
         self.initial_direction = None
@@ -15,16 +33,15 @@ class Pedestrian:
         self.change_points = []
         self.graph = None
         self.speed = PEDESTRIAN_SPEED
-        self.width = config["PEDESTRIAN_SIZE"]
-        self.height = config["PEDESTRIAN_SIZE"]
+        self.layout = layout or TrafficUtils.current_layout()
+        self.width = self.layout.pedestrian_size
+        self.height = self.layout.pedestrian_size
         self.has_moved = False
         self.is_stopped = False
 
     def calculate_initial_position(self):
-        center_x, center_y = config["SIMULATION_CENTER"]
-        road_three_halfs = 3 * config["ROAD_WIDTH"] // 2
-        road_half = config["ROAD_WIDTH"] // 2
-        central_limits = TrafficUtils.calculate_center_limits()
+        road_three_halfs = self.layout.road_three_halves
+        central_limits = self.layout.center_limits
 
         if self.initial_direction == "NE":
             self.x = central_limits["right"] + 10
@@ -51,12 +68,12 @@ class Pedestrian:
             self.x = central_limits["right"] + road_three_halfs
             self.y = central_limits["bottom"] + 10
 
-    def change_random_final_direction(self):
-        self.final_direction = random.choice(
+    def change_random_final_direction(self, rng=random):
+        self.final_direction = rng.choice(
             ["NE", "SE", "NW", "SW", "EN", "WN", "ES", "WS"]
         )
         if self.initial_direction == self.final_direction:
-            self.change_random_final_direction()
+            self.change_random_final_direction(rng)
         else:
             self.calculate_change_points()
 
@@ -69,8 +86,8 @@ class Pedestrian:
             self.actual_direction, self.change_points[1]
         )["direction"]
 
-    def change_random_initial_direction(self):
-        self.initial_direction = random.choice(
+    def change_random_initial_direction(self, rng=random):
+        self.initial_direction = rng.choice(
             ["NE", "SE", "NW", "SW", "EN", "WN", "ES", "WS"]
         )
         self.actual_direction = self.initial_direction
@@ -89,11 +106,10 @@ class Pedestrian:
             return self.__check_near_next_position(next_point)
 
     def __corner_limits(self):
-        center_limits = TrafficUtils.calculate_center_limits()
-        top = center_limits["top"]
-        bottom = center_limits["bottom"]
-        left = center_limits["left"]
-        right = center_limits["right"]
+        top = self.layout.top
+        bottom = self.layout.bottom
+        left = self.layout.left
+        right = self.layout.right
         corner_limits = {
             "TL": (left - self.width - 10, top - self.height - 10),
             "TR": (right + 10, top - self.height - 10),
@@ -127,23 +143,15 @@ class Pedestrian:
         self.direction_movement = direction
 
     def __move(self):
-        if self.direction_movement == "N":
-            self.y -= self.speed
-            self.has_moved = True
-        elif self.direction_movement == "S":
-            self.y += self.speed
-            self.has_moved = True
-        elif self.direction_movement == "E":
-            self.x += self.speed
-            self.has_moved = True
-        elif self.direction_movement == "W":
-            self.x -= self.speed
-            self.has_moved = True
+        dx, dy = DIRECTION_VECTORS[self.direction_movement]
+        self.x += dx * self.speed
+        self.y += dy * self.speed
+        self.has_moved = True
 
-    def reset_to_initial_state(self, change_direction=False):
+    def reset_to_initial_state(self, change_direction=False, rng=random):
         self.calculate_initial_position()
         if change_direction:
-            self.change_random_final_direction()
+            self.change_random_final_direction(rng)
         else:
             self.actual_direction = self.change_points[0]
             self.direction_movement = self.graph.get_edge_data(
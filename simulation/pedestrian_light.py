@@ -1,19 +1,21 @@
 from logging import config
-from config import GREEN, PEDESTRIAN_LIGHT_SIZE, config
+from config import PEDESTRIAN_LIGHT_SIZE, config
 from util.traffic_utils import TrafficUtils
+from .encoding import GREEN_LIGHT
 
 
 class PedestrianLight:
-    def __init__(self, direction, initial_state = GREEN):
+    __slots__ = ("direction", "position", "state", "size")
+
+    def __init__(self, direction, initial_state = GREEN_LIGHT, layout=None):
         self.direction = direction
         self.position = (0, 0)
         self.state = initial_state
         self.size = PEDESTRIAN_LIGHT_SIZE
-        self.__calculate_position()
+        self.__calculate_position(layout or TrafficUtils.current_layout())
 
-    def __calculate_position(self):
-        center = config["SIMULATION_CENTER"]
-        center_limits = TrafficUtils.calculate_center_limits()
+    def __calculate_position(self, layout):
+        center_limits = layout.center_limits
         if self.direction == "NE":
             self.position = (
                 center_limits["right"],
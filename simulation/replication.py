@@ -0,0 +1,335 @@
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from config import HEADLESS_WINDOW_SIZE, SIMULATION_DURATION, TICKS_PER_SECOND
+from util import Layout, StatisticsUtils
+from .demand import DemandGenerator, PoissonArrivals
+from .intersection import Intersection
+
+DIRECTIONS = ("N", "S", "E", "W")
+
+
+def build_intersection(
+    light_times,
+    demand,
+    pedestrians=0,
+    arrival_rates=None,
+    turning_ratios=None,
+    car_following=None,
+    auditor=None,
+    layout=None,
+    rng=None,
+):
+    """
+    Construye una intersección sin interfaz lista para simular.
+
+    Args:
+        light_times (dict): Tiempo en verde por dirección
+        demand (dict): Vehículos por dirección (flota que recircula)
+        pedestrians (int): Número de peatones
+        arrival_rates (dict): Llegadas de Poisson por dirección (vehículos/hora)
+        turning_ratios (dict): Proporción de cada destino por acceso (opcional)
+        car_following (IntelligentDriverModel): Modelo de seguimiento (opcional)
+        auditor (InvariantAuditor): Auditor de invariantes (opcional)
+        layout (Layout): Geometría de la intersección; None usa la vigente
+        rng (random.Random): Generador aleatorio; None usa el módulo random
+
+    Returns:
+        Intersection: Intersección configurada
+    """
+    intersection = Intersection(layout, rng)
+    intersection.turning_ratios = turning_ratios
+    for direction, green_time in light_times.items():
+        intersection.change_light_times(direction, green_time)
+    for direction, amount in demand.items():
+        if amount > 0:
+            intersection.add_vehicles(amount, direction)
+    if pedestrians > 0:
+        intersection.add_pedestrians(pedestrians)
+    if arrival_rates:
+        DemandGenerator(
+            intersection,
+            {d: PoissonArrivals(rate, intersection.rng) for d, rate in arrival_rates.items()},
+            rng=intersection.rng,
+        )
+    if car_following is not None:
+        car_following.attach(intersection)
+    if auditor is not None:
+        auditor.attach(intersection)
+    return intersection
+
+
+def run_headless(
+    light_times,
+    demand,
+    duration_seconds=SIMULATION_DURATION,
+    seed=None,
+    pedestrians=0,
+    arrival_rates=None,
+    turning_ratios=None,
+    car_following=None,
+    auditor=None,
+    layout=None,
+):
+    """
+    Ejecuta una réplica de la intersección sin interfaz gráfica.
+
+    La réplica usa su propio random.Random y su propio Layout, así que no altera
+    el estado aleatorio global ni la geometría de la interfaz.
+
+    Args:
+        light_times (dict): Tiempo en verde por dirección {'N': int, ...}
+        demand (dict): Vehículos por dirección {'N': int, ...}
+        duration_seconds (int): Duración simulada de la réplica
+        seed (int): Semilla del generador aleatorio de la réplica
+        pedestrians (int): Número de peatones
+        arrival_rates (dict): Llegadas de Poisson por dirección (vehículos/hora);
+            si se indica, la demanda es abierta además de la flota de demand
+        turning_ratios (dict): Proporción de cada destino por acceso (opcional)
+        car_following (IntelligentDriverModel): Modelo de seguimiento; None usa
+            velocidad constante
+        auditor (InvariantAuditor): Auditor de invariantes; lanza una excepción si
+            dos vehículos se superponen o uno cruza en rojo
+        layout (Layout): Geometría; None usa HEADLESS_WINDOW_SIZE
+
+    Returns:
+        dict: Vehículos que pasaron (total y por semáforo), estadísticas de cola,
+            demora media medida por acceso y espera media por peatón (s)
+    """
+    intersection = build_intersection(
+        light_times,
+        demand,
+        pedestrians,
+        arrival_rates,
+        turning_ratios,
+        car_following,
+        auditor,
+        layout or Layout(*HEADLESS_WINDOW_SIZE),
+        random.Random(seed),
+    )
+
+    ticks = int(duration_seconds * TICKS_PER_SECOND)
+    queue_sum = {d: 0 for d in DIRECTIONS}
+    queue_max = {d: 0 for d in DIRECTIONS}
+    pedestrian_wait_ticks = 0
+    for _ in range(ticks):
+        intersection.tick()
+        for pedestrian in intersection.pedestrians:
+            if pedestrian.speed == 0:
+                pedestrian_wait_ticks += 1
+        for direction, length in intersection.queue_lengths().items():
+            queue_sum[direction] += length
+            if length > queue_max[direction]:
+                queue_max[direction] = length
+
+    return {
+        "seed": seed,
+        "total_passing_vehicles": intersection.total_passing_vehicles,
+        "passing_vehicles": dict(intersection.passing_vehicles_total),
+        "mean_queue": {d: queue_sum[d] / max(1, ticks) for d in DIRECTIONS},
+        "max_queue": queue_max,
+        "mean_delay": intersection.delay_tracker.mean_delays(),
+        "pedestrian_wait": (
+            pedestrian_wait_ticks / TICKS_PER_SECOND / len(intersection.pedestrians)
+            if intersection.pedestrians
+            else 0.0
+        ),
+    }
+
+
+def _run_replication(arguments):
+    return run_headless(**arguments)
+
+
+class ReplicationRunner:
+    """
+    Ejecuta réplicas Monte Carlo independientes de un plan semafórico en
+    varios procesos y agrega los resultados con intervalos de confianza del 95%.
+
+    Atributos:
+        light_times (dict): Tiempo en verde por dirección
+        demand (dict): Vehículos por dirección
+        duration_seconds (int): Duración simulada de cada réplica
+        base_seed (int): Semilla de la primera réplica (la réplica i usa base_seed + i)
+        max_workers (int): Número de procesos (None usa todos los núcleos)
+        pedestrians (int): Número de peatones por réplica
+    """
+
+    def __init__(
+        self,
+        light_times,
+        demand,
+        duration_seconds=SIMULATION_DURATION,
+        base_seed=0,
+        max_workers=None,
+        pedestrians=0,
+    ):
+        self.light_times = dict(light_times)
+        self.demand = dict(demand)
+        self.duration_seconds = duration_seconds
+        self.base_seed = base_seed
+        self.max_workers = max_workers
+        self.pedestrians = pedestrians
+
+    def run(
+        self,
+        max_replications=30,
+        min_replications=3,
+        ci_width_target=None,
+        target_metric="total_passing_vehicles",
+    ):
+        """
+        Lanza réplicas hasta alcanzar max_replications o hasta que el ancho del
+        intervalo de confianza de target_metric sea menor que ci_width_target.
+
+        La parada temprana sólo se evalúa sobre el prefijo contiguo de réplicas
+        terminadas, así el resultado no depende del orden en que terminan los procesos.
+
+        Args:
+            max_replications (int): Número máximo de réplicas
+            min_replications (int): Réplicas mínimas antes de evaluar la parada
+            ci_width_target (float): Ancho objetivo del intervalo (None desactiva la parada)
+            target_metric (str): Métrica agregada usada para la parada temprana
+
+        Returns:
+            dict: Resumen agregado (media e IC 95%) y resultados de cada réplica
+        """
+        results = {}
+        replications = []
+        next_index = 0
+        stopped_early = False
+        workers = self.max_workers or os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = {}
+
+            while pending or next_index < max_replications:
+                while next_index < max_replications and len(pending) < workers:
+                    pending[self.__submit(executor, next_index)] = next_index
+                    next_index += 1
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+
+                while len(replications) in results:
+                    replications.append(results.pop(len(replications)))
+
+                if self.__target_reached(
+                    replications, min_replications, ci_width_target, target_metric
+                ):
+                    stopped_early = next_index < max_replications or bool(pending)
+                    for future in pending:
+                        future.cancel()
+                    break
+
+        summary = self.aggregate(replications)
+        summary["stopped_early"] = stopped_early
+        summary["replications"] = replications
+        return summary
+
+    def __submit(self, executor, index):
+        arguments = {
+            "light_times": self.light_times,
+            "demand": self.demand,
+            "duration_seconds": self.duration_seconds,
+            "seed": self.base_seed + index,
+            "pedestrians": self.pedestrians,
+        }
+        return executor.submit(_run_replication, arguments)
+
+    def __target_reached(self, replications, min_replications, ci_width_target, target_metric):
+        if ci_width_target is None or len(replications) < min_replications:
+            return False
+        values = [self.__metric_value(r, target_metric) for r in replications]
+        _, half_width = StatisticsUtils.mean_confidence_interval(values)
+        return 2 * half_width < ci_width_target
+
+    def __metric_value(self, result, metric):
+        # Las métricas por dirección se indican como "passing_vehicles.N"
+        if "." in metric:
+            key, direction = metric.split(".")
+            return result[key][direction]
+        return result[metric]
+
+    @staticmethod
+    def aggregate(replications):
+        summary = {
+            "n": len(replications),
+            "total_passing_vehicles": StatisticsUtils.summarize(
+                [r["total_passing_vehicles"] for r in replications]
+            ),
+        }
+        for key in ("passing_vehicles", "mean_queue", "max_queue", "mean_delay"):
+            summary[key] = {
+                d: StatisticsUtils.summarize([r[key][d] for r in replications])
+                for d in DIRECTIONS
+            }
+        return summary
+
+
+class SimulationFitness:
+    """
+    Fitness de un plan semafórico medido con una réplica sin interfaz.
+
+    Pensado para optimizaciones por lotes: cada llamada ejecuta una simulación
+    completa (segundos de cómputo) con la misma semilla, de modo que los planes se
+    comparan con la misma demanda.
+
+        fitness = vehículos que pasaron - delay_weight * demora media (s)
+
+    Atributos:
+        evaluations (int): Simulaciones ejecutadas
+    """
+
+    def __init__(self, demand, duration_seconds=60, seed=0, arrival_rates=None, delay_weight=1.0):
+        self.demand = dict(demand)
+        self.duration_seconds = duration_seconds
+        self.seed = seed
+        self.arrival_rates = arrival_rates
+        self.delay_weight = delay_weight
+        self.evaluations = 0
+
+    def __call__(self, light_times):
+        self.evaluations += 1
+        result = run_headless(
+            light_times,
+            self.demand,
+            self.duration_seconds,
+            seed=self.seed,
+            arrival_rates=self.arrival_rates,
+        )
+        mean_delay = sum(result["mean_delay"].values()) / len(DIRECTIONS)
+        return result["total_passing_vehicles"] - self.delay_weight * mean_delay
+
+
+class SimulationObjectives:
+    """
+    Objetivos de un plan semafórico medidos con una réplica sin interfaz:
+    (vehículos que pasaron, demora media vehicular, espera media por peatón).
+    """
+
+    def __init__(self, demand, pedestrians=10, duration_seconds=60, seed=0, arrival_rates=None):
+        self.demand = dict(demand)
+        self.pedestrians = pedestrians
+        self.duration_seconds = duration_seconds
+        self.seed = seed
+        self.arrival_rates = arrival_rates
+        self.evaluations = 0
+
+    def __call__(self, light_times):
+        self.evaluations += 1
+        result = run_headless(
+            light_times,
+            self.demand,
+            self.duration_seconds,
+            seed=self.seed,
+            pedestrians=self.pedestrians,
+            arrival_rates=self.arrival_rates,
+        )
+        return (
+            result["total_passing_vehicles"],
+            sum(result["mean_delay"].values()) / len(DIRECTIONS),
+            result["pedestrian_wait"],
+        )
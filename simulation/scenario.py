@@ -0,0 +1,278 @@
+import json
+import os
+import pickle
+import random
+
+from config import HEADLESS_WINDOW_SIZE, SIMULATION_DURATION
+from util import FileUtils, Layout
+from .encoding import DIRECTIONS
+from .exceptions import ScenarioValidationError
+from .replication import build_intersection, run_headless
+
+# Destinos posibles desde cada acceso (no hay giros en U)
+TURN_TARGETS = {
+    "N": ("N", "E", "W"),
+    "S": ("S", "E", "W"),
+    "E": ("E", "N", "S"),
+    "W": ("W", "N", "S"),
+}
+
+# Esquema del archivo: clave -> (tipo, obligatorio, valor por defecto)
+SCHEMA = {
+    "name": ("string", False, None),
+    "seed": ("integer", False, 0),
+    "duration_seconds": ("positive_number", False, SIMULATION_DURATION),
+    "signal_plan": ("green_times", True, None),
+    "demand": ("vehicle_counts", False, {}),
+    "arrival_rates": ("rates", False, {}),
+    "turning_ratios": ("turning_ratios", False, None),
+    "pedestrians": ("count", False, 0),
+    "layout": ("layout", False, None),
+}
+
+
+def _is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_direction_map(path, value, check, required=False):
+    if not isinstance(value, dict):
+        raise ScenarioValidationError(path, "debe ser un objeto por dirección")
+    for direction in value:
+        if direction not in DIRECTIONS:
+            raise ScenarioValidationError(f"{path}.{direction}", "dirección desconocida")
+    if required:
+        for direction in DIRECTIONS:
+            if direction not in value:
+                raise ScenarioValidationError(f"{path}.{direction}", "falta la dirección")
+    return {d: check(f"{path}.{d}", value[d]) for d in DIRECTIONS if d in value}
+
+
+def _positive_integer(path, value):
+    if not _is_integer(value) or value <= 0:
+        raise ScenarioValidationError(path, "debe ser un entero positivo")
+    return value
+
+
+def _count(path, value):
+    if not _is_integer(value) or value < 0:
+        raise ScenarioValidationError(path, "debe ser un entero no negativo")
+    return value
+
+
+def _rate(path, value):
+    if not _is_number(value) or value < 0:
+        raise ScenarioValidationError(path, "debe ser un número no negativo")
+    return float(value)
+
+
+def _turning_ratio(path, value):
+    approach = path.rsplit(".", 1)[-1]
+    if not isinstance(value, dict) or not value:
+        raise ScenarioValidationError(path, "debe ser un objeto destino -> proporción")
+    for target, ratio in value.items():
+        if target not in TURN_TARGETS[approach]:
+            raise ScenarioValidationError(f"{path}.{target}", f"destino no permitido desde {approach}")
+        _rate(f"{path}.{target}", ratio)
+    total = sum(value.values())
+    if abs(total - 1) > 1e-6:
+        raise ScenarioValidationError(path, f"las proporciones suman {total}, no 1")
+    return {target: float(ratio) for target, ratio in value.items()}
+
+
+def _layout(path, value):
+    if not isinstance(value, dict) or set(value) != {"window_width", "window_height"}:
+        raise ScenarioValidationError(path, "debe tener window_width y window_height")
+    return (
+        _positive_integer(f"{path}.window_width", value["window_width"]),
+        _positive_integer(f"{path}.window_height", value["window_height"]),
+    )
+
+
+def _check_value(path, kind, value):
+    if kind == "string":
+        if not isinstance(value, str):
+            raise ScenarioValidationError(path, "debe ser un texto")
+        return value
+    if kind == "integer":
+        if not _is_integer(value):
+            raise ScenarioValidationError(path, "debe ser un entero")
+        return value
+    if kind == "positive_number":
+        if not _is_number(value) or value <= 0:
+            raise ScenarioValidationError(path, "debe ser un número positivo")
+        return value
+    if kind == "count":
+        return _count(path, value)
+    if kind == "green_times":
+        return _check_direction_map(path, value, _positive_integer, required=True)
+    if kind == "vehicle_counts":
+        return _check_direction_map(path, value, _count)
+    if kind == "rates":
+        return _check_direction_map(path, value, _rate)
+    if kind == "turning_ratios":
+        return _check_direction_map(path, value, _turning_ratio)
+    if kind == "layout":
+        return _layout(path, value)
+    raise ValueError(f"Tipo de esquema desconocido: {kind}")
+
+
+def validate_scenario(data, source="escenario"):
+    """
+    Valida un escenario leído del archivo y completa los valores por defecto.
+
+    Raises:
+        ScenarioValidationError: Con la ruta del campo inválido
+    """
+    if not isinstance(data, dict):
+        raise ScenarioValidationError(source, "el escenario debe ser un objeto")
+    for key in data:
+        if key not in SCHEMA:
+            raise ScenarioValidationError(f"{source}.{key}", "campo desconocido")
+    validated = {}
+    for key, (kind, required, default) in SCHEMA.items():
+        if key not in data:
+            if required:
+                raise ScenarioValidationError(f"{source}.{key}", "campo obligatorio")
+            validated[key] = default
+        else:
+            validated[key] = _check_value(f"{source}.{key}", kind, data[key])
+    return validated
+
+
+class Scenario:
+    """
+    Escenario declarativo: demanda, proporciones de giro, plan semafórico,
+    semilla, duración y peatones de una corrida.
+
+    Ejemplo de archivo (JSON):
+
+        {
+            "name": "hora_pico",
+            "seed": 7,
+            "duration_seconds": 600,
+            "signal_plan": {"N": 15, "S": 23, "E": 41, "W": 41},
+            "demand": {"N": 8, "S": 4, "E": 13, "W": 20},
+            "arrival_rates": {"E": 500, "W": 750},
+            "turning_ratios": {"N": {"N": 0.6, "E": 0.2, "W": 0.2}},
+            "pedestrians": 10
+        }
+    """
+
+    def __init__(self, name, seed, duration_seconds, signal_plan, demand, arrival_rates,
+                 turning_ratios, pedestrians, layout):
+        self.name = name
+        self.seed = seed
+        self.duration_seconds = duration_seconds
+        self.signal_plan = signal_plan
+        self.demand = demand
+        self.arrival_rates = arrival_rates
+        self.turning_ratios = turning_ratios
+        self.pedestrians = pedestrians
+        self.layout = layout or HEADLESS_WINDOW_SIZE
+
+    @staticmethod
+    def from_dict(data, source="escenario"):
+        validated = validate_scenario(data, source)
+        if validated["name"] is None:
+            validated["name"] = os.path.splitext(os.path.basename(source))[0]
+        return Scenario(**validated)
+
+    @staticmethod
+    def load(path, cache=None):
+        """
+        Lee y valida un escenario; con cache (ScenarioCache) evita volver a
+        interpretar archivos que no cambiaron.
+        """
+        if cache is not None:
+            return cache.load(path)
+        with open(path, encoding="utf-8") as scenario_file:
+            try:
+                data = json.load(scenario_file)
+            except json.JSONDecodeError as error:
+                raise ScenarioValidationError(path, f"JSON inválido ({error})") from error
+        return Scenario.from_dict(data, path)
+
+    def build(self):
+        """Construye la intersección sin interfaz lista para simular"""
+        return build_intersection(
+            self.signal_plan,
+            self.demand,
+            self.pedestrians,
+            self.arrival_rates,
+            self.turning_ratios,
+            layout=Layout(*self.layout),
+            rng=random.Random(self.seed),
+        )
+
+    def run(self):
+        """Simula el escenario sin interfaz y devuelve el resumen de run_headless"""
+        return run_headless(
+            self.signal_plan,
+            self.demand,
+            self.duration_seconds,
+            seed=self.seed,
+            pedestrians=self.pedestrians,
+            arrival_rates=self.arrival_rates,
+            turning_ratios=self.turning_ratios,
+            layout=Layout(*self.layout),
+        )
+
+
+class ScenarioCache:
+    """
+    Caché binaria de escenarios ya validados.
+
+    Guarda en un único archivo pickle los escenarios interpretados, indexados por
+    ruta y validados por tamaño y fecha de modificación del archivo fuente. Cargar
+    miles de escenarios sin cambios cuesta una sola lectura.
+
+    Atributos:
+        path (str): Archivo de la caché
+        hits (int): Escenarios servidos desde la caché
+        misses (int): Escenarios que hubo que interpretar
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.__entries = {}
+        self.__dirty = False
+        if os.path.exists(path):
+            with open(path, "rb") as cache_file:
+                try:
+                    version, entries = pickle.load(cache_file)
+                except (pickle.UnpicklingError, EOFError, ValueError):
+                    version, entries = None, {}
+            if version == self.VERSION:
+                self.__entries = entries
+
+    def load(self, path):
+        key = os.path.abspath(path)
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        entry = self.__entries.get(key)
+        if entry is not None and entry[0] == signature:
+            self.hits += 1
+            return Scenario(**entry[1])
+        self.misses += 1
+        scenario = Scenario.load(path)
+        self.__entries[key] = (signature, dict(vars(scenario)))
+        self.__dirty = True
+        return scenario
+
+    def save(self):
+        if not self.__dirty:
+            return
+        FileUtils.write_atomic(
+            self.path,
+            pickle.dumps((self.VERSION, self.__entries), pickle.HIGHEST_PROTOCOL),
+        )
+        self.__dirty = False
@@ -0,0 +1,263 @@
+import math
+import time
+
+import numpy as np
+
+DIRECTIONS = ("N", "S", "E", "W")
+
+
+def shares_to_times(shares, cycle_time, min_green_time, max_green_time):
+    """
+    Convierte fracciones del verde (un punto del símplex) en tiempos enteros válidos.
+
+    Cada dirección recibe el mínimo y el verde restante se reparte según las
+    fracciones, sin superar el máximo (el exceso pasa a las demás) y con restos
+    mayores para que la suma sea exactamente cycle_time.
+    """
+    shares = np.clip(np.asarray(shares, dtype=float), 0, None)
+    if shares.sum() <= 0:
+        shares = np.ones(len(DIRECTIONS))
+    slack = cycle_time - len(DIRECTIONS) * min_green_time
+    capacity = np.full(len(DIRECTIONS), float(max_green_time - min_green_time))
+    extra = np.zeros(len(DIRECTIONS))
+    remaining = float(slack)
+    free = np.ones(len(DIRECTIONS), dtype=bool)
+    while remaining > 1e-9 and free.any():
+        weights = np.where(free, shares, 0)
+        if weights.sum() <= 0:
+            weights = free.astype(float)
+        proposal = remaining * weights / weights.sum()
+        room = capacity - extra
+        granted = np.minimum(proposal, room)
+        extra += granted
+        remaining -= granted.sum()
+        free &= extra < capacity - 1e-9
+
+    whole = np.floor(extra).astype(int)
+    leftover = slack - whole.sum()
+    order = np.argsort(-(extra - whole))
+    for index in order:
+        if leftover <= 0:
+            break
+        if whole[index] < capacity[index]:
+            whole[index] += 1
+            leftover -= 1
+    return {d: int(min_green_time + whole[i]) for i, d in enumerate(DIRECTIONS)}
+
+
+def times_to_shares(light_times, min_green_time):
+    extra = np.array([light_times[d] - min_green_time for d in DIRECTIONS], dtype=float) + 1e-3
+    return extra / extra.sum()
+
+
+def best_seed(optimizer, seeds):
+    """
+    Evalúa las semillas válidas y devuelve la mejor con su fitness, o
+    (None, -inf) si no hay ninguna. Así una búsqueda con arranque en caliente
+    nunca devuelve algo peor que el plan del que parte.
+    """
+    best, best_fitness = None, -math.inf
+    for light_times in seeds or []:
+        if not optimizer._validate_individual(light_times):
+            continue
+        fitness = optimizer._evaluate_fitness_cached(light_times)
+        if fitness > best_fitness:
+            best, best_fitness = dict(light_times), fitness
+    return best, best_fitness
+
+
+def deadline(time_budget):
+    return None if time_budget is None else time.perf_counter() + time_budget
+
+
+def expired(limit):
+    return limit is not None and time.perf_counter() > limit
+
+
+class GeneticSearch:
+    """
+    Algoritmo genético actual del optimizador, con la interfaz de estrategia.
+
+    Todas las estrategias implementan search(optimizer, seeds=None,
+    time_budget=None): seeds son planes con los que arrancar en caliente y
+    time_budget acota los segundos reales de la búsqueda.
+
+    Con checkpoint_path guarda su estado cada checkpoint_interval generaciones y
+    al terminar o agotar el tiempo; con resume continúa desde ese archivo (ver
+    TrafficFlowOptimizer.optimize_light_timing_genetic).
+    """
+
+    def __init__(self, generations=50, population_size=30, verbose=True,
+                 checkpoint_path=None, checkpoint_interval=5, resume=None):
+        self.generations = generations
+        self.population_size = population_size
+        self.verbose = verbose
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+
+    def search(self, optimizer, seeds=None, time_budget=None):
+        return optimizer.optimize_light_timing_genetic(
+            generations=self.generations,
+            population_size=self.population_size,
+            initial_population=optimizer.elite_archive if seeds is None else seeds,
+            time_budget=time_budget,
+            verbose=self.verbose,
+            checkpoint_path=self.checkpoint_path,
+            checkpoint_interval=self.checkpoint_interval,
+            resume=self.resume,
+        )
+
+
+class CMAESSearch:
+    """
+    CMA-ES sobre una parametrización del símplex de fracciones de verde.
+
+    Un vector z de tres componentes se transforma en fracciones con la razón
+    logarítmica aditiva (softmax de [z, 0]) y luego en tiempos con
+    shares_to_times, de modo que todo candidato es válido sin reparaciones.
+    Con semillas, la media inicial es la mejor de ellas.
+    """
+
+    def __init__(self, max_evaluations=600, population_size=None, sigma=0.8, seed=None):
+        self.max_evaluations = max_evaluations
+        self.population_size = population_size
+        self.sigma = sigma
+        self.rng = np.random.default_rng(seed)
+
+    def __to_times(self, optimizer, z):
+        logits = np.append(z, 0.0)
+        shares = np.exp(logits - logits.max())
+        return shares_to_times(
+            shares / shares.sum(),
+            optimizer.cycle_time,
+            optimizer.min_green_time,
+            optimizer.max_green_time,
+        )
+
+    def search(self, optimizer, seeds=None, time_budget=None):
+        limit = deadline(time_budget)
+        dimension = len(DIRECTIONS) - 1
+        best, best_fitness = best_seed(optimizer, seeds)
+        evaluations = 0
+        start = times_to_shares(
+            best or optimizer._calculate_proportional_times(optimizer._get_current_vehicle_counts()),
+            optimizer.min_green_time,
+        )
+        mean = np.log(start[:-1] / start[-1])
+        sigma = self.sigma
+
+        # Parámetros estándar de CMA-ES (Hansen)
+        lam = self.population_size or 4 + int(3 * math.log(dimension))
+        mu = lam // 2
+        weights = math.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        weights /= weights.sum()
+        mu_eff = 1 / (weights ** 2).sum()
+        c_sigma = (mu_eff + 2) / (dimension + mu_eff + 5)
+        d_sigma = 1 + 2 * max(0, math.sqrt((mu_eff - 1) / (dimension + 1)) - 1) + c_sigma
+        c_c = (4 + mu_eff / dimension) / (dimension + 4 + 2 * mu_eff / dimension)
+        c_1 = 2 / ((dimension + 1.3) ** 2 + mu_eff)
+        c_mu = min(1 - c_1, 2 * (mu_eff - 2 + 1 / mu_eff) / ((dimension + 2) ** 2 + mu_eff))
+        chi_n = math.sqrt(dimension) * (1 - 1 / (4 * dimension) + 1 / (21 * dimension ** 2))
+
+        path_sigma = np.zeros(dimension)
+        path_c = np.zeros(dimension)
+        covariance = np.eye(dimension)
+        generation = 0
+
+        while evaluations < self.max_evaluations:
+            generation += 1
+            eigenvalues, basis = np.linalg.eigh(covariance)
+            eigenvalues = np.sqrt(np.clip(eigenvalues, 1e-20, None))
+            inverse_sqrt = basis @ np.diag(1 / eigenvalues) @ basis.T
+
+            steps = self.rng.standard_normal((lam, dimension)) * eigenvalues @ basis.T
+            candidates = mean + sigma * steps
+            fitness = np.empty(lam)
+            for k, z in enumerate(candidates):
+                light_times = self.__to_times(optimizer, z)
+                fitness[k] = optimizer._evaluate_fitness_cached(light_times)
+                evaluations += 1
+                if fitness[k] > best_fitness:
+                    best, best_fitness = light_times, fitness[k]
+                if expired(limit):
+                    return best
+
+            order = np.argsort(-fitness)[:mu]
+            old_mean = mean
+            mean = weights @ candidates[order]
+            shift = (mean - old_mean) / sigma
+
+            path_sigma = (1 - c_sigma) * path_sigma + math.sqrt(
+                c_sigma * (2 - c_sigma) * mu_eff
+            ) * (inverse_sqrt @ shift)
+            norm = np.linalg.norm(path_sigma)
+            h_sigma = norm / math.sqrt(1 - (1 - c_sigma) ** (2 * generation)) / chi_n < 1.4 + 2 / (dimension + 1)
+            path_c = (1 - c_c) * path_c + (
+                math.sqrt(c_c * (2 - c_c) * mu_eff) * shift if h_sigma else 0
+            )
+            deviations = (candidates[order] - old_mean) / sigma
+            covariance = (
+                (1 - c_1 - c_mu) * covariance
+                + c_1 * (np.outer(path_c, path_c) + (0 if h_sigma else c_c * (2 - c_c)) * covariance)
+                + c_mu * (deviations.T * weights) @ deviations
+            )
+            sigma *= math.exp((c_sigma / d_sigma) * (norm / chi_n - 1))
+            if sigma < 1e-4:
+                break
+        return best
+
+
+class SimulatedAnnealingSearch:
+    """
+    Recocido simulado con movimientos que conservan las restricciones.
+
+    Cada movimiento transfiere segundos de verde entre dos direcciones sin salir
+    de [min_green_time, max_green_time], de modo que la suma del ciclo nunca
+    cambia y no hacen falta reparaciones. Con semillas, parte de la mejor de
+    ellas.
+    """
+
+    def __init__(self, max_evaluations=600, initial_temperature=5.0, cooling=0.99,
+                 max_step=8, seed=None):
+        self.max_evaluations = max_evaluations
+        self.initial_temperature = initial_temperature
+        self.cooling = cooling
+        self.max_step = max_step
+        self.rng = np.random.default_rng(seed)
+
+    def neighbour(self, optimizer, light_times):
+        giver, taker = self.rng.choice(DIRECTIONS, 2, replace=False)
+        limit = min(
+            light_times[giver] - optimizer.min_green_time,
+            optimizer.max_green_time - light_times[taker],
+            self.max_step,
+        )
+        neighbour = dict(light_times)
+        if limit > 0:
+            amount = int(self.rng.integers(1, limit + 1))
+            neighbour[giver] -= amount
+            neighbour[taker] += amount
+        return neighbour
+
+    def search(self, optimizer, seeds=None, time_budget=None):
+        limit = deadline(time_budget)
+        current, current_fitness = best_seed(optimizer, seeds)
+        if current is None:
+            current = optimizer._calculate_proportional_times(optimizer._get_current_vehicle_counts())
+            current_fitness = optimizer._evaluate_fitness_cached(current)
+        best, best_fitness = current, current_fitness
+        temperature = self.initial_temperature
+        for _ in range(self.max_evaluations - 1):
+            if expired(limit):
+                break
+            candidate = self.neighbour(optimizer, current)
+            fitness = optimizer._evaluate_fitness_cached(candidate)
+            if fitness >= current_fitness or self.rng.random() < math.exp(
+                (fitness - current_fitness) / max(temperature, 1e-9)
+            ):
+                current, current_fitness = candidate, fitness
+                if fitness > best_fitness:
+                    best, best_fitness = candidate, fitness
+            temperature *= self.cooling
+        return best
@@ -0,0 +1,273 @@
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from config import TICKS_PER_SECOND
+
+
+class SharedRingBuffer:
+    """
+    Cola circular de un productor y un consumidor en memoria compartida.
+
+    Cada registro son dos enteros de 64 bits (tramo, tick de llegada). La cabecera
+    guarda el total escrito y el total leído; el productor sólo avanza sobre
+    posiciones que el consumidor ya liberó.
+
+    Atributos:
+        capacity (int): Número máximo de registros pendientes
+    """
+
+    HEADER = 2
+    RECORD = 2
+
+    def __init__(self, name=None, capacity=65536):
+        size = (self.HEADER + capacity * self.RECORD) * 8
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.capacity = capacity
+        self.__header = np.ndarray((self.HEADER,), dtype=np.int64, buffer=self.shm.buf)
+        self.__records = np.ndarray(
+            (capacity, self.RECORD), dtype=np.int64, buffer=self.shm.buf, offset=self.HEADER * 8
+        )
+        if name is None:
+            self.__header[:] = 0
+
+    def write(self, records):
+        if len(records) > self.capacity:
+            raise ValueError(
+                f"{len(records)} traspasos superan la capacidad del buffer ({self.capacity})"
+            )
+        for segment_index, arrival_tick in records:
+            # Espera a que el consumidor libere espacio
+            while self.__header[0] - self.__header[1] >= self.capacity:
+                time.sleep(0.0001)
+            position = self.__header[0] % self.capacity
+            self.__records[position, 0] = segment_index
+            self.__records[position, 1] = arrival_tick
+            self.__header[0] += 1
+
+    def read(self):
+        written = int(self.__header[0])
+        read = int(self.__header[1])
+        records = [
+            (int(self.__records[i % self.capacity, 0]), int(self.__records[i % self.capacity, 1]))
+            for i in range(read, written)
+        ]
+        self.__header[1] = written
+        return records
+
+    def close(self):
+        del self.__header
+        del self.__records
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def _run_shard(shard, factory, factory_args, partitions, ring_names, capacity, ticks,
+               sync_ticks, barrier, results):
+    rings = {}
+    try:
+        local = set(partitions[shard])
+        network = factory(*factory_args, local_nodes=partitions[shard])
+        owner = {node: s for s, nodes in enumerate(partitions) for node in nodes}
+        outgoing = [
+            (i, owner[segment.to_node])
+            for i, segment in enumerate(network.segments)
+            if segment.from_node in local and segment.to_node not in local
+        ]
+        rings = {
+            pair: SharedRingBuffer(name, capacity)
+            for pair, name in ring_names.items()
+            if shard in pair
+        }
+        inbox = [ring for (src, dst), ring in rings.items() if dst == shard]
+        outbox = {dst: ring for (src, dst), ring in rings.items() if src == shard}
+
+        while network.ticks < ticks:
+            for _ in range(min(sync_ticks, ticks - network.ticks)):
+                network.tick()
+            for destination, ring in outbox.items():
+                ring.write([
+                    (segment_index, arrival_tick)
+                    for segment_index, target in outgoing
+                    if target == destination
+                    for arrival_tick in network.drain_segment(segment_index)
+                ])
+            barrier.wait()
+            for ring in inbox:
+                for segment_index, arrival_tick in ring.read():
+                    network.schedule_arrival(segment_index, arrival_tick)
+
+        results.put((shard, network.summary(local), None))
+    except Exception as exc:
+        barrier.abort()
+        results.put((shard, None, repr(exc)))
+    finally:
+        for ring in rings.values():
+            ring.close()
+
+
+class ShardedNetworkRunner:
+    """
+    Ejecuta una IntersectionNetwork repartiendo sus nodos entre varios procesos.
+
+    Cada proceso construye con la misma fábrica sólo los nodos de su partición y
+    los tramos de toda la red (basta su topología). Los vehículos que cruzan de una partición a otra se envían
+    como registros (tramo, tick de llegada) por colas circulares en memoria
+    compartida en cada tick de sincronización.
+
+    Si el intervalo de sincronización no supera el menor tiempo de recorrido de los
+    tramos frontera, ninguna llegada remota puede vencer dentro de la ventana en
+    que se produjo; como cada nodo usa su propio generador aleatorio, el resultado
+    es idéntico al de IntersectionNetwork.run en un solo proceso.
+
+    Si un proceso termina sin entregar su resultado, run aborta la sincronización,
+    detiene a los demás y lanza RuntimeError en lugar de esperar indefinidamente.
+
+    Args:
+        factory (callable): Función de nivel de módulo que construye la red; recibe
+            además local_nodes, los nodos a construir (ver IntersectionNetwork)
+        factory_args (tuple): Argumentos de la fábrica
+        partitions (list): Nodos de cada proceso; por defecto bloques contiguos
+        workers (int): Número de procesos si no se indican particiones
+        sync_seconds (float): Intervalo de sincronización; por defecto el mayor
+            valor que conserva el resultado exacto
+        ring_capacity (int): Registros por cola circular
+    """
+
+    POLL_SECONDS = 0.5
+
+    def __init__(self, factory, factory_args=(), partitions=None, workers=None,
+                 sync_seconds=None, ring_capacity=65536):
+        self.factory = factory
+        self.factory_args = tuple(factory_args)
+        # Sólo la topología: ningún nodo se construye en el proceso principal
+        network = factory(*self.factory_args, local_nodes=())
+        node_count = len(network.nodes)
+        if partitions is None:
+            workers = min(workers or os.cpu_count() or 1, node_count)
+            partitions = [
+                list(nodes) for nodes in np.array_split(np.arange(node_count), workers)
+            ]
+        self.partitions = [sorted(int(n) for n in nodes) for nodes in partitions]
+        if sorted(n for nodes in self.partitions for n in nodes) != list(range(node_count)):
+            raise ValueError("Las particiones deben cubrir cada nodo exactamente una vez")
+
+        owner = {node: s for s, nodes in enumerate(self.partitions) for node in nodes}
+        self.boundary_pairs = sorted({
+            (owner[segment.from_node], owner[segment.to_node])
+            for segment in network.segments
+            if owner[segment.from_node] != owner[segment.to_node]
+        })
+        boundary_travel = [
+            segment.travel_ticks
+            for segment in network.segments
+            if owner[segment.from_node] != owner[segment.to_node]
+        ]
+        max_sync_ticks = min(boundary_travel) if boundary_travel else None
+        if sync_seconds is None:
+            self.sync_ticks = max_sync_ticks or TICKS_PER_SECOND
+        else:
+            self.sync_ticks = max(1, int(sync_seconds * TICKS_PER_SECOND))
+            if max_sync_ticks is not None and self.sync_ticks > max_sync_ticks:
+                raise ValueError(
+                    "El intervalo de sincronización supera el menor tiempo de recorrido "
+                    f"entre particiones ({max_sync_ticks / TICKS_PER_SECOND} s)"
+                )
+        self.ring_capacity = ring_capacity
+
+    def run(self, duration_seconds):
+        """
+        Simula la red completa y combina los resultados de todos los procesos.
+
+        Returns:
+            dict: Mismo formato que IntersectionNetwork.summary
+        """
+        ticks = int(duration_seconds * TICKS_PER_SECOND)
+        rings = {pair: SharedRingBuffer(capacity=self.ring_capacity) for pair in self.boundary_pairs}
+        context = multiprocessing.get_context()
+        barrier = context.Barrier(len(self.partitions))
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=_run_shard,
+                args=(
+                    shard, self.factory, self.factory_args, self.partitions,
+                    {pair: ring.name for pair, ring in rings.items()},
+                    self.ring_capacity, ticks, self.sync_ticks, barrier, results,
+                ),
+            )
+            for shard in range(len(self.partitions))
+        ]
+        try:
+            for process in processes:
+                process.start()
+            summaries, errors = self.__collect(processes, results, barrier)
+            for process in processes:
+                process.join()
+        finally:
+            for ring in rings.values():
+                ring.close()
+                ring.unlink()
+        if errors:
+            raise RuntimeError("Falló la ejecución distribuida: " + "; ".join(errors))
+        return self.__merge(summaries, ticks)
+
+    def __collect(self, processes, results, barrier):
+        summaries = {}
+        errors = []
+        while len(summaries) < len(processes):
+            try:
+                shard, summary, error = results.get(timeout=self.POLL_SECONDS)
+            except queue.Empty:
+                # Un proceso que murió sin avisar deja a los demás en la barrera
+                dead = [
+                    shard
+                    for shard, process in enumerate(processes)
+                    if shard not in summaries and process.exitcode not in (None, 0)
+                ]
+                if dead:
+                    barrier.abort()
+                    for process in processes:
+                        if process.is_alive():
+                            process.terminate()
+                    errors.extend(
+                        f"partición {shard}: el proceso terminó con código "
+                        f"{processes[shard].exitcode}"
+                        for shard in dead
+                    )
+                    break
+                continue
+            if error is not None:
+                errors.append(f"partición {shard}: {error}")
+            summaries[shard] = summary
+        return summaries, errors
+
+    def __merge(self, summaries, ticks):
+        node_count = sum(len(nodes) for nodes in self.partitions)
+        merged = {
+            "ticks": ticks,
+            "total_passing_vehicles": [None] * node_count,
+            "passing_vehicles": [None] * node_count,
+            "mean_delay": [None] * node_count,
+            "entries": [None] * node_count,
+            "exits": [None] * node_count,
+            "in_transit": 0,
+        }
+        for shard, nodes in enumerate(self.partitions):
+            summary = summaries[shard]
+            for position, node in enumerate(nodes):
+                for key in ("total_passing_vehicles", "passing_vehicles", "mean_delay",
+                            "entries", "exits"):
+                    merged[key][node] = summary[key][position]
+            merged["in_transit"] += summary["in_transit"]
+        return merged
@@ -0,0 +1,109 @@
+import time
+
+from config import TICKS_PER_SECOND
+from .encoding import RED_LIGHT, YELLOW_LIGHT
+
+
+class FixedTimeController:
+    """
+    Controlador de tiempos fijos con desfase (offset) respecto al inicio de la red.
+
+    Durante los primeros offset_seconds el semáforo inicial conserva su estado, de
+    modo que todo el ciclo del nodo queda desplazado ese tiempo.
+
+    Atributos:
+        light_times (dict): Tiempo en verde por dirección
+        offset_seconds (float): Desfase del ciclo del nodo
+    """
+
+    def __init__(self, light_times, offset_seconds=0):
+        self.light_times = dict(light_times)
+        self.offset_seconds = offset_seconds
+
+    def attach(self, intersection):
+        for direction, green_time in self.light_times.items():
+            intersection.change_light_times(direction, green_time)
+        intersection.lights_toggle_timer = -int(self.offset_seconds * TICKS_PER_SECOND)
+        intersection.signal_controller = self
+
+    def on_tick(self, intersection):
+        pass
+
+
+class AdaptiveSignalController:
+    """
+    Controlador actuado que ajusta el verde de cada fase según la cola medida.
+
+    Cuando un semáforo entra en su amarillo previo al verde, el controlador lee la
+    cola y la ocupación de ese acceso (contadores incrementales de la intersección,
+    sin recorrer listas) y fija su tiempo en verde:
+
+        verde = pérdida_inicial + intervalo_saturación * demanda
+
+    acotado a [min_green_time, max_green_time]. La demanda cuenta completos los
+    vehículos detenidos y con peso occupancy_weight los que se acercan en
+    movimiento. Cada tick cuesta O(1), y la latencia de cada decisión se mide y se
+    compara con latency_budget_ms.
+
+    Atributos:
+        decisions (list): (tick, dirección, cola, ocupación, verde) de cada decisión
+        max_latency_ms (float): Mayor latencia de decisión observada
+        over_budget (int): Decisiones que superaron el presupuesto de latencia
+    """
+
+    def __init__(self, min_green_time=15, max_green_time=60, saturation_headway=2.0,
+                 startup_lost_time=2.0, occupancy_weight=0.5, latency_budget_ms=0.5):
+        self.min_green_time = min_green_time
+        self.max_green_time = max_green_time
+        self.saturation_headway = saturation_headway
+        self.startup_lost_time = startup_lost_time
+        self.occupancy_weight = occupancy_weight
+        self.latency_budget_ms = latency_budget_ms
+        self.ticks = 0
+        self.decisions = []
+        self.max_latency_ms = 0.0
+        self.total_latency_ms = 0.0
+        self.over_budget = 0
+        self.__pending = None
+
+    def attach(self, intersection):
+        intersection.signal_controller = self
+
+    def on_tick(self, intersection):
+        self.ticks += 1
+        for light in intersection.traffic_lights.values():
+            if light.state == YELLOW_LIGHT and light.last_state == RED_LIGHT:
+                if self.__pending != light.direction:
+                    self.__pending = light.direction
+                    self.decide(intersection, light.direction)
+                return
+        self.__pending = None
+
+    def green_time_for(self, queue, occupancy):
+        demand = queue + self.occupancy_weight * max(0, occupancy - queue)
+        green_time = round(self.startup_lost_time + self.saturation_headway * demand)
+        return max(self.min_green_time, min(self.max_green_time, green_time))
+
+    def decide(self, intersection, direction):
+        start = time.perf_counter()
+        queue = intersection.queue_counts[direction]
+        occupancy = intersection.occupancy_counts[direction]
+        green_time = self.green_time_for(queue, occupancy)
+        intersection.change_light_times(direction, green_time)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        self.decisions.append((self.ticks, direction, queue, occupancy, green_time))
+        self.total_latency_ms += latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        if latency_ms > self.latency_budget_ms:
+            self.over_budget += 1
+        return green_time
+
+    def latency_summary(self):
+        count = len(self.decisions)
+        return {
+            "decisions": count,
+            "mean_latency_ms": self.total_latency_ms / count if count else 0.0,
+            "max_latency_ms": self.max_latency_ms,
+            "over_budget": self.over_budget,
+        }
@@ -0,0 +1,287 @@
+import math
+
+import numpy as np
+
+from util import TrafficUtils
+from .encoding import (
+    DIRECTION_CODES,
+    DIRECTIONS,
+    PEDESTRIAN_POINT_CODES,
+    PEDESTRIAN_POINTS,
+)
+from .pedestrian import Pedestrian
+from .vehicle import Vehicle
+
+FLAG_STOPPED = 1
+FLAG_TURNING = 2
+FLAG_TURNED = 4
+FLAG_MOVED = 8
+FLAG_CHANGED_ASSET = 16
+FLAG_COUNTED = 32
+FLAG_QUEUED = 64
+FLAG_POOLED = 128
+
+# Largo máximo de una ruta peatonal (el camino más largo del grafo tiene 5 puntos)
+MAX_CHANGE_POINTS = 6
+NO_POINT = 255
+
+# Una fila por vehículo, en el orden de Intersection.vehicles de cada acceso
+VEHICLE_DTYPE = np.dtype(
+    [
+        ("direction", "u1"),
+        ("final_direction", "u1"),
+        ("flags", "u1"),
+        ("x", "<f8"),
+        ("y", "<f8"),
+        ("initial_offset", "<f8"),
+        ("turn_angle", "<f8"),
+        ("turn_distance", "<f8"),
+        ("start_delay", "<f8"),
+        ("speed", "<f8"),
+        ("width", "<f8"),
+        ("height", "<f8"),
+        ("limit_x", "<f8"),
+        ("limit_y", "<f8"),
+    ]
+)
+
+PEDESTRIAN_DTYPE = np.dtype(
+    [
+        ("initial_direction", "u1"),
+        ("final_direction", "u1"),
+        ("actual_direction", "u1"),
+        ("direction_movement", "u1"),
+        ("flags", "u1"),
+        ("change_points", "u1", (MAX_CHANGE_POINTS,)),
+        ("x", "<f8"),
+        ("y", "<f8"),
+        ("speed", "<f8"),
+        ("width", "<f8"),
+        ("height", "<f8"),
+    ]
+)
+
+# Una fila por semáforo vehicular, en el orden de DIRECTIONS
+LIGHT_DTYPE = np.dtype(
+    [
+        ("state", "u1"),
+        ("last_state", "u1"),
+        ("was_green", "?"),
+        ("green_time", "<f8"),
+        ("passing_vehicles", "<i8"),
+    ]
+)
+
+
+def _number(value):
+    # Los enteros se devuelven como int para no cambiar los tipos de la simulación
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def _optional(value):
+    return math.nan if value is None else value
+
+
+class IntersectionSnapshot:
+    """
+    Estado compacto de una intersección en un tick: vehículos, peatones,
+    semáforos y temporizadores guardados en arreglos estructurados de NumPy.
+
+    No guarda recursos gráficos ni referencias a objetos, así que se serializa con
+    pickle en pocos kilobytes y puede enviarse a otros procesos para evaluar
+    planes alternativos desde el mismo punto de partida.
+
+    Atributos:
+        layout (tuple): Tamaño de ventana con el que se tomó el estado
+        vehicles (np.ndarray): Filas VEHICLE_DTYPE
+        pedestrians (np.ndarray): Filas PEDESTRIAN_DTYPE
+        lights (np.ndarray): Filas LIGHT_DTYPE de los semáforos vehiculares
+        pedestrian_lights (np.ndarray): Código de estado de cada semáforo peatonal
+        lights_toggle_timer (int): Temporizador del ciclo semafórico
+        total_passing_vehicles (int): Vehículos que pasaron en total
+        passing_vehicles_total (dict): Vehículos que pasaron por acceso
+        turning_ratios (dict): Proporciones de giro de la intersección
+    """
+
+    def __init__(self, intersection):
+        self.layout = intersection.layout.size
+        self.vehicles = self.__capture_vehicles(intersection)
+        self.pedestrians = self.__capture_pedestrians(intersection.pedestrians)
+        self.lights = np.zeros(len(DIRECTIONS), dtype=LIGHT_DTYPE)
+        for i, direction in enumerate(DIRECTIONS):
+            light = intersection.traffic_lights[direction]
+            self.lights[i] = (
+                light.state,
+                light.last_state,
+                light.was_green,
+                light.green_time,
+                light.passing_vehicles,
+            )
+        self.pedestrian_lights = np.array(
+            [light.state for light in intersection.pedestrian_lights_list()],
+            dtype=np.uint8,
+        )
+        self.lights_toggle_timer = intersection.lights_toggle_timer
+        self.total_passing_vehicles = intersection.total_passing_vehicles
+        self.passing_vehicles_total = dict(intersection.passing_vehicles_total)
+        self.turning_ratios = intersection.turning_ratios
+
+    def __capture_vehicles(self, intersection):
+        pool = (
+            intersection.demand_generator.pool
+            if intersection.demand_generator is not None
+            else None
+        )
+        vehicles = intersection.vehicles_list()
+        rows = np.zeros(len(vehicles), dtype=VEHICLE_DTYPE)
+        for row, vehicle in zip(rows, vehicles):
+            row["direction"] = DIRECTION_CODES[vehicle.initial_direction]
+            row["final_direction"] = DIRECTION_CODES[vehicle.final_direction]
+            row["flags"] = (
+                (FLAG_STOPPED if vehicle.is_stopped else 0)
+                | (FLAG_TURNING if vehicle.is_turning else 0)
+                | (FLAG_TURNED if vehicle.has_turned else 0)
+                | (FLAG_MOVED if vehicle.has_moved else 0)
+                | (FLAG_CHANGED_ASSET if vehicle.changed_asset else 0)
+                | (FLAG_COUNTED if vehicle.has_counted else 0)
+                | (FLAG_QUEUED if vehicle.is_queued else 0)
+                | (FLAG_POOLED if pool is not None and pool.owns(vehicle) else 0)
+            )
+            row["x"] = vehicle.x
+            row["y"] = vehicle.y
+            row["initial_offset"] = vehicle.initial_offset
+            row["turn_angle"] = vehicle.turn_angle
+            row["turn_distance"] = vehicle.turn_distance
+            row["start_delay"] = vehicle.start_delay
+            row["speed"] = vehicle.speed
+            row["width"] = vehicle.width
+            row["height"] = vehicle.height
+            row["limit_x"] = _optional(vehicle.turning_limit[0])
+            row["limit_y"] = _optional(vehicle.turning_limit[1])
+        return rows
+
+    def __capture_pedestrians(self, pedestrians):
+        rows = np.zeros(len(pedestrians), dtype=PEDESTRIAN_DTYPE)
+        for row, pedestrian in zip(rows, pedestrians):
+            row["initial_direction"] = PEDESTRIAN_POINT_CODES[pedestrian.initial_direction]
+            row["final_direction"] = PEDESTRIAN_POINT_CODES[pedestrian.final_direction]
+            row["actual_direction"] = PEDESTRIAN_POINT_CODES[pedestrian.actual_direction]
+            row["direction_movement"] = DIRECTION_CODES[pedestrian.direction_movement]
+            row["flags"] = (FLAG_STOPPED if pedestrian.is_stopped else 0) | (
+                FLAG_MOVED if pedestrian.has_moved else 0
+            )
+            points = [PEDESTRIAN_POINT_CODES[p] for p in pedestrian.change_points]
+            row["change_points"] = points + [NO_POINT] * (MAX_CHANGE_POINTS - len(points))
+            row["x"] = pedestrian.x
+            row["y"] = pedestrian.y
+            row["speed"] = pedestrian.speed
+            row["width"] = pedestrian.width
+            row["height"] = pedestrian.height
+        return rows
+
+    def apply(self, intersection):
+        """
+        Reemplaza el estado de la intersección por el del snapshot.
+
+        Los vehículos y peatones se recrean sin recursos gráficos; los que venían
+        del VehiclePool se toman del pool del generador de demanda de la
+        intersección destino, si lo tiene. Las demoras por viaje vuelven a medirse
+        desde el tick del snapshot.
+        """
+        for vehicle in intersection.vehicles_list():
+            intersection.remove_vehicle(vehicle)
+            if intersection.demand_generator is not None and intersection.demand_generator.pool.owns(
+                vehicle
+            ):
+                intersection.demand_generator.pool.release(vehicle)
+        for direction in DIRECTIONS:
+            intersection.queue_counts[direction] = 0
+            intersection.occupancy_counts[direction] = 0
+
+        for row in self.vehicles:
+            vehicle = self.__restore_vehicle(intersection, row)
+            intersection.vehicles[vehicle.initial_direction].append(vehicle)
+            intersection.lanes[vehicle.initial_direction].add(vehicle)
+            intersection.delay_tracker.start_trip(vehicle)
+            if vehicle.is_queued:
+                intersection.queue_counts[vehicle.initial_direction] += 1
+            if not vehicle.has_counted:
+                intersection.occupancy_counts[vehicle.initial_direction] += 1
+
+        graph = TrafficUtils.pedestrian_graph()
+        intersection.pedestrians = [
+            self.__restore_pedestrian(row, graph, intersection.layout) for row in self.pedestrians
+        ]
+
+        for i, direction in enumerate(DIRECTIONS):
+            light = intersection.traffic_lights[direction]
+            row = self.lights[i]
+            light.state = int(row["state"])
+            light.last_state = int(row["last_state"])
+            light.was_green = bool(row["was_green"])
+            light.green_time = _number(row["green_time"])
+            light.passing_vehicles = int(row["passing_vehicles"])
+        for light, code in zip(intersection.pedestrian_lights_list(), self.pedestrian_lights):
+            light.state = int(code)
+
+        intersection.lights_toggle_timer = self.lights_toggle_timer
+        intersection.total_passing_vehicles = self.total_passing_vehicles
+        intersection.passing_vehicles_total = dict(self.passing_vehicles_total)
+        intersection.turning_ratios = self.turning_ratios
+
+    def __restore_vehicle(self, intersection, row):
+        direction = DIRECTIONS[row["direction"]]
+        final_direction = DIRECTIONS[row["final_direction"]]
+        flags = int(row["flags"])
+        vehicle = None
+        if flags & FLAG_POOLED and intersection.demand_generator is not None:
+            vehicle = intersection.demand_generator.pool.take()
+        if vehicle is None:
+            vehicle = Vehicle(direction, final_direction, intersection.layout)
+        vehicle.initial_direction = direction
+        vehicle.final_direction = final_direction
+        vehicle.layout = intersection.layout
+        vehicle.asset = None
+        vehicle.is_stopped = bool(flags & FLAG_STOPPED)
+        vehicle.is_turning = bool(flags & FLAG_TURNING)
+        vehicle.has_turned = bool(flags & FLAG_TURNED)
+        vehicle.has_moved = bool(flags & FLAG_MOVED)
+        vehicle.changed_asset = bool(flags & FLAG_CHANGED_ASSET)
+        vehicle.has_counted = bool(flags & FLAG_COUNTED)
+        vehicle.is_queued = bool(flags & FLAG_QUEUED)
+        vehicle.x = _number(row["x"])
+        vehicle.y = _number(row["y"])
+        vehicle.initial_offset = _number(row["initial_offset"])
+        vehicle.turn_angle = _number(row["turn_angle"])
+        vehicle.turn_distance = _number(row["turn_distance"])
+        vehicle.start_delay = _number(row["start_delay"])
+        vehicle.speed = _number(row["speed"])
+        vehicle.width = _number(row["width"])
+        vehicle.height = _number(row["height"])
+        vehicle.turning_limit = (
+            (None, None)
+            if math.isnan(row["limit_x"])
+            else (_number(row["limit_x"]), _number(row["limit_y"]))
+        )
+        vehicle.path = vehicle.turning_path()
+        return vehicle
+
+    def __restore_pedestrian(self, row, graph, layout):
+        pedestrian = Pedestrian(layout)
+        pedestrian.graph = graph
+        pedestrian.initial_direction = PEDESTRIAN_POINTS[row["initial_direction"]]
+        pedestrian.final_direction = PEDESTRIAN_POINTS[row["final_direction"]]
+        pedestrian.actual_direction = PEDESTRIAN_POINTS[row["actual_direction"]]
+        pedestrian.direction_movement = DIRECTIONS[row["direction_movement"]]
+        pedestrian.change_points = [
+            PEDESTRIAN_POINTS[code] for code in row["change_points"] if code != NO_POINT
+        ]
+        pedestrian.is_stopped = bool(row["flags"] & FLAG_STOPPED)
+        pedestrian.has_moved = bool(row["flags"] & FLAG_MOVED)
+        pedestrian.x = _number(row["x"])
+        pedestrian.y = _number(row["y"])
+        pedestrian.speed = _number(row["speed"])
+        pedestrian.width = _number(row["width"])
+        pedestrian.height = _number(row["height"])
+        return pedestrian
@@ -0,0 +1,155 @@
+import numpy as np
+
+
+class GaussianProcessSurrogate:
+    """
+    Modelo sustituto (proceso gaussiano con núcleo RBF) del fitness de un plan.
+
+    Las entradas son los cuatro tiempos en verde como fracción del ciclo y la
+    demanda de cada acceso como fracción del total. Se entrena con los puntos
+    evaluados de verdad (los más recientes, hasta max_points) y predice media y
+    desviación del fitness de puntos nuevos.
+
+    Atributos:
+        length_scale (float): Escala del núcleo en el espacio de entradas
+        noise (float): Varianza del ruido de observación (fitness normalizado)
+        max_points (int): Puntos de entrenamiento conservados
+    """
+
+    DIRECTIONS = ("N", "S", "E", "W")
+
+    def __init__(self, length_scale=0.15, noise=1e-3, max_points=300):
+        self.length_scale = length_scale
+        self.noise = noise
+        self.max_points = max_points
+        self.__inputs = []
+        self.__targets = []
+        self.__model = None
+
+    def __len__(self):
+        return len(self.__targets)
+
+    def features(self, light_times, demand):
+        times = np.array([light_times[d] for d in self.DIRECTIONS], dtype=float)
+        counts = np.array([demand[d] for d in self.DIRECTIONS], dtype=float)
+        total = counts.sum()
+        return np.concatenate([
+            times / times.sum(),
+            counts / total if total > 0 else np.full(len(counts), 0.25),
+        ])
+
+    def add(self, features, fitness):
+        self.__inputs.append(features)
+        self.__targets.append(float(fitness))
+        if len(self.__targets) > self.max_points:
+            del self.__inputs[0]
+            del self.__targets[0]
+        self.__model = None
+
+    def __kernel(self, a, b):
+        distances = ((a[:, np.newaxis, :] - b[np.newaxis, :, :]) ** 2).sum(axis=2)
+        return np.exp(-0.5 * distances / self.length_scale ** 2)
+
+    def __fit(self):
+        inputs = np.array(self.__inputs)
+        targets = np.array(self.__targets)
+        mean = targets.mean()
+        scale = targets.std() or 1.0
+        kernel = self.__kernel(inputs, inputs) + self.noise * np.eye(len(inputs))
+        cholesky = np.linalg.cholesky(kernel)
+        alpha = np.linalg.solve(cholesky.T, np.linalg.solve(cholesky, (targets - mean) / scale))
+        self.__model = (inputs, cholesky, alpha, mean, scale)
+
+    def predict(self, features):
+        """
+        Predice el fitness de varios puntos.
+
+        Args:
+            features (np.ndarray): Entradas de forma (puntos, 8)
+
+        Returns:
+            tuple: (media, desviación) de forma (puntos,)
+        """
+        if self.__model is None:
+            self.__fit()
+        inputs, cholesky, alpha, mean, scale = self.__model
+        cross = self.__kernel(np.atleast_2d(features), inputs)
+        prediction = cross @ alpha
+        solved = np.linalg.solve(cholesky, cross.T)
+        variance = np.clip(1.0 - (solved ** 2).sum(axis=0), 0, None)
+        return prediction * scale + mean, np.sqrt(variance) * scale
+
+
+class SurrogateScreen:
+    """
+    Preselección de descendientes con el modelo sustituto.
+
+    De los individuos sin fitness conocido sólo se evalúa de verdad la fracción
+    screen_fraction con mejor cota optimista (media + exploration * desviación);
+    el resto recibe el fitness predicho. Cada evaluación real se compara con su
+    predicción previa para medir qué tan bien sigue el modelo al fitness real.
+
+    Atributos:
+        true_evaluations (int): Evaluaciones reales hechas con el modelo activo
+        saved_evaluations (int): Evaluaciones reales evitadas
+    """
+
+    def __init__(self, surrogate=None, screen_fraction=0.3, min_training_points=10,
+                 exploration=1.0, history_size=200):
+        self.surrogate = surrogate or GaussianProcessSurrogate()
+        self.screen_fraction = screen_fraction
+        self.min_training_points = min_training_points
+        self.exploration = exploration
+        self.history_size = history_size
+        self.true_evaluations = 0
+        self.saved_evaluations = 0
+        self.__predicted = []
+        self.__actual = []
+
+    def is_ready(self):
+        return len(self.surrogate) >= self.min_training_points
+
+    def record(self, features, fitness, predicted=None):
+        self.surrogate.add(features, fitness)
+        if predicted is not None:
+            self.__predicted.append(float(predicted))
+            self.__actual.append(float(fitness))
+            if len(self.__actual) > self.history_size:
+                del self.__predicted[0]
+                del self.__actual[0]
+
+    def select(self, features):
+        """
+        Elige qué puntos se evalúan de verdad.
+
+        Returns:
+            tuple: (índices a evaluar, media predicha de todos los puntos)
+        """
+        mean, deviation = self.surrogate.predict(features)
+        count = max(1, int(np.ceil(self.screen_fraction * len(mean))))
+        order = np.argsort(-(mean + self.exploration * deviation))
+        return sorted(order[:count].tolist()), mean
+
+    def report(self):
+        """
+        Resume el ahorro y la precisión del modelo.
+
+        Returns:
+            dict: Evaluaciones reales y ahorradas, error absoluto medio y
+                correlación de rangos (Spearman) entre predicción y fitness real
+        """
+        report = {
+            "training_points": len(self.surrogate),
+            "true_evaluations": self.true_evaluations,
+            "saved_evaluations": self.saved_evaluations,
+            "mean_absolute_error": None,
+            "rank_correlation": None,
+        }
+        if self.__actual:
+            predicted = np.array(self.__predicted)
+            actual = np.array(self.__actual)
+            report["mean_absolute_error"] = float(np.abs(predicted - actual).mean())
+            if len(actual) > 2 and actual.std() > 0 and predicted.std() > 0:
+                ranks = [np.argsort(np.argsort(values)) for values in (predicted, actual)]
+                report["rank_correlation"] = float(np.corrcoef(*ranks)[0, 1])
+        return report
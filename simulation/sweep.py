@@ -0,0 +1,307 @@
+import glob
+import io
+import itertools
+import json
+import os
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from config import (
+    DEFAULT_DEMAND,
+    DEFAULT_GREEN_EAST_LIGHT_TIME,
+    DEFAULT_GREEN_NORTH_LIGHT_TIME,
+    DEFAULT_GREEN_SOUTH_LIGHT_TIME,
+    DEFAULT_GREEN_WEST_LIGHT_TIME,
+    SIMULATION_DURATION,
+)
+from util import FileUtils
+from .replication import DIRECTIONS, run_headless
+
+DEFAULT_LIGHT_TIMES = {
+    "N": DEFAULT_GREEN_NORTH_LIGHT_TIME,
+    "S": DEFAULT_GREEN_SOUTH_LIGHT_TIME,
+    "E": DEFAULT_GREEN_EAST_LIGHT_TIME,
+    "W": DEFAULT_GREEN_WEST_LIGHT_TIME,
+}
+
+
+class ParameterSpace:
+    """
+    Espacio de parámetros de un barrido de planes semafóricos.
+
+    Cada parámetro es una lista de valores discretos o una tupla (mínimo, máximo)
+    de enteros. Los parámetros reconocidos son green_N/S/E/W, cycle_time,
+    demand_N/S/E/W, demand_scale y duration_seconds.
+
+    Atributos:
+        parameters (dict): Especificación de cada parámetro
+        method (str): "grid", "lhs" (hipercubo latino) o "random"
+        samples (int): Número de puntos para "lhs" y "random"
+        seed (int): Semilla del muestreo
+    """
+
+    METHODS = ("grid", "lhs", "random")
+
+    def __init__(self, parameters, method="grid", samples=None, seed=0):
+        if method not in self.METHODS:
+            raise ValueError(f"Método de muestreo desconocido: {method}")
+        if method == "grid" and any(
+            not isinstance(v, list) for v in parameters.values()
+        ):
+            raise ValueError("El método grid requiere listas de valores")
+        if method != "grid" and not samples:
+            raise ValueError(f"El método {method} requiere un número de muestras")
+        self.parameters = dict(parameters)
+        self.method = method
+        self.samples = samples
+        self.seed = seed
+
+    def points(self):
+        if self.method == "grid":
+            names = sorted(self.parameters)
+            return [
+                dict(zip(names, values))
+                for values in itertools.product(*(self.parameters[n] for n in names))
+            ]
+        rng = np.random.default_rng(self.seed)
+        if self.method == "lhs":
+            unit = self.__latin_hypercube(rng)
+        else:
+            unit = rng.random((self.samples, len(self.parameters)))
+        names = sorted(self.parameters)
+        return [
+            {name: self.__scale(self.parameters[name], u) for name, u in zip(names, row)}
+            for row in unit
+        ]
+
+    def __latin_hypercube(self, rng):
+        # Un punto por estrato en cada dimensión, estratos permutados por columna
+        dimensions = len(self.parameters)
+        strata = np.tile(np.arange(self.samples), (dimensions, 1))
+        strata = rng.permuted(strata, axis=1).T
+        return (strata + rng.random((self.samples, dimensions))) / self.samples
+
+    def __scale(self, spec, u):
+        if isinstance(spec, list):
+            return spec[min(int(u * len(spec)), len(spec) - 1)]
+        low, high = spec
+        return int(low + min(int(u * (high - low + 1)), high - low))
+
+
+def build_job(point):
+    """
+    Convierte un punto del barrido en los argumentos de una corrida sin interfaz.
+
+    Los tiempos no indicados toman los valores DEFAULT_GREEN_* de config.py; si se
+    indica cycle_time, los verdes se escalan para sumar exactamente ese ciclo,
+    con al menos 1 s de verde por acceso.
+
+    Args:
+        point (dict): Valores de los parámetros del punto
+
+    Returns:
+        dict: Argumentos para run_headless
+    """
+    light_times = {
+        d: point.get(f"green_{d}", DEFAULT_LIGHT_TIMES[d]) for d in DIRECTIONS
+    }
+    if "cycle_time" in point:
+        light_times = scale_light_times(light_times, point["cycle_time"])
+
+    demand_scale = point.get("demand_scale", 1)
+    demand = {
+        d: int(round(point.get(f"demand_{d}", DEFAULT_DEMAND[d]) * demand_scale))
+        for d in DIRECTIONS
+    }
+
+    return {
+        "light_times": light_times,
+        "demand": demand,
+        "duration_seconds": point.get("duration_seconds", SIMULATION_DURATION),
+        "seed": zlib.crc32(point_key(point).encode()),
+    }
+
+
+def scale_light_times(light_times, cycle_time, min_green_time=1):
+    cycle_time = int(cycle_time)
+    if cycle_time < len(DIRECTIONS) * min_green_time:
+        raise ValueError(
+            f"cycle_time={cycle_time} no alcanza para {min_green_time} s de verde "
+            f"en cada uno de los {len(DIRECTIONS)} accesos"
+        )
+    # Los accesos que quedarían por debajo del verde mínimo se fijan en él y el
+    # resto del ciclo se reparte de nuevo entre los demás
+    fixed = {}
+    while True:
+        free = [d for d in DIRECTIONS if d not in fixed]
+        available = cycle_time - len(fixed) * min_green_time
+        total = sum(light_times[d] for d in free)
+        exact = {
+            d: light_times[d] * available / total if total else available / len(free)
+            for d in free
+        }
+        short = [d for d in free if exact[d] < min_green_time]
+        if not short:
+            break
+        fixed.update((d, min_green_time) for d in short)
+    # Reparto por mayor residuo para que la suma sea exactamente cycle_time
+    scaled = {d: int(exact[d]) for d in free}
+    remainder = available - sum(scaled.values())
+    for d in sorted(free, key=lambda d: exact[d] - scaled[d], reverse=True)[:remainder]:
+        scaled[d] += 1
+    scaled.update(fixed)
+    return {d: scaled[d] for d in DIRECTIONS}
+
+
+def point_key(point):
+    return json.dumps(point, sort_keys=True, default=float)
+
+
+def _run_point(point):
+    job = build_job(point)
+    return point, job, run_headless(**job)
+
+
+class SweepEngine:
+    """
+    Ejecuta un barrido de parámetros sobre la intersección sin interfaz en un
+    grupo de procesos.
+
+    Los resultados se escriben por columnas en fragmentos .npz dentro de
+    results_path a medida que llegan. Al reanudar un barrido, los puntos que ya
+    están en algún fragmento no se vuelven a ejecutar. Las filas pendientes se
+    escriben también si la ejecución se interrumpe, y un punto que falla se
+    informa y se omite sin descartar las demás.
+
+    Atributos:
+        space (ParameterSpace): Espacio de parámetros a recorrer
+        results_path (str): Directorio de resultados
+        max_workers (int): Número de procesos (None usa todos los núcleos)
+        chunk_size (int): Filas por fragmento escrito
+        failed_points (list): Puntos que fallaron en la última ejecución
+    """
+
+    def __init__(self, space, results_path, max_workers=None, chunk_size=32):
+        self.space = space
+        self.results_path = results_path
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.failed_points = []
+        self.__buffer = []
+
+    def run(self):
+        """
+        Ejecuta los puntos pendientes del barrido.
+
+        Returns:
+            int: Número de puntos ejecutados en esta llamada
+        """
+        completed = self.completed_keys(self.results_path)
+        points = [p for p in self.space.points() if point_key(p) not in completed]
+        print(f"🧮 Barrido: {len(points)} puntos pendientes, {len(completed)} ya completados")
+
+        workers = self.max_workers or os.cpu_count() or 1
+        remaining = iter(points)
+        executed = 0
+        self.failed_points = []
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = {}
+            try:
+                for point in itertools.islice(remaining, 2 * workers):
+                    pending[executor.submit(_run_point, point)] = point
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        point = pending.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as error:
+                            print(f"⚠️ Punto {point_key(point)} omitido: {error!r}")
+                            self.failed_points.append(point)
+                        else:
+                            self.__add_row(*result)
+                            executed += 1
+                        next_point = next(remaining, None)
+                        if next_point is not None:
+                            pending[executor.submit(_run_point, next_point)] = next_point
+            finally:
+                # Conservar las filas terminadas aunque la ejecución se interrumpa
+                self.__flush()
+                for future in pending:
+                    future.cancel()
+
+        return executed
+
+    def __add_row(self, point, job, result):
+        row = {"point_key": point_key(point), "seed": job["seed"]}
+        for d in DIRECTIONS:
+            row[f"green_{d}"] = job["light_times"][d]
+            row[f"demand_{d}"] = job["demand"][d]
+        row["duration_seconds"] = job["duration_seconds"]
+        row["total_passing_vehicles"] = result["total_passing_vehicles"]
+        for d in DIRECTIONS:
+            row[f"passing_vehicles_{d}"] = result["passing_vehicles"][d]
+            row[f"mean_queue_{d}"] = result["mean_queue"][d]
+            row[f"max_queue_{d}"] = result["max_queue"][d]
+            row[f"mean_delay_{d}"] = result["mean_delay"][d]
+        self.__buffer.append(row)
+        if len(self.__buffer) >= self.chunk_size:
+            self.__flush()
+
+    def __flush(self):
+        if not self.__buffer:
+            return
+        columns = {
+            name: np.array([row[name] for row in self.__buffer])
+            for name in self.__buffer[0]
+        }
+        chunk_index = len(self.__chunk_paths(self.results_path))
+        data = io.BytesIO()
+        np.savez(data, **columns)
+        FileUtils.write_atomic(
+            os.path.join(self.results_path, f"chunk_{chunk_index:05d}.npz"),
+            data.getvalue(),
+        )
+        self.__buffer = []
+
+    @staticmethod
+    def __chunk_paths(results_path):
+        return sorted(glob.glob(os.path.join(results_path, "chunk_*.npz")))
+
+    @staticmethod
+    def completed_keys(results_path):
+        keys = set()
+        for path in SweepEngine.__chunk_paths(results_path):
+            with np.load(path) as chunk:
+                keys.update(chunk["point_key"].tolist())
+        return keys
+
+    @staticmethod
+    def load_results(results_path):
+        """
+        Carga todos los fragmentos de un barrido.
+
+        Los fragmentos escritos por versiones anteriores pueden no tener todas las
+        columnas (por ejemplo mean_delay_*); en esas filas la columna vale NaN.
+
+        Returns:
+            dict: Nombre de columna -> np.ndarray con todas las filas
+        """
+        chunks = []
+        for path in SweepEngine.__chunk_paths(results_path):
+            with np.load(path) as chunk:
+                chunks.append({name: chunk[name] for name in chunk.files})
+        names = list(dict.fromkeys(name for chunk in chunks for name in chunk))
+        return {
+            name: np.concatenate(
+                [
+                    chunk[name] if name in chunk else np.full(len(chunk["point_key"]), np.nan)
+                    for chunk in chunks
+                ]
+            )
+            for name in names
+        }
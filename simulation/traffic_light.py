@@ -1,26 +1,26 @@
-from config import RED, config, GREEN
+from util import TrafficUtils
+from .encoding import GREEN_LIGHT, RED_LIGHT
 
 class TrafficLight:
-    def __init__(self, direction, initial_state = RED):
+    __slots__ = (
+        "direction",
+        "position",
+        "state",
+        "was_green",
+        "last_state",
+        "green_time",
+        "passing_vehicles",
+    )
+
+    def __init__(self, direction, initial_state = RED_LIGHT, layout=None):
         self.direction = direction
-        self.position = self.__calculate_position()
+        self.position = self.__calculate_position(layout or TrafficUtils.current_layout())
         self.state = initial_state
         self.was_green = False
-        self.last_state = GREEN
+        self.last_state = GREEN_LIGHT
         self.green_time = 0
         self.passing_vehicles = 0
         
 
-    def __calculate_position(self):
-        center = config["SIMULATION_CENTER"]
-        if self.direction == "E":
-            position = (center[0] - config["ROAD_WIDTH"] // 2, center[1] + config["ROAD_WIDTH"] // 4)
-        elif self.direction == "W":
-            position = (center[0] + config["ROAD_WIDTH"] // 2, center[1] - config["ROAD_WIDTH"] // 4)
-        elif self.direction == "S":
-            position = (center[0] - config["ROAD_WIDTH"] // 4, center[1] - config["ROAD_WIDTH"] // 2)
-        elif self.direction == "N":
-            position = (center[0] + config["ROAD_WIDTH"] // 4, center[1] + config["ROAD_WIDTH"] // 2)
-        return position
-        
-   
+    def __calculate_position(self, layout):
+        return layout.stop_lines[self.direction]
@@ -0,0 +1,341 @@
+import os
+
+import numpy as np
+
+from config import DEFAULT_VEHICLE_SPEED
+from .encoding import DIRECTION_CODES, DIRECTIONS
+from .intersection import Intersection
+from .pedestrian import Pedestrian
+from .vehicle import Vehicle
+
+VEHICLE_KIND = 0
+PEDESTRIAN_KIND = 1
+
+FLAG_TURNING = 1
+FLAG_TURNED = 2
+FLAG_STOPPED = 4
+FLAG_COUNTED = 8
+FLAG_MOVED = 16
+FLAG_CHANGED_ASSET = 32
+
+NO_ASSET = 255
+
+# Una fila por agente y tick
+AGENT_DTYPE = np.dtype(
+    [
+        ("tick", "<u4"),
+        ("kind", "u1"),
+        ("flags", "u1"),
+        ("direction", "u1"),
+        ("final_direction", "u1"),
+        ("index", "<u4"),
+        ("x", "<f4"),
+        ("y", "<f4"),
+        ("turn_angle", "<f4"),
+        ("width", "<u2"),
+        ("height", "<u2"),
+        ("asset", "u1"),
+    ]
+)
+
+# Una fila por tick con el rango de agentes y el estado de los semáforos
+FRAME_DTYPE = np.dtype(
+    [
+        ("tick", "<u4"),
+        ("first_row", "<u8"),
+        ("rows", "<u4"),
+        ("total_passing_vehicles", "<u4"),
+        ("lights", "u1", (4,)),
+        ("pedestrian_lights", "u1", (8,)),
+        ("passing_vehicles", "<u4", (4,)),
+    ]
+)
+
+
+class TrajectoryRecorder:
+    """
+    Graba el estado de cada tick de la simulación en un registro binario de ancho fijo.
+
+    Se generan dos archivos: <path>.agents con una fila AGENT_DTYPE por vehículo o
+    peatón, y <path>.frames con una fila FRAME_DTYPE por tick. Las filas se acumulan
+    en bloques preasignados y se escriben al disco cuando el bloque se llena.
+
+    Atributos:
+        path (str): Ruta base de los archivos
+        chunk_rows (int): Filas de agentes por bloque
+    """
+
+    def __init__(self, path, chunk_rows=65536):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.__agents = np.zeros(chunk_rows, dtype=AGENT_DTYPE)
+        self.__frames = np.zeros(max(1, chunk_rows // 64), dtype=FRAME_DTYPE)
+        self.__agent_count = 0
+        self.__frame_count = 0
+        self.__written_rows = 0
+        self.__tick = 0
+        self.__indexes = {}
+        self.__assets = {}
+        self.__agents_file = open(f"{path}.agents", "wb")
+        self.__frames_file = open(f"{path}.frames", "wb")
+
+    def record(self, intersection):
+        first_row = self.__written_rows + self.__agent_count
+        rows = 0
+
+        for vehicle in intersection.vehicles_list():
+            self.__append_vehicle(intersection, vehicle)
+            rows += 1
+        for pedestrian in intersection.pedestrians:
+            self.__append_pedestrian(pedestrian)
+            rows += 1
+
+        frame = self.__frames[self.__frame_count]
+        frame["tick"] = self.__tick
+        frame["first_row"] = first_row
+        frame["rows"] = rows
+        frame["total_passing_vehicles"] = intersection.total_passing_vehicles
+        for i, direction in enumerate(DIRECTIONS):
+            frame["lights"][i] = intersection.traffic_lights[direction].state
+            frame["passing_vehicles"][i] = intersection.traffic_lights[direction].passing_vehicles
+        for i, light in enumerate(intersection.pedestrian_lights_list()):
+            frame["pedestrian_lights"][i] = light.state
+
+        self.__frame_count += 1
+        self.__tick += 1
+        if self.__frame_count == len(self.__frames):
+            self.__flush_frames()
+
+    def __next_row(self):
+        if self.__agent_count == self.chunk_rows:
+            self.__flush_agents()
+        row = self.__agents[self.__agent_count]
+        self.__agent_count += 1
+        row["tick"] = self.__tick
+        return row
+
+    def __index(self, agent):
+        return self.__indexes.setdefault(id(agent), len(self.__indexes))
+
+    def __append_vehicle(self, intersection, vehicle):
+        row = self.__next_row()
+        row["kind"] = VEHICLE_KIND
+        row["index"] = self.__index(vehicle)
+        row["x"] = vehicle.x
+        row["y"] = vehicle.y
+        row["turn_angle"] = vehicle.turn_angle
+        row["width"] = vehicle.width
+        row["height"] = vehicle.height
+        row["direction"] = DIRECTION_CODES[vehicle.initial_direction]
+        row["final_direction"] = DIRECTION_CODES[vehicle.final_direction]
+        row["asset"] = self.__asset_index(intersection, vehicle)
+        row["flags"] = (
+            (FLAG_TURNING if vehicle.is_turning else 0)
+            | (FLAG_TURNED if vehicle.has_turned else 0)
+            | (FLAG_STOPPED if vehicle.speed == 0 else 0)
+            | (FLAG_COUNTED if vehicle.has_counted else 0)
+            | (FLAG_MOVED if vehicle.has_moved else 0)
+            | (FLAG_CHANGED_ASSET if vehicle.changed_asset else 0)
+        )
+
+    def __append_pedestrian(self, pedestrian):
+        row = self.__next_row()
+        row["kind"] = PEDESTRIAN_KIND
+        row["index"] = self.__index(pedestrian)
+        row["x"] = pedestrian.x
+        row["y"] = pedestrian.y
+        row["turn_angle"] = 0
+        row["width"] = pedestrian.width
+        row["height"] = pedestrian.height
+        row["direction"] = DIRECTION_CODES.get(pedestrian.direction_movement, 0)
+        row["final_direction"] = 0
+        row["asset"] = NO_ASSET
+        row["flags"] = (FLAG_STOPPED if pedestrian.speed == 0 else 0) | (
+            FLAG_MOVED if pedestrian.has_moved else 0
+        )
+
+    def __asset_index(self, intersection, vehicle):
+        # El recurso original se identifica la primera vez que se ve el vehículo,
+        # antes de que la vista lo rote al girar
+        key = id(vehicle)
+        if key not in self.__assets:
+            assets = (
+                intersection.simulation_view.vehicles_assets[vehicle.initial_direction]
+                if intersection.simulation_view is not None
+                else []
+            )
+            self.__assets[key] = next(
+                (i for i, asset in enumerate(assets) if asset is vehicle.asset), NO_ASSET
+            )
+        return self.__assets[key]
+
+    def __flush_agents(self):
+        self.__agents_file.write(self.__agents[: self.__agent_count].tobytes())
+        self.__written_rows += self.__agent_count
+        self.__agent_count = 0
+
+    def __flush_frames(self):
+        # Los fotogramas sólo se escriben después de sus filas de agentes
+        self.__flush_agents()
+        self.__frames_file.write(self.__frames[: self.__frame_count].tobytes())
+        self.__frame_count = 0
+
+    def flush(self):
+        self.__flush_frames()
+        self.__agents_file.flush()
+        self.__frames_file.flush()
+
+    def close(self):
+        self.flush()
+        self.__agents_file.close()
+        self.__frames_file.close()
+
+
+class TrajectoryReplay:
+    """
+    Reproduce una grabación de TrajectoryRecorder sin volver a ejecutar
+    Intersection.update.
+
+    Los archivos se abren como np.memmap, así sólo se leen del disco los ticks que
+    se consultan. Expone la misma interfaz de lectura que Intersection, por lo que
+    MainView puede dibujarla directamente.
+
+    Atributos:
+        path (str): Ruta base de los archivos grabados
+        vehicles_assets (dict): Recursos por dirección (None para no dibujar vehículos)
+        position (int): Tick actual de la reproducción
+    """
+
+    def __init__(self, path, vehicles_assets=None):
+        self.path = path
+        self.vehicles_assets = vehicles_assets
+        self.agents = self.__open_memmap(f"{path}.agents", AGENT_DTYPE)
+        self.frames = self.__open_memmap(f"{path}.frames", FRAME_DTYPE)
+        self.position = 0
+        self.__lights = Intersection()
+        self.__vehicles = {}
+        self.__base_assets = {}
+        self.__pedestrians = {}
+        self.__visible_vehicles = []
+        self.__visible_pedestrians = []
+        self.simulation_view = None
+        if len(self.frames) > 0:
+            self.seek(0)
+
+    def __open_memmap(self, path, dtype):
+        if os.path.getsize(path) == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r")
+
+    def __len__(self):
+        return len(self.frames)
+
+    def rows(self, tick):
+        frame = self.frames[tick]
+        first_row = int(frame["first_row"])
+        return self.agents[first_row : first_row + int(frame["rows"])]
+
+    def seek(self, tick):
+        self.position = max(0, min(tick, len(self.frames) - 1))
+        frame = self.frames[self.position]
+
+        for i, direction in enumerate(DIRECTIONS):
+            light = self.__lights.traffic_lights[direction]
+            light.state = int(frame["lights"][i])
+            light.passing_vehicles = int(frame["passing_vehicles"][i])
+        for i, light in enumerate(self.__lights.pedestrian_lights_list()):
+            light.state = int(frame["pedestrian_lights"][i])
+        self.total_passing_vehicles = int(frame["total_passing_vehicles"])
+
+        self.__visible_vehicles = []
+        self.__visible_pedestrians = []
+        for row in self.rows(self.position):
+            if row["kind"] == VEHICLE_KIND:
+                self.__visible_vehicles.append(self.__apply_vehicle_row(row))
+            else:
+                self.__visible_pedestrians.append(self.__apply_pedestrian_row(row))
+
+    def step(self, ticks=1):
+        if self.position + ticks >= len(self.frames):
+            return False
+        self.seek(self.position + ticks)
+        return True
+
+    def __apply_vehicle_row(self, row):
+        index = int(row["index"])
+        initial_direction = DIRECTIONS[row["direction"]]
+        vehicle = self.__vehicles.get(index)
+        if vehicle is None:
+            vehicle = Vehicle(initial_direction, initial_direction)
+            self.__base_assets[index] = self.__vehicle_asset(
+                initial_direction, row["asset"], index
+            )
+            vehicle.asset = self.__base_assets[index]
+            self.__vehicles[index] = vehicle
+
+        flags = int(row["flags"])
+        vehicle.initial_direction = initial_direction
+        vehicle.final_direction = DIRECTIONS[row["final_direction"]]
+        vehicle.is_turning = bool(flags & FLAG_TURNING)
+        vehicle.has_turned = bool(flags & FLAG_TURNED)
+        vehicle.has_counted = bool(flags & FLAG_COUNTED)
+        vehicle.has_moved = bool(flags & FLAG_MOVED)
+        vehicle.speed = 0 if flags & FLAG_STOPPED else DEFAULT_VEHICLE_SPEED
+        # Al retroceder, se recupera el recurso sin rotar
+        if vehicle.changed_asset and not flags & FLAG_CHANGED_ASSET:
+            vehicle.asset = self.__base_assets[index]
+            vehicle.changed_asset = False
+        vehicle.x = float(row["x"])
+        vehicle.y = float(row["y"])
+        vehicle.turn_angle = float(row["turn_angle"])
+        vehicle.width = int(row["width"])
+        vehicle.height = int(row["height"])
+        return vehicle
+
+    def __vehicle_asset(self, direction, asset_index, index):
+        if not self.vehicles_assets or not self.vehicles_assets[direction]:
+            return None
+        assets = self.vehicles_assets[direction]
+        if asset_index == NO_ASSET:
+            return assets[index % len(assets)]
+        return assets[asset_index % len(assets)]
+
+    def __apply_pedestrian_row(self, row):
+        index = int(row["index"])
+        pedestrian = self.__pedestrians.get(index)
+        if pedestrian is None:
+            pedestrian = Pedestrian()
+            self.__pedestrians[index] = pedestrian
+        pedestrian.x = float(row["x"])
+        pedestrian.y = float(row["y"])
+        pedestrian.width = int(row["width"])
+        pedestrian.height = int(row["height"])
+        return pedestrian
+
+    # Interfaz de lectura compatible con Intersection para MainView
+
+    @property
+    def traffic_lights(self):
+        return self.__lights.traffic_lights
+
+    @property
+    def pedestrians(self):
+        return self.__visible_pedestrians
+
+    def traffic_lights_list(self):
+        return self.__lights.traffic_lights_list()
+
+    def pedestrian_lights_list(self):
+        return self.__lights.pedestrian_lights_list()
+
+    def vehicles_list(self):
+        return self.__visible_vehicles
+
+    def passing_vehicles_dict(self):
+        return self.__lights.passing_vehicles_dict()
+
+    def change_light_times(self, light_direction, green_time):
+        pass
+
+    def restart_to_initial_state(self):
+        self.seek(0)
@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+
+# Ángulo inicial, ángulo final y sentido del arco de cada giro (inicial, final)
+TURN_ANGLE_LIMITS = {
+    ("W", "N"): (math.pi / 2, math.pi, 1),
+    ("W", "S"): (math.pi / 2, math.pi, -1),
+    ("E", "N"): (3 * math.pi / 2, 2 * math.pi, -1),
+    ("E", "S"): (3 * math.pi / 2, 2 * math.pi, 1),
+    ("N", "W"): (0, math.pi / 2, -1),
+    ("N", "E"): (math.pi, 3 * math.pi / 2, 1),
+    ("S", "W"): (0, math.pi / 2, 1),
+    ("S", "E"): (math.pi, 3 * math.pi / 2, -1),
+}
+
+# Puntos de la polilínea que aproxima cada arco
+ARC_SAMPLES = 64
+# Distancia (px) entre entradas consecutivas de las tablas de posición y rumbo
+PATH_STEP = 1.0
+
+# Trayectorias por geometría: (ancho, alto, ancho de vía) -> {(inicial, final): TurningPath}
+_PATHS = {}
+
+
+class TurningPath:
+    """
+    Trayectoria del centro de un vehículo durante un giro, indexada por longitud
+    de arco.
+
+    El arco del giro se muestrea como polilínea y se remuestrea cada PATH_STEP
+    píxeles recorridos en tablas de posición y rumbo. Un vehículo que gira sólo
+    avanza la distancia recorrida e interpola entre dos entradas de las tablas,
+    sin trigonometría por tick, y recorre el giro a su velocidad lineal. Cada
+    entrada guarda también la variación por píxel hasta la siguiente, de modo que
+    la interpolación es una sola consulta a la tabla.
+
+    El arco une el eje del carril de entrada con el del carril de salida, así que
+    el vehículo entra y sale del giro sin saltos.
+
+    Atributos:
+        length (float): Longitud del giro (px)
+        start (tuple): Centro del vehículo al empezar el giro
+        end (tuple): Centro del vehículo al terminar el giro
+        xs, ys (list): Centro del vehículo cada PATH_STEP píxeles
+        headings (list): Ángulo del arco (turn_angle) cada PATH_STEP píxeles
+        table (list): (x, y, rumbo, dx, dy, drumbo) de cada tramo entre entradas
+    """
+
+    __slots__ = ("length", "start", "end", "xs", "ys", "headings", "table")
+
+    def __init__(self, center, radius, start_angle, end_angle, sense):
+        angles = np.linspace(start_angle, end_angle, ARC_SAMPLES)
+        xs = center[0] + radius * np.cos(angles * sense)
+        ys = center[1] + radius * np.sin(angles * sense)
+        distances = np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(xs), np.diff(ys)))))
+        self.length = float(distances[-1])
+
+        samples = np.append(np.arange(0.0, self.length, PATH_STEP), self.length)
+        self.xs = np.interp(samples, distances, xs).round(6).tolist()
+        self.ys = np.interp(samples, distances, ys).round(6).tolist()
+        self.headings = np.interp(samples, distances, angles).tolist()
+        self.start = (self.xs[0], self.ys[0])
+        self.end = (self.xs[-1], self.ys[-1])
+        # (x, y, rumbo) de cada entrada y su variación por píxel hasta la siguiente
+        spans = np.diff(samples)
+        self.table = list(
+            zip(
+                self.xs,
+                self.ys,
+                self.headings,
+                (np.diff(self.xs) / spans).tolist(),
+                (np.diff(self.ys) / spans).tolist(),
+                (np.diff(self.headings) / spans).tolist(),
+            )
+        )
+
+    def position(self, distance):
+        """Centro (x, y) y rumbo del vehículo tras recorrer distance píxeles del giro"""
+        if distance >= self.length:
+            return self.end[0], self.end[1], self.headings[-1]
+        index = int(distance // PATH_STEP)
+        x, y, heading, dx, dy, dheading = self.table[index]
+        offset = distance - index * PATH_STEP
+        return x + dx * offset, y + dy * offset, heading + dheading * offset
+
+    @staticmethod
+    def get(layout, movement):
+        """Trayectoria del giro movement (inicial, final) en layout; None si va recto"""
+        key = (layout.window_width, layout.window_height, layout.road_width)
+        paths = _PATHS.get(key)
+        if paths is None:
+            paths = {
+                turn: TurningPath(
+                    layout.turn_centers[turn], layout.turn_radius, *TURN_ANGLE_LIMITS[turn]
+                )
+                for turn in TURN_ANGLE_LIMITS
+            }
+            _PATHS[key] = paths
+        return paths.get(movement)
@@ -2,204 +2,202 @@ import math
 import random
 import pygame
 from util import TrafficUtils
-from config import DEFAULT_TURNING_SPEED, DEFAULT_VEHICLE_SPEED, GREEN, VEHICLE_SPACING, YELLOW, config
+from config import DEFAULT_VEHICLE_SPEED
+from .encoding import DIRECTION_VECTORS
+from .turning_path import TURN_ANGLE_LIMITS, TurningPath
+
+
+# Recursos girados compartidos: (id del recurso, ángulo) -> (recurso, recurso girado).
+# Cada vehículo que termina un giro reutiliza la misma superficie en vez de crear una propia
+_ROTATED_ASSETS = {}
 
 
 class Vehicle:
-    def __init__(self, initial_direction, final_direction):
+    __slots__ = (
+        "initial_direction",
+        "final_direction",
+        "x",
+        "y",
+        "initial_offset",
+        "turn_angle",
+        "turn_distance",
+        "start_delay",
+        "speed",
+        "width",
+        "height",
+        "is_stopped",
+        "is_turning",
+        "has_turned",
+        "has_moved",
+        "turning_limit",
+        "path",
+        "asset",
+        "changed_asset",
+        "has_counted",
+        "is_queued",
+        "layout",
+    )
+
+    @staticmethod
+    def rotated_asset(asset, angle):
+        key = (id(asset), round(angle, 6))
+        cached = _ROTATED_ASSETS.get(key)
+        if cached is None:
+            cached = (asset, pygame.transform.rotate(asset, angle))
+            _ROTATED_ASSETS[key] = cached
+            # Deshacer el giro devuelve el recurso original
+            _ROTATED_ASSETS[(id(cached[1]), round(-angle, 6))] = (cached[1], asset)
+        return cached[1]
+
+    def __init__(self, initial_direction, final_direction, layout=None):
         self.initial_direction = initial_direction
         self.final_direction = final_direction
         self.x = 0
         self.y = 0
         self.initial_offset = 0
         self.turn_angle = 0
+        self.turn_distance = 0
+        # Ticks que lleva detenido con espacio para arrancar (IntelligentDriverModel)
+        self.start_delay = 0
         self.speed = DEFAULT_VEHICLE_SPEED
-        self.width = config["VEHICLE_WIDTH"]
-        self.height = config["VEHICLE_WIDTH"]
+        self.layout = layout or TrafficUtils.current_layout()
+        self.width = self.layout.vehicle_width
+        self.height = self.layout.vehicle_width
         self.is_stopped = False
         self.is_turning = False
         self.has_turned = False
         self.has_moved = False
         self.turning_limit = (None, None)
+        self.path = None
         self.asset = None
         self.changed_asset = False
         self.has_counted = False
+        self.is_queued = False
 
     def calculate_initial_position(self):
-        center = config["SIMULATION_CENTER"]
-        road_quarter = config["ROAD_WIDTH"] // 4
+        layout = self.layout
         if self.initial_direction == "E":
             self.x = -self.width - self.initial_offset
-            self.y = center[1] + road_quarter - self.height // 2
+            self.y = layout.lane_y["E"] - self.height // 2
         elif self.initial_direction == "W":
-            self.x = config["SIMULATION_WIDTH"] + self.initial_offset
-            self.y = center[1] - road_quarter - self.height // 2
+            self.x = layout.simulation_width + self.initial_offset
+            self.y = layout.lane_y["W"] - self.height // 2
         elif self.initial_direction == "N":
-            self.x = center[0] + road_quarter - self.width // 2
-            self.y = config["WINDOW_HEIGHT"] + self.initial_offset
+            self.x = layout.lane_x["N"] - self.width // 2
+            self.y = layout.window_height + self.initial_offset
         elif self.initial_direction == "S":
-            self.x = center[0] - road_quarter - self.width // 2
+            self.x = layout.lane_x["S"] - self.width // 2
             self.y = -self.height - self.initial_offset
 
     def calculate_turning_limit(self):
-        center_limits = TrafficUtils.calculate_center_limits()
-        top = center_limits["top"]
-        bottom = center_limits["bottom"]
-        left = center_limits["left"]
-        right = center_limits["right"]
-        center = config["SIMULATION_CENTER"]
-        road_quarter = config["ROAD_WIDTH"] // 4
+        self.path = self.turning_path()
+        self.turning_limit = self.path.start if self.path is not None else (None, None)
 
-        limit_map = {
-            ("N", "E"): (center[0] + road_quarter, bottom),
-            ("N", "W"): (center[0] + road_quarter, center[1]),
-            ("S", "E"): (center[0] - road_quarter, center[1]),
-            ("S", "W"): (center[0] - road_quarter, top),
-            ("E", "N"): (
-                center[0],
-                center[1] + road_quarter - self.height // 2,
-            ),
-            ("E", "S"): (
-                left,
-                center[1] + road_quarter - self.height // 2,
-            ),
-            ("W", "N"): (
-                right,
-                center[1] - road_quarter - self.height // 2,
-            ),
-            ("W", "S"): (
-                center[0],
-                center[1] - road_quarter - self.height // 2,
-            ),
-        }
+    def turning_path(self):
+        return TurningPath.get(self.layout, (self.initial_direction, self.final_direction))
 
-        x_limit, y_limit = limit_map.get(
-            (self.initial_direction, self.final_direction), (None, None)
-        )
+    def calculate_size(self):
+        if self.asset is None:
+            self.__calculate_default_size(
+                self.final_direction if self.has_turned else self.initial_direction
+            )
+            return
+        self.width = self.asset.get_width()
+        self.height = self.asset.get_height()
 
-        self.turning_limit = (x_limit, y_limit)
+    def __calculate_default_size(self, direction):
+        vehicle_width = self.layout.vehicle_width
+        vehicle_length = self.layout.vehicle_length
+        if direction in ("N", "S"):
+            self.width, self.height = vehicle_width, vehicle_length
+        else:
+            self.width, self.height = vehicle_length, vehicle_width
 
-    def __calculate_circle_turn_center(self):
-        center = config["SIMULATION_CENTER"]
-        half_road = config["ROAD_WIDTH"] // 2
-        limit_map = {
-            ("N", "E"): (
-                center[0] + half_road,
-                center[1] + half_road,
-            ),
-            ("N", "W"): (center[0], center[1]),
-            ("S", "E"): (center[0], center[1]),
-            ("S", "W"): (
-                center[0] - half_road,
-                center[1] - half_road,
-            ),
-            ("E", "S"): (center[0] - half_road, center[1] + half_road),
-            ("E", "N"): (center[0], center[1]),
-            ("W", "S"): (center[0], center[1]),
-            ("W", "N"): (
-                center[0] + half_road,
-                center[1] - half_road,
-            ),
-        }
+    def path_position(self):
+        # Distancia del centro sobre la trayectoria de giro; negativa mientras no la
+        # alcanza
+        if self.is_turning:
+            return self.turn_distance
+        return self.__distance_past(self.turning_limit)
 
-        x_coor, y_coor = limit_map.get(
-            (self.initial_direction, self.final_direction), (0, 0)
+    def footprint(self):
+        # Mientras gira el rectángulo sin rotar no es su huella real: se toma un
+        # cuadrado centrado que cubre su ancho y medio largo, como en los giros de
+        # ConflictGrid
+        if not self.is_turning:
+            return self.x, self.y, self.width, self.height
+        width = min(self.width, self.height)
+        side = width + (max(self.width, self.height) - width) / 2
+        return (
+            self.x + (self.width - side) / 2,
+            self.y + (self.height - side) / 2,
+            side,
+            side,
         )
 
-        return x_coor, y_coor
-
-    def calculate_size(self):
-        self.width = self.asset.get_width()
-        self.height = self.asset.get_height()
-
     def update(self):
-        x_limit, y_limit = self.turning_limit
-        if not self.turning_limit.__contains__(None):
-            if (
-                abs(self.x - x_limit) < VEHICLE_SPACING
-                and abs(self.y - y_limit) < VEHICLE_SPACING
-                and not self.is_turning
-            ):
+        if self.turning_limit[0] is not None and not self.is_turning:
+            # El giro empieza cuando el centro alcanza el inicio de la trayectoria; lo
+            # que ya pasó de ese punto se cuenta como recorrido del giro
+            distance = self.__distance_past(self.turning_limit)
+            if distance >= 0:
                 self.is_turning = True
-                self.turn_angle = self.turn_angle_limits()[0]
+                self.turn_distance = distance
         self.__move()
         self.__verify_movement()
 
+    def __distance_past(self, point):
+        dx, dy = DIRECTION_VECTORS[self.initial_direction]
+        return (self.x + self.width // 2 - point[0]) * dx + (
+            self.y + self.height // 2 - point[1]
+        ) * dy
+
+    def __place_center(self, x, y):
+        self.x = x - self.width // 2
+        self.y = y - self.height // 2
+
     def __move(self):
         if self.is_turning:
-            self.turn_angle += DEFAULT_TURNING_SPEED if self.speed > 0 else 0
-            if self.turn_angle > self.turn_angle_limits()[1]:
-                self.turn_angle = self.turn_angle_limits()[1]
+            path = self.path
+            self.turn_distance += self.speed
+            if self.turn_distance >= path.length:
+                # Lo que sobra del giro se recorre ya sobre el carril de salida
+                dx, dy = DIRECTION_VECTORS[self.final_direction]
+                overshoot = self.turn_distance - path.length
+                self.__place_center(path.end[0] + dx * overshoot, path.end[1] + dy * overshoot)
                 self.is_turning = False
                 self.has_turned = True
                 self.turn_angle = 0
+                self.turn_distance = 0
                 self.turning_limit = (None, None)
             else:
-                self.__turn_vehicle()
+                self.__turn_vehicle(path)
         else:
             self.__move_straight()
 
     def turn_angle_limits(self):
-        turning_map = {
-            ("W", "N"): (math.pi / 2, math.pi, 1),
-            ("W", "S"): (math.pi / 2, math.pi, -1),
-            ("E", "N"): (3 * math.pi / 2, 2 * math.pi, -1),
-            ("E", "S"): (3 * math.pi / 2, 2 * math.pi, 1),
-            ("N", "W"): (0, math.pi / 2, -1),
-            ("N", "E"): (math.pi, 3 * math.pi / 2, 1),
-            ("S", "W"): (0, math.pi / 2, 1),
-            ("S", "E"): (math.pi, 3 * math.pi / 2, -1),
-        }
-
-        start_angle, end_angle, angle_direction = turning_map.get(
-            (self.initial_direction, self.final_direction), (0, 0, 1)
-        )
-
-        return start_angle, end_angle, angle_direction
+        return TURN_ANGLE_LIMITS.get((self.initial_direction, self.final_direction), (0, 0, 1))
 
-    def __turn_vehicle(self):
-        radius = config["ROAD_WIDTH"] // 4
-        x_center, y_center = self.__calculate_circle_turn_center()
-        angle_direction = self.turn_angle_limits()[2]
-        self.x = x_center + radius * math.cos(self.turn_angle * angle_direction)
-        self.y = y_center + radius * math.sin(self.turn_angle * angle_direction)
+    def __turn_vehicle(self, path):
+        x, y, self.turn_angle = path.position(self.turn_distance)
+        self.__place_center(x, y)
 
     def adjust_position_after_turn(self):
-        self.x = round(self.x)
-        self.y = round(self.y)
-        center = config["SIMULATION_CENTER"]
-        road_quarter = config["ROAD_WIDTH"] // 4
-        if self.final_direction == "N":
-            self.x = center[0] + road_quarter - self.width // 2
-        elif self.final_direction == "S":
-            self.x = center[0] - road_quarter - self.width // 2
-        elif self.final_direction == "E":
-            self.y = center[1] + road_quarter - self.height // 2
-        elif self.final_direction == "W":
-            self.y = center[1] - road_quarter - self.height // 2
+        self.x, self.y = self.calculte_position_after_turn()
 
     def calculte_position_after_turn(self):
-        center = config["SIMULATION_CENTER"]
-        road_quarter = config["ROAD_WIDTH"] // 4
-        if self.final_direction == "N":
+        # Los giros son de 90°: el largo anterior sobre el eje de salida es el ancho
+        # actual, así que el centro se conserva al cambiar de tamaño
+        layout = self.layout
+        if self.final_direction in ("N", "S"):
             return (
-                center[0] + road_quarter - self.width // 2,
-                round(self.y),
+                layout.lane_x[self.final_direction] - self.width // 2,
+                self.y + self.width // 2 - self.height // 2,
             )
-        elif self.final_direction == "S":
+        elif self.final_direction in ("E", "W"):
             return (
-                center[0] - road_quarter - self.width // 2,
-                round(self.y),
-            )
-        elif self.final_direction == "E":
-            return (
-                round(self.x),
-                center[1] + road_quarter - self.height // 2,
-            )
-        elif self.final_direction == "W":
-            return (
-                round(self.x),
-                center[1] - road_quarter - self.height // 2,
+                self.x + self.height // 2 - self.width // 2,
+                layout.lane_y[self.final_direction] - self.height // 2,
             )
 
     def __move_straight(self):
@@ -209,54 +207,50 @@ class Vehicle:
             self.__move_initial_direction()
 
     def __move_initial_direction(self):
-        if self.initial_direction == "S":
-            self.y += self.speed
-        elif self.initial_direction == "N":
-            self.y -= self.speed
-        elif self.initial_direction == "E":
-            self.x += self.speed
-        elif self.initial_direction == "W":
-            self.x -= self.speed
+        dx, dy = DIRECTION_VECTORS[self.initial_direction]
+        self.x += dx * self.speed
+        self.y += dy * self.speed
 
     def __move_final_direction(self):
-        if self.final_direction == "S":
-            self.y += self.speed
-        elif self.final_direction == "N":
-            self.y -= self.speed
-        elif self.final_direction == "E":
-            self.x += self.speed
-        elif self.final_direction == "W":
-            self.x -= self.speed
+        dx, dy = DIRECTION_VECTORS[self.final_direction]
+        self.x += dx * self.speed
+        self.y += dy * self.speed
 
     def __verify_movement(self):
         if (
             not self.has_moved
             and (self.initial_direction == "S" and self.y > 0)
-            or (self.initial_direction == "N" and self.y < config["WINDOW_HEIGHT"])
+            or (self.initial_direction == "N" and self.y < self.layout.window_height)
             or (self.initial_direction == "E" and self.x > 0)
-            or (self.initial_direction == "W" and self.x < config["SIMULATION_WIDTH"])
+            or (self.initial_direction == "W" and self.x < self.layout.simulation_width)
         ):
             self.has_moved = True
 
-    def change_random_final_direction(self):
+    def change_random_final_direction(self, rng=random, turning_ratios=None):
+        if turning_ratios and self.initial_direction in turning_ratios:
+            ratios = turning_ratios[self.initial_direction]
+            self.final_direction = rng.choices(list(ratios), weights=list(ratios.values()))[0]
+            return
         if self.initial_direction == "N":
-            self.final_direction = random.choice(["N", "E", "W"])
+            self.final_direction = rng.choice(["N", "E", "W"])
         elif self.initial_direction == "S":
-            self.final_direction = random.choice(["S", "E", "W"])
+            self.final_direction = rng.choice(["S", "E", "W"])
         elif self.initial_direction == "E":
-            self.final_direction = random.choice(["E", "N", "S"])
+            self.final_direction = rng.choice(["E", "N", "S"])
         elif self.initial_direction == "W":
-            self.final_direction = random.choice(["W", "N", "S"])
+            self.final_direction = rng.choice(["W", "N", "S"])
 
     def reset_to_initial_state(self, change_direction=False):
         turn_angle_limits = self.turn_angle_limits()
-        if self.changed_asset:
+        if self.changed_asset and self.asset is not None:
             angle = (
                 math.degrees(abs(turn_angle_limits[1] - turn_angle_limits[0]))
                 * turn_angle_limits[2]
             )
-            self.asset = pygame.transform.rotate(self.asset, angle)
+            self.asset = Vehicle.rotated_asset(self.asset, angle)
             self.calculate_size()
+        elif self.asset is None:
+            self.__calculate_default_size(self.initial_direction)
         if change_direction:
             self.change_random_final_direction 
         self.calculate_turning_limit()
@@ -266,4 +260,6 @@ class Vehicle:
         self.changed_asset = False
         self.is_turning = False
         self.turn_angle = 0
+        self.turn_distance = 0
+        self.start_delay = 0
         self.calculate_initial_position()
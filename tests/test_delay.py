@@ -0,0 +1,14 @@
+from simulation.replication import run_headless
+
+
+def test_red_approach_reports_delay_of_queued_vehicles():
+    # El este tiene verde casi toda la réplica y el norte nunca descarga
+    result = run_headless(
+        {"N": 10, "S": 10, "E": 100, "W": 10},
+        {"N": 8, "E": 4},
+        duration_seconds=60,
+        seed=0,
+    )
+
+    assert result["passing_vehicles"]["N"] == 0
+    assert result["mean_delay"]["N"] > 0
@@ -4,6 +4,7 @@ import pygame
 import pygame_gui
 from config import VEHICLES_ASSETS_PATH, config
 from ui.final_title import FinalTitle
+from util import TrafficUtils
 from .counters import Counters
 from .form import Form
 from .simulation_view import SimulationView
@@ -36,19 +37,11 @@ class MainView:
         info = pygame.display.Info()
         max_width, max_height = info.current_w, info.current_h
         os.environ["SDL_VIDEO_WINDOW_POS"] = "0, 40"
-        config["WINDOW_WIDTH"] = max_width
-        config["WINDOW_HEIGHT"] = max_height - 100
+        TrafficUtils.configure_layout(max_width, max_height - 100)
         self.screen = pygame.display.set_mode(
             (config["WINDOW_WIDTH"], config["WINDOW_HEIGHT"])
         )
         pygame.display.set_caption("Simulación de Intersección")
-        config["VEHICLE_WIDTH"] = config["ROAD_WIDTH"] // 6
-        config["SIMULATION_WIDTH"] = 3 * config["WINDOW_WIDTH"] / 4
-        config["FORM_WIDTH"] = config["WINDOW_WIDTH"] - config["SIMULATION_WIDTH"]
-        config["SIMULATION_CENTER"] = (
-            config["SIMULATION_WIDTH"] // 2,
-            config["WINDOW_HEIGHT"] // 2,
-        )
 
     def __charge_vehicles_assets(self):
         file_folder = VEHICLES_ASSETS_PATH
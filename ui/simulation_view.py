@@ -1,6 +1,9 @@
 import math
 import pygame
 from config import *
+from simulation.vehicle import Vehicle
+from simulation.encoding import LIGHT_COLORS
+from util import TrafficUtils
 
 
 class SimulationView:
@@ -16,15 +19,15 @@ class SimulationView:
     ):
         self.screen.fill(WHITE)
 
-        center = config["SIMULATION_CENTER"]
+        layout = TrafficUtils.current_layout()
         pygame.draw.rect(
             self.screen,
             GRAY,
             (
-                center[0] - config["ROAD_WIDTH"] // 2,
+                layout.left,
                 0,
-                config["ROAD_WIDTH"],
-                config["WINDOW_HEIGHT"],
+                layout.road_width,
+                layout.window_height,
             ),
         )
         pygame.draw.rect(
@@ -32,16 +35,16 @@ class SimulationView:
             GRAY,
             (
                 0,
-                center[1] - config["ROAD_WIDTH"] // 2,
-                config["SIMULATION_WIDTH"],
-                config["ROAD_WIDTH"],
+                layout.top,
+                layout.simulation_width,
+                layout.road_width,
             ),
         )
 
         for traffic_light in traffic_lights_list:
             pygame.draw.circle(
                 self.screen,
-                traffic_light.state,
+                LIGHT_COLORS[traffic_light.state],
                 traffic_light.position,
                 LIGHT_RADIUS,
             )
@@ -50,7 +53,7 @@ class SimulationView:
             size_half = pedestrian_light.size // 2
             pygame.draw.polygon(
                 self.screen,
-                pedestrian_light.state,
+                LIGHT_COLORS[pedestrian_light.state],
                 [
                     (pedestrian_light.position[0] + size_half, pedestrian_light.position[1]),
                     (
@@ -83,7 +86,7 @@ class SimulationView:
                     )
                     * -vehicle_turn_angle_limits[2]
                 )
-                rotated_asset = pygame.transform.rotate(vehicle.asset, angle)
+                rotated_asset = Vehicle.rotated_asset(vehicle.asset, angle)
                 vehicle.asset = rotated_asset
                 vehicle.calculate_size()
                 vehicle.adjust_position_after_turn()
@@ -1 +1,4 @@
-from util.traffic_utils import TrafficUtils
\ No newline at end of file
+from util.layout import Layout
+from util.traffic_utils import TrafficUtils
+from util.statistics_utils import StatisticsUtils
+from util.file_utils import FileUtils
\ No newline at end of file
@@ -0,0 +1,23 @@
+import os
+import tempfile
+
+
+class FileUtils:
+
+    @staticmethod
+    def write_atomic(path, data):
+        # Escribe en un temporal del mismo directorio y lo renombra, así un
+        # lector nunca ve el archivo a medio escribir
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(data)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
@@ -0,0 +1,127 @@
+from types import MappingProxyType
+
+from config import VEHICLE_LENGTH_RATIO, config
+
+
+class Layout:
+    """
+    Geometría de la intersección para un tamaño de ventana, calculada una sola vez.
+
+    Es inmutable: cada escenario con otro tamaño usa su propio Layout, de modo que
+    varias intersecciones con geometrías distintas pueden convivir en un proceso.
+    Los agentes guardan el Layout vigente al crearse (TrafficUtils.current_layout).
+
+    Atributos:
+        window_width, window_height (int): Tamaño de la ventana
+        simulation_width (float): Ancho del área de simulación (sin formulario)
+        road_width, road_half, road_quarter, road_three_halves (int): Ancho de vía y fracciones
+        center (tuple): Centro de la intersección
+        top, bottom, left, right (float): Bordes del cruce central
+        center_limits (Mapping): Bordes del cruce por nombre ('top', 'bottom', ...)
+        lane_x (Mapping): Centro x del carril de cada acceso norte-sur
+        lane_y (Mapping): Centro y del carril de cada acceso este-oeste
+        turn_centers (Mapping): Centro del arco de cada giro (inicial, final)
+        stop_lines (Mapping): Punto de la línea de parada en el eje de cada acceso
+        turn_radius (int): Radio de los giros
+        vehicle_width, vehicle_length (int): Tamaño por defecto de los vehículos
+        pedestrian_size (int): Tamaño de los peatones
+    """
+
+    __slots__ = (
+        "window_width",
+        "window_height",
+        "simulation_width",
+        "form_width",
+        "road_width",
+        "road_half",
+        "road_quarter",
+        "road_three_halves",
+        "center",
+        "top",
+        "bottom",
+        "left",
+        "right",
+        "center_limits",
+        "lane_x",
+        "lane_y",
+        "turn_centers",
+        "stop_lines",
+        "turn_radius",
+        "vehicle_width",
+        "vehicle_length",
+        "pedestrian_size",
+    )
+
+    def __init__(self, window_width, window_height, road_width=None, pedestrian_size=None):
+        road_width = road_width or config["ROAD_WIDTH"]
+        simulation_width = 3 * window_width / 4
+        center = (simulation_width // 2, window_height // 2)
+        road_half = road_width // 2
+        road_quarter = road_width // 4
+        top, bottom = center[1] - road_half, center[1] + road_half
+        left, right = center[0] - road_half, center[0] + road_half
+        vehicle_width = road_width // 6
+
+        values = {
+            "window_width": window_width,
+            "window_height": window_height,
+            "simulation_width": simulation_width,
+            "form_width": window_width - simulation_width,
+            "road_width": road_width,
+            "road_half": road_half,
+            "road_quarter": road_quarter,
+            "road_three_halves": 3 * road_width // 2,
+            "center": center,
+            "top": top,
+            "bottom": bottom,
+            "left": left,
+            "right": right,
+            "center_limits": MappingProxyType(
+                {"top": top, "bottom": bottom, "left": left, "right": right}
+            ),
+            "lane_x": MappingProxyType(
+                {"N": center[0] + road_quarter, "S": center[0] - road_quarter}
+            ),
+            "lane_y": MappingProxyType(
+                {"E": center[1] + road_quarter, "W": center[1] - road_quarter}
+            ),
+            "turn_centers": MappingProxyType(
+                {
+                    ("N", "E"): (right, bottom),
+                    ("N", "W"): center,
+                    ("S", "E"): center,
+                    ("S", "W"): (left, top),
+                    ("E", "S"): (left, bottom),
+                    ("E", "N"): center,
+                    ("W", "S"): center,
+                    ("W", "N"): (right, top),
+                }
+            ),
+            "stop_lines": MappingProxyType(
+                {
+                    "N": (center[0] + road_quarter, bottom),
+                    "S": (center[0] - road_quarter, top),
+                    "E": (left, center[1] + road_quarter),
+                    "W": (right, center[1] - road_quarter),
+                }
+            ),
+            "turn_radius": road_quarter,
+            "vehicle_width": vehicle_width,
+            "vehicle_length": vehicle_width * VEHICLE_LENGTH_RATIO,
+            "pedestrian_size": pedestrian_size or config["PEDESTRIAN_SIZE"],
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Layout es inmutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Layout es inmutable")
+
+    def __reduce__(self):
+        return Layout, (self.window_width, self.window_height, self.road_width, self.pedestrian_size)
+
+    @property
+    def size(self):
+        return (self.window_width, self.window_height)
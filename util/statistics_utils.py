@@ -0,0 +1,40 @@
+import math
+
+
+class StatisticsUtils:
+
+    # Valores críticos t de Student (dos colas, 95%) por grados de libertad
+    T_CRITICAL_95 = {
+        1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571,
+        6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228,
+        11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131,
+        16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086,
+        21: 2.080, 22: 2.074, 23: 2.069, 24: 2.064, 25: 2.060,
+        26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042,
+    }
+    Z_CRITICAL_95 = 1.96
+
+    @staticmethod
+    def mean_confidence_interval(values):
+        n = len(values)
+        if n == 0:
+            return 0.0, float("inf")
+        mean = sum(values) / n
+        if n == 1:
+            return mean, float("inf")
+        variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+        t_critical = StatisticsUtils.T_CRITICAL_95.get(
+            n - 1, StatisticsUtils.Z_CRITICAL_95
+        )
+        return mean, t_critical * math.sqrt(variance / n)
+
+    @staticmethod
+    def summarize(values):
+        mean, half_width = StatisticsUtils.mean_confidence_interval(values)
+        return {
+            "mean": mean,
+            "ci_low": mean - half_width,
+            "ci_high": mean + half_width,
+            "half_width": half_width,
+            "n": len(values),
+        }
@@ -1,23 +1,45 @@
 from config import config
 import networkx as nx
 
+from util.layout import Layout
+
 class TrafficUtils:
 
+    # Grafo peatonal compartido por todos los peatones, por ancho de vía
+    __pedestrian_graphs = {}
+    # Geometría vigente; los agentes nuevos la toman al crearse
+    __layout = Layout(config["WINDOW_WIDTH"], config["WINDOW_HEIGHT"])
+
+    @staticmethod
+    def configure_layout(window_width, window_height):
+        layout = Layout(window_width, window_height)
+        config["WINDOW_WIDTH"] = layout.window_width
+        config["WINDOW_HEIGHT"] = layout.window_height
+        config["VEHICLE_WIDTH"] = layout.vehicle_width
+        config["SIMULATION_WIDTH"] = layout.simulation_width
+        config["FORM_WIDTH"] = layout.form_width
+        config["SIMULATION_CENTER"] = layout.center
+        TrafficUtils.__layout = layout
+        return layout
+
+    @staticmethod
+    def current_layout():
+        return TrafficUtils.__layout
+
     @staticmethod
     def calculate_center_limits():
-        center = config["SIMULATION_CENTER"]
-        road_half = config["ROAD_WIDTH"] // 2
-        limits = {
-            "top": center[1] - road_half,
-            "bottom": center[1] + road_half,
-            "left": center[0] - road_half,
-            "right": center[0] + road_half
-        }
-        return limits
+        return TrafficUtils.__layout.center_limits
 
     @staticmethod
     def pedestrian_graph():
+        """
+        Grafo de cruces peatonales. Se construye una vez por ancho de vía y se
+        comparte entre peatones, por lo que no debe modificarse.
+        """
         weight = config["ROAD_WIDTH"]
+        graph = TrafficUtils.__pedestrian_graphs.get(weight)
+        if graph is not None:
+            return graph
         edges = [
             ("TL", "SW", {"weight": weight, "direction": "N"}),
             ("TL", "TR", {"weight": weight, "direction": "E"}),
@@ -47,5 +69,6 @@ class TrafficUtils:
 
         graph = nx.DiGraph()
         graph.add_edges_from(edges)
+        TrafficUtils.__pedestrian_graphs[weight] = graph
 
         return graph
\ No newline at end of file